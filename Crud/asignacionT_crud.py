@@ -1,6 +1,12 @@
-from Entities.asignacionT import AsignacionT, AsignacionTCreate, AsignacionTUpdate
+from Entities.asignacionT import (
+    AsignacionT,
+    AsignacionTCreate,
+    AsignacionTOut,
+    AsignacionTUpdate,
+)
 from uuid import UUID
 from sqlalchemy.orm import Session
+from Crud.consultas import listar, proyectar
 
 
 class AsignacionTCRUD:
@@ -12,9 +18,42 @@ class AsignacionTCRUD:
         db (Session): Sesión de la base de datos
     """
 
+    CAMPOS_ORDEN = ("fecha_registro", "fecha_actualizar")
+
     def __init__(self, db: Session):
         self.db = db
 
+    def obtener_por_id(self, id_asignacion: UUID):
+        """Obtiene una asignación por su llave primaria.
+
+        Args:
+            id_asignacion (UUID): ID de la asignación.
+
+        Returns:
+            AsignacionT | None: La asignación encontrada o None si no existe.
+        """
+        return self.db.get(AsignacionT, id_asignacion)
+
+    def _proyeccion(self):
+        """Consulta de las columnas de `AsignacionTOut`."""
+        return proyectar(self.db, AsignacionT, AsignacionTOut)
+
+    def consultar_por_id(self, id_asignacion: UUID):
+        """Consulta una asignación por su ID leyendo solo las columnas de salida.
+
+        Args:
+            id_asignacion (UUID): ID de la asignación.
+
+        Returns:
+            Row | None: Fila con las columnas de `AsignacionTOut` o None si no
+            existe.
+        """
+        return (
+            self._proyeccion()
+            .filter(AsignacionT.id_asignacion == id_asignacion)
+            .first()
+        )
+
     def registrar_asignacion(self, asignacion: AsignacionTCreate):
         """
         Registra una nueva asignación en la base de datos.
@@ -41,9 +80,9 @@ class AsignacionTCRUD:
             id_usuario (UUID): ID del usuario.
 
         Returns:
-            List[AsignacionT]: Lista de asignaciones del usuario.
+            List[Row]: Filas con las columnas de `AsignacionTOut`.
         """
-        return self.db.query(AsignacionT).filter_by(id_usuario=id_usuario).all()
+        return self._proyeccion().filter(AsignacionT.id_usuario == id_usuario).all()
 
     def obtener_por_empleado(self, id_empleado: UUID):
         """
@@ -52,12 +91,22 @@ class AsignacionTCRUD:
         Args:
             id_empleado (UUID): ID del empleado.
         Returns:
-            List[AsignacionT]: Lista de asignaciones del empleado.
+            List[Row]: Filas con las columnas de `AsignacionTOut`.
         """
-        return self.db.query(AsignacionT).filter_by(id_empleado=id_empleado).all()
+        return self._proyeccion().filter(AsignacionT.id_empleado == id_empleado).all()
 
     def obtener_por_transporte(self, id_transporte: UUID):
-        return self.db.query(AsignacionT).filter_by(id_transporte=id_transporte).all()
+        """
+        Obtiene todas las asignaciones de un transporte específico.
+
+        Args:
+            id_transporte (UUID): ID del transporte.
+        Returns:
+            List[Row]: Filas con las columnas de `AsignacionTOut`.
+        """
+        return (
+            self._proyeccion().filter(AsignacionT.id_transporte == id_transporte).all()
+        )
 
     def eliminar_asignacion(self, id_asignacion: UUID):
         """
@@ -69,18 +118,32 @@ class AsignacionTCRUD:
         Returns:
             bool: True si la asignación fue eliminada, False si no se encontró.
         """
-        asignacion = self.db.query(AsignacionT).get(id_asignacion)
+        asignacion = self.obtener_por_id(id_asignacion)
         if asignacion:
             self.db.delete(asignacion)
             self.db.commit()
             return True
         return False
 
-    def listar_asignaciones(self):
+    def listar_asignaciones(
+        self, skip: int = 0, limit: int | None = None, orden: str | None = None
+    ):
         """
-        Obtiene todas las asignaciones.
+        Obtiene las asignaciones paginando en la base de datos.
+
+        Args:
+            skip (int): Número de registros a saltar.
+            limit (int, optional): Número máximo de registros a retornar.
+            orden (str, optional): Campo de ordenamiento ("campo" o "-campo").
 
         Returns:
-            List[AsignacionT]: Lista de todas las asignaciones.
+            List[Row]: Filas con las columnas de `AsignacionTOut`.
         """
-        return self.db.query(AsignacionT).all()
+        return listar(
+            self._proyeccion(),
+            AsignacionT,
+            skip=skip,
+            limit=limit,
+            orden=orden,
+            permitidos=self.CAMPOS_ORDEN,
+        )
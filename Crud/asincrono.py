@@ -0,0 +1,84 @@
+"""
+Variantes asíncronas de las clases CRUD
+=======================================
+
+Cada clase CRUD síncrona tiene una variante `...Async` que recibe una
+AsyncSession. Sus métodos son corrutinas que ejecutan el método síncrono
+original con `AsyncSession.run_sync`: SQLAlchemy entrega una Session
+síncrona montada sobre la conexión asíncrona, de modo que la espera de I/O
+no bloquea el event loop y la lógica de cada CRUD se mantiene en un solo lugar.
+"""
+
+import inspect
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Crud.asignacionT_crud import AsignacionTCRUD
+from Crud.auditoria_crud import AuditoriaCRUD
+from Crud.empleado_crud import EmpleadoCRUD
+from Crud.linea_crud import LineaCRUD
+from Crud.parada_crud import ParadaCRUD
+from Crud.reporte_crud import ReporteCRUD
+from Crud.ruta_crud import RutaCRUD
+from Crud.tarjeta_crud import TarjetaCRUD
+from Crud.transacciones_crud import TransaccionCRUD
+from Crud.transporte_crud import TransporteCRUD
+from Crud.usuario_crud import UsuarioCRUD
+
+
+def _corrutina(clase_crud, nombre: str):
+    """Crea la corrutina que ejecuta `clase_crud.nombre` dentro de run_sync."""
+
+    async def metodo(self, *args, **kwargs):
+        return await self.db.run_sync(
+            lambda sesion: getattr(clase_crud(sesion), nombre)(*args, **kwargs)
+        )
+
+    metodo.__name__ = nombre
+    metodo.__qualname__ = f"{clase_crud.__name__}Async.{nombre}"
+    metodo.__doc__ = getattr(clase_crud, nombre).__doc__
+    return metodo
+
+
+def asincrono(clase_crud):
+    """Construye la variante asíncrona de una clase CRUD.
+
+    Los métodos de instancia públicos se convierten en corrutinas; los
+    atributos de clase y los métodos estáticos se conservan tal cual.
+
+    Args:
+        clase_crud: Clase CRUD síncrona cuyo constructor recibe una Session.
+
+    Returns:
+        type: Clase cuyo constructor recibe una AsyncSession.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    atributos = {
+        "__init__": __init__,
+        "__doc__": f"Variante asíncrona de {clase_crud.__name__}.",
+        "__module__": __name__,
+    }
+    for nombre, valor in vars(clase_crud).items():
+        if nombre.startswith("_"):
+            continue
+        if inspect.isfunction(valor):
+            atributos[nombre] = _corrutina(clase_crud, nombre)
+        else:
+            atributos[nombre] = valor
+    return type(f"{clase_crud.__name__}Async", (), atributos)
+
+
+AsignacionTCRUDAsync = asincrono(AsignacionTCRUD)
+AuditoriaCRUDAsync = asincrono(AuditoriaCRUD)
+EmpleadoCRUDAsync = asincrono(EmpleadoCRUD)
+LineaCRUDAsync = asincrono(LineaCRUD)
+ParadaCRUDAsync = asincrono(ParadaCRUD)
+ReporteCRUDAsync = asincrono(ReporteCRUD)
+RutaCRUDAsync = asincrono(RutaCRUD)
+TarjetaCRUDAsync = asincrono(TarjetaCRUD)
+TransaccionCRUDAsync = asincrono(TransaccionCRUD)
+TransporteCRUDAsync = asincrono(TransporteCRUD)
+UsuarioCRUDAsync = asincrono(UsuarioCRUD)
@@ -0,0 +1,392 @@
+"""
+Archivo de auditoría
+====================
+
+Cada petición deja un registro de auditoría, así que la tabla crece sin
+límite. Este módulo aplica la política de retención: los meses anteriores a
+los últimos `AUDITORIA_RETENCION_MESES` (sin contar el mes en curso) se
+copian a un archivo comprimido por mes en `AUDITORIA_ARCHIVO_DIR`
+(`auditoria-AAAA-MM.jsonl.gz` o `.csv.gz`, con las columnas de
+`/api/auditoria/exportar`) y luego se quitan de la base:
+
+- En PostgreSQL, con la tabla particionada por mes (ver
+  `database/particiones.py`), con un `DROP TABLE` de la partición del mes.
+- En SQLite, o en una tabla de PostgreSQL creada antes de particionarla, con
+  un DELETE del rango del mes.
+
+Las filas se leen con un cursor del servidor y se comprimen por lotes, sin
+cargar el mes en memoria. Cada ejecución agrega al mes una parte nueva
+(`auditoria-AAAA-MM.jsonl.gz`, luego `auditoria-AAAA-MM.1.jsonl.gz`, ...)
+que se escribe con otro nombre y se renombra al terminar; las partes ya
+escritas no se vuelven a leer ni a copiar. El manifiesto del mes
+(`auditoria-AAAA-MM.json`) lista las partes y marca la última como
+pendiente hasta que se confirma el borrado de sus filas. Si el proceso
+falla entre ambos pasos, la siguiente ejecución omite las filas que ya
+están en esa parte, comparándolas en orden con el archivo, y archiva solo
+las que faltan o llegaron después.
+
+`leer_archivo` recorre las partes de un mes para consultarlo sin restaurarlo.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import re
+from datetime import date, datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import Connection
+
+from Crud.exportacion import (
+    TAMANO_LOTE_EXPORTACION,
+    consulta_auditoria,
+    filas_csv,
+    filas_ndjson,
+)
+from database.particiones import (
+    asegurar_particiones,
+    eliminar_particion,
+    inicio_mes,
+    particiones_mensuales,
+    sumar_meses,
+)
+from Entities.auditoria import Auditoria
+
+RETENCION_MESES = int(os.getenv("AUDITORIA_RETENCION_MESES", "3"))
+DIRECTORIO_ARCHIVO = os.getenv("AUDITORIA_ARCHIVO_DIR", "archivo/auditoria")
+
+EXTENSIONES_ARCHIVO = {"ndjson": "jsonl", "csv": "csv"}
+_PATRON_MANIFIESTO = re.compile(r"^auditoria-(\d{4}-\d{2})\.json$")
+
+
+def limite_retencion(
+    hoy: Optional[date] = None, retencion_meses: int = RETENCION_MESES
+) -> date:
+    """Primer mes que se conserva en la base; los anteriores se archivan.
+
+    Args:
+        hoy (date, optional): Fecha de referencia; por defecto, hoy.
+        retencion_meses (int): Meses completos que se conservan además del
+            mes en curso.
+    """
+    return sumar_meses(inicio_mes(hoy or date.today()), -retencion_meses)
+
+
+def _nombre_parte(mes: date, parte: int, formato: str) -> str:
+    """Nombre del archivo de una parte de un mes; la primera no lleva número."""
+    numero = f".{parte}" if parte else ""
+    return f"auditoria-{mes:%Y-%m}{numero}.{EXTENSIONES_ARCHIVO[formato]}.gz"
+
+
+def _ruta_manifiesto(mes: str, directorio: str) -> str:
+    return os.path.join(directorio, f"auditoria-{mes}.json")
+
+
+def _leer_manifiesto(mes: str, directorio: str) -> dict:
+    """Estado del archivo de un mes: `formato`, número de `partes` y si la
+    última está `pendiente` de que se confirme el borrado de sus filas."""
+    try:
+        with open(_ruta_manifiesto(mes, directorio), encoding="utf-8") as entrada:
+            return json.load(entrada)
+    except FileNotFoundError:
+        return {"formato": None, "partes": 0, "pendiente": False}
+
+
+def _escribir_manifiesto(mes: str, directorio: str, manifiesto: dict):
+    ruta = _ruta_manifiesto(mes, directorio)
+    with open(ruta + ".parcial", "w", encoding="utf-8") as salida:
+        json.dump(manifiesto, salida)
+        salida.flush()
+        os.fsync(salida.fileno())
+    os.replace(ruta + ".parcial", ruta)
+
+
+def archivo_de_mes(
+    mes: str, directorio: str = DIRECTORIO_ARCHIVO
+) -> Optional[Tuple[List[str], str]]:
+    """Archivos de un mes archivado.
+
+    Args:
+        mes (str): Mes en formato AAAA-MM.
+        directorio (str): Carpeta del archivo de auditoría.
+
+    Returns:
+        tuple | None: (rutas de las partes en orden, formato) o None si el
+        mes no está archivado.
+    """
+    manifiesto = _leer_manifiesto(mes, directorio)
+    if not manifiesto["partes"]:
+        return None
+    inicio = date.fromisoformat(f"{mes}-01")
+    return [
+        os.path.join(directorio, _nombre_parte(inicio, parte, manifiesto["formato"]))
+        for parte in range(manifiesto["partes"])
+    ], manifiesto["formato"]
+
+
+def meses_archivados(directorio: str = DIRECTORIO_ARCHIVO) -> List[dict]:
+    """Meses archivados, del más antiguo al más reciente.
+
+    Returns:
+        List[dict]: `mes`, `formato`, `archivos` y `bytes` (de todas sus
+        partes) de cada mes.
+    """
+    if not os.path.isdir(directorio):
+        return []
+    meses = []
+    for nombre in sorted(os.listdir(directorio)):
+        coincidencia = _PATRON_MANIFIESTO.match(nombre)
+        archivo = coincidencia and archivo_de_mes(coincidencia.group(1), directorio)
+        if archivo:
+            rutas, formato = archivo
+            meses.append(
+                {
+                    "mes": coincidencia.group(1),
+                    "formato": formato,
+                    "archivos": [os.path.basename(ruta) for ruta in rutas],
+                    "bytes": sum(os.path.getsize(ruta) for ruta in rutas),
+                }
+            )
+    return meses
+
+
+def _registros(
+    ruta: str, formato: str, decodificar: bool = True
+) -> Iterator[Tuple[bytes, Optional[dict]]]:
+    """Recorre un archivo como pares (línea NDJSON, registro).
+
+    Con `decodificar=False` las líneas NDJSON se entregan sin interpretar y
+    el registro es None.
+    """
+    with gzip.open(ruta, "rb") as entrada:
+        if formato == "ndjson":
+            for linea in entrada:
+                yield linea, json.loads(linea) if decodificar else None
+        else:
+            for registro in csv.DictReader(io.TextIOWrapper(entrada, "utf-8")):
+                linea = json.dumps(registro, ensure_ascii=False, separators=(",", ":"))
+                yield (linea + "\n").encode("utf-8"), registro
+
+
+def leer_archivo(
+    rutas: List[str],
+    formato: str,
+    accion: Optional[str] = None,
+    tabla_afectada: Optional[str] = None,
+    id_usuario: Optional[UUID] = None,
+    tamano_lote: int = TAMANO_LOTE_EXPORTACION,
+) -> Iterator[bytes]:
+    """Recorre un mes archivado y entrega sus registros como NDJSON.
+
+    Los archivos se descomprimen a medida que se leen; la memoria usada
+    depende del tamaño del lote y no del mes.
+
+    Args:
+        rutas (List[str]): Partes del mes (ver `archivo_de_mes`).
+        formato (str): Formato de los archivos ("ndjson" o "csv").
+        accion (str, optional): Filtrar por acción.
+        tabla_afectada (str, optional): Filtrar por tabla afectada.
+        id_usuario (UUID, optional): Filtrar por usuario.
+        tamano_lote (int): Registros por fragmento entregado.
+
+    Yields:
+        bytes: Fragmento de líneas NDJSON.
+    """
+    filtros = {
+        campo: str(valor)
+        for campo, valor in (
+            ("accion", accion),
+            ("tabla_afectada", tabla_afectada),
+            ("id_usuario", id_usuario),
+        )
+        if valor is not None
+    }
+    lote = []
+    for ruta in rutas:
+        for linea, registro in _registros(ruta, formato, decodificar=bool(filtros)):
+            if not filtros or all(
+                registro[campo] == valor for campo, valor in filtros.items()
+            ):
+                lote.append(linea)
+                if len(lote) >= tamano_lote:
+                    yield b"".join(lote)
+                    lote = []
+    if lote:
+        yield b"".join(lote)
+
+
+def meses_por_archivar(conexion: Connection, limite: date) -> List[date]:
+    """Meses anteriores a `limite` con registros o con partición propia."""
+    meses = {
+        mes for mes in particiones_mensuales(conexion, "auditoria") if mes < limite
+    }
+    primera = conexion.scalar(
+        select(func.min(Auditoria.fecha)).where(Auditoria.fecha < limite)
+    )
+    if primera is not None:
+        mes = inicio_mes(primera)
+        while mes < limite:
+            meses.add(mes)
+            mes = sumar_meses(mes, 1)
+    return sorted(meses)
+
+
+def _sin_archivadas(filas: Iterable, ruta: str, formato: str) -> Iterator:
+    """Filas de la base que no están en el archivo `ruta`.
+
+    Ambos recorridos van en orden (fecha, id_auditoria), así que se comparan
+    como una mezcla ordenada, sin cargar el archivo en memoria.
+    """
+    archivadas = (
+        (datetime.fromisoformat(registro["fecha"]), UUID(registro["id_auditoria"]))
+        for _, registro in _registros(ruta, formato)
+    )
+    archivada = next(archivadas, None)
+    for fila in filas:
+        clave = (fila.fecha, UUID(str(fila.id_auditoria)))
+        while archivada is not None and archivada < clave:
+            archivada = next(archivadas, None)
+        if archivada != clave:
+            yield fila
+
+
+def archivar_mes(
+    conexion: Connection,
+    mes: date,
+    formato: str = "ndjson",
+    directorio: str = DIRECTORIO_ARCHIVO,
+    tamano_lote: int = TAMANO_LOTE_EXPORTACION,
+) -> dict:
+    """Copia un mes de auditoría a un archivo comprimido y lo quita de la base.
+
+    Cada ejecución escribe una parte nueva del mes (la primera con todos sus
+    registros; las siguientes, con los que llegaron tarde) y nunca reescribe
+    las anteriores. El manifiesto del mes (`auditoria-AAAA-MM.json`) lista
+    las partes y marca la última como pendiente hasta que se confirma el
+    borrado de sus filas: si el proceso falló antes, las filas que ya están
+    en esa parte se omiten. Hace commit al terminar.
+
+    Args:
+        conexion (Connection): Conexión síncrona a la base de datos.
+        mes (date): Primer día del mes.
+        formato (str): "ndjson" o "csv", si el mes aún no tiene archivo.
+        directorio (str): Carpeta del archivo de auditoría.
+        tamano_lote (int): Filas por viaje al cursor.
+
+    Raises:
+        ValueError: Si el formato no está soportado.
+
+    Returns:
+        dict: `mes`, `archivo` escrito (None si no había registros nuevos),
+        `filas` agregadas, `bytes` de la parte y `metodo` de borrado
+        ("particion" o "delete").
+    """
+    if formato not in EXTENSIONES_ARCHIVO:
+        raise ValueError(f"Formato no soportado: {formato}")
+    os.makedirs(directorio, exist_ok=True)
+    nombre_mes = f"{mes:%Y-%m}"
+    manifiesto = _leer_manifiesto(nombre_mes, directorio)
+    partes = manifiesto["partes"]
+    if partes:
+        formato = manifiesto["formato"]
+
+    desde = datetime.combine(mes, datetime.min.time())
+    hasta = datetime.combine(sumar_meses(mes, 1), datetime.min.time())
+    resultado = conexion.execute(
+        consulta_auditoria(desde=desde)
+        .where(Auditoria.fecha < hasta)
+        .execution_options(yield_per=tamano_lote)
+    )
+    columnas = list(resultado.keys())
+    filas_mes = iter(resultado)
+    if manifiesto["pendiente"]:
+        ultima = os.path.join(directorio, _nombre_parte(mes, partes - 1, formato))
+        filas_mes = _sin_archivadas(filas_mes, ultima, formato)
+
+    ruta = os.path.join(directorio, _nombre_parte(mes, partes, formato))
+    temporal = ruta + ".parcial"
+    filas = 0
+    with open(temporal, "wb") as salida:
+        with gzip.GzipFile(fileobj=salida, mode="wb") as comprimido:
+            if formato == "csv":
+                comprimido.write(filas_csv([columnas]))
+            for lote in iter(lambda: list(islice(filas_mes, tamano_lote)), []):
+                filas += len(lote)
+                comprimido.write(
+                    filas_ndjson(columnas, lote)
+                    if formato == "ndjson"
+                    else filas_csv(lote)
+                )
+        salida.flush()
+        os.fsync(salida.fileno())
+    if filas:
+        os.replace(temporal, ruta)
+        partes += 1
+        _escribir_manifiesto(
+            nombre_mes,
+            directorio,
+            {"formato": formato, "partes": partes, "pendiente": True},
+        )
+    else:
+        os.remove(temporal)
+        ruta = None
+
+    if eliminar_particion(conexion, "auditoria", mes):
+        metodo = "particion"
+    else:
+        conexion.execute(
+            delete(Auditoria).where(Auditoria.fecha >= desde, Auditoria.fecha < hasta)
+        )
+        metodo = "delete"
+    conexion.commit()
+    if partes:
+        _escribir_manifiesto(
+            nombre_mes,
+            directorio,
+            {"formato": formato, "partes": partes, "pendiente": False},
+        )
+    return {
+        "mes": nombre_mes,
+        "archivo": ruta,
+        "filas": filas,
+        "bytes": os.path.getsize(ruta) if ruta else 0,
+        "metodo": metodo,
+    }
+
+
+def archivar(
+    conexion: Connection,
+    retencion_meses: int = RETENCION_MESES,
+    formato: str = "ndjson",
+    directorio: str = DIRECTORIO_ARCHIVO,
+    hoy: Optional[date] = None,
+) -> List[dict]:
+    """Aplica la política de retención a la auditoría.
+
+    Primero crea las particiones de los próximos meses (en PostgreSQL) y
+    luego archiva, uno por uno y del más antiguo al más reciente, los meses
+    anteriores al límite de retención.
+
+    Args:
+        conexion (Connection): Conexión síncrona a la base de datos.
+        retencion_meses (int): Meses completos que se conservan además del
+            mes en curso.
+        formato (str): "ndjson" o "csv".
+        directorio (str): Carpeta del archivo de auditoría.
+        hoy (date, optional): Fecha de referencia; por defecto, hoy.
+
+    Returns:
+        List[dict]: Resultado de `archivar_mes` por cada mes archivado.
+    """
+    asegurar_particiones(conexion, "auditoria", "fecha", hoy)
+    conexion.commit()
+    limite = limite_retencion(hoy, retencion_meses)
+    return [
+        archivar_mes(conexion, mes, formato, directorio)
+        for mes in meses_por_archivar(conexion, limite)
+    ]
@@ -0,0 +1,205 @@
+"""
+Cola de escritura de Auditoria
+==============================
+
+Los eventos de auditoría se encolan en memoria y un hilo en segundo plano
+los escribe en lotes con INSERT multi-fila. Un lote se escribe al alcanzar
+su tamaño máximo o al cumplirse el intervalo de vaciado.
+
+La cola es acotada: si está llena, un productor síncrono espera como
+máximo `espera_max` segundos (contrapresión) y después descarta el evento,
+dejándolo registrado en los contadores. Desde el hilo del bucle de eventos
+(las rutas async) el evento se descarta sin esperar: una espera ahí
+detendría todas las peticiones, no solo la que audita.
+"""
+
+import asyncio
+import atexit
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+from database.config import SessionLocal
+from Entities.auditoria import Auditoria
+
+_FIN = object()
+
+
+def _en_bucle_de_eventos() -> bool:
+    """Indica si el hilo actual está ejecutando un bucle de asyncio (también
+    dentro de `run_sync`, que corre en el mismo hilo)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class ColaAuditoria:
+    """Cola acotada de eventos de auditoría con escritura por lotes.
+
+    Atributos:
+        capacidad (int): Número máximo de eventos en memoria.
+        tamano_lote (int): Número máximo de filas por INSERT.
+        intervalo (float): Segundos máximos que un evento espera en un lote.
+        espera_max (float): Segundos que espera un productor síncrono si la
+            cola está llena.
+    """
+
+    def __init__(
+        self,
+        capacidad: int = 10000,
+        tamano_lote: int = 500,
+        intervalo: float = 1.0,
+        espera_max: float = 0.05,
+        session_factory=SessionLocal,
+    ):
+        self.capacidad = capacidad
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.espera_max = espera_max
+        self.session_factory = session_factory
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._hilo = None
+        self._lock = threading.Lock()
+        self._lock_contadores = threading.Lock()
+        self._atexit_registrado = False
+        self._contadores = {
+            "encolados": 0,
+            "escritos": 0,
+            "descartados": 0,
+            "errores_escritura": 0,
+            "lotes": 0,
+        }
+        self._ultimo_vaciado_ms = 0.0
+        self._max_vaciado_ms = 0.0
+        self._total_vaciado_ms = 0.0
+
+    @property
+    def activa(self) -> bool:
+        """Indica si el hilo escritor está en ejecución."""
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def iniciar(self):
+        """Inicia el hilo escritor si no está en ejecución."""
+        with self._lock:
+            if self.activa:
+                return
+            self._hilo = threading.Thread(
+                target=self._trabajar, name="auditoria-escritor", daemon=True
+            )
+            self._hilo.start()
+            if not self._atexit_registrado:
+                atexit.register(self.detener)
+                self._atexit_registrado = True
+
+    def detener(self, timeout: float = 10.0):
+        """Escribe los eventos pendientes y detiene el hilo escritor.
+
+        Args:
+            timeout (float): Segundos máximos de espera para vaciar la cola.
+        """
+        with self._lock:
+            hilo = self._hilo
+            if hilo is None or not hilo.is_alive():
+                return
+            self._cola.put(_FIN)
+        hilo.join(timeout)
+
+    def encolar(self, evento: dict) -> bool:
+        """Agrega un evento a la cola.
+
+        Args:
+            evento (dict): Valores de las columnas de Auditoria.
+
+        Returns:
+            bool: True si el evento fue encolado, False si fue descartado.
+        """
+        if not self.activa:
+            self.iniciar()
+        try:
+            if _en_bucle_de_eventos():
+                self._cola.put_nowait(evento)
+            else:
+                self._cola.put(evento, timeout=self.espera_max)
+        except queue.Full:
+            self._sumar("descartados")
+            return False
+        self._sumar("encolados")
+        return True
+
+    def _sumar(self, contador: str, cantidad: int = 1):
+        with self._lock_contadores:
+            self._contadores[contador] += cantidad
+
+    def estadisticas(self) -> dict:
+        """Contadores de la cola: profundidad, lotes, descartes y latencia."""
+        lotes = self._contadores["lotes"]
+        return {
+            "activa": self.activa,
+            "profundidad": self._cola.qsize(),
+            "capacidad": self.capacidad,
+            **self._contadores,
+            "ultimo_vaciado_ms": round(self._ultimo_vaciado_ms, 3),
+            "max_vaciado_ms": round(self._max_vaciado_ms, 3),
+            "promedio_vaciado_ms": (
+                round(self._total_vaciado_ms / lotes, 3) if lotes else 0.0
+            ),
+        }
+
+    def _trabajar(self):
+        """Bucle del hilo escritor: agrupa eventos y los escribe por tamaño o tiempo."""
+        lote = []
+        vence = None
+        while True:
+            espera = self.intervalo if not lote else max(vence - time.monotonic(), 0)
+            try:
+                evento = self._cola.get(timeout=espera)
+            except queue.Empty:
+                evento = None
+
+            if evento is _FIN:
+                self._vaciar(lote)
+                return
+            if evento is not None:
+                if not lote:
+                    vence = time.monotonic() + self.intervalo
+                lote.append(evento)
+
+            if lote and (len(lote) >= self.tamano_lote or time.monotonic() >= vence):
+                self._vaciar(lote)
+                lote = []
+
+    def _vaciar(self, lote: list):
+        """Escribe un lote de eventos con un único INSERT multi-fila."""
+        if not lote:
+            return
+        inicio = time.perf_counter()
+        db = self.session_factory()
+        try:
+            db.execute(insert(Auditoria), lote)
+            db.commit()
+            self._sumar("escritos", len(lote))
+        except Exception as e:
+            print(f"Error al registrar auditoría: {e}")
+            db.rollback()
+            self._sumar("errores_escritura")
+            self._sumar("descartados", len(lote))
+        finally:
+            db.close()
+        duracion = (time.perf_counter() - inicio) * 1000
+        self._sumar("lotes")
+        self._ultimo_vaciado_ms = duracion
+        self._total_vaciado_ms += duracion
+        self._max_vaciado_ms = max(self._max_vaciado_ms, duracion)
+
+
+cola_auditoria = ColaAuditoria(
+    capacidad=int(os.getenv("AUDITORIA_COLA_CAPACIDAD", "10000")),
+    tamano_lote=int(os.getenv("AUDITORIA_TAMANO_LOTE", "500")),
+    intervalo=float(os.getenv("AUDITORIA_INTERVALO_SEG", "1.0")),
+    espera_max=float(os.getenv("AUDITORIA_ESPERA_MAX_SEG", "0.05")),
+)
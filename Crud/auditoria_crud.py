@@ -6,10 +6,15 @@ Este módulo contiene todas las operaciones de base de datos
 para la entidad Auditoria.
 """
 
+import uuid
+from datetime import datetime
+from uuid import UUID
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from Entities import Auditoria
-from api.dependencies import get_db
+from Crud.consultas import aplicar_filtros, paginar_keyset
+
+ID_USUARIO_AUDITORIA = UUID("7d1a4c4c-7427-4ea0-b377-2f9d5e20fbf8")
 
 
 class AuditoriaCRUD:
@@ -18,6 +23,17 @@ class AuditoriaCRUD:
     def __init__(self, db: Session):
         self.db = db
 
+    def obtener_por_id(self, id_auditoria: UUID):
+        """Obtiene un registro de auditoría por su llave primaria.
+
+        Args:
+            id_auditoria (UUID): ID del registro.
+
+        Returns:
+            Auditoria | None: El registro encontrado o None si no existe.
+        """
+        return self.db.get(Auditoria, id_auditoria)
+
     def registrar_evento(
         self, usuario_id: int, tabla_afectada: str, accion: str, descripcion: str
     ) -> Auditoria:
@@ -56,23 +72,73 @@ class AuditoriaCRUD:
             .all()
         )
 
+    def obtener_pagina(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        accion: Optional[str] = None,
+        tabla_afectada: Optional[str] = None,
+        id_usuario: Optional[UUID] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> Tuple[List[Auditoria], Optional[str]]:
+        """
+        Obtiene una página de auditorías, de la más reciente a la más antigua.
+
+        Los filtros se aplican en SQL y la paginación es por cursor sobre
+        (fecha, id_auditoria), así que cualquier página cuesta lo mismo.
+
+        Args:
+            limit (int): Número máximo de registros de la página.
+            cursor (str, optional): Cursor devuelto por la página anterior.
+            accion (str, optional): Filtrar por acción (CREATE, READ, ...).
+            tabla_afectada (str, optional): Filtrar por tabla afectada.
+            id_usuario (UUID, optional): Filtrar por usuario.
+            desde (datetime, optional): Fecha mínima (inclusive).
+            hasta (datetime, optional): Fecha máxima (inclusive).
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+
+        Returns:
+            tuple: (auditorías de la página, cursor de la página siguiente o None).
+        """
+        query = aplicar_filtros(
+            self.db.query(Auditoria),
+            Auditoria,
+            accion=accion,
+            tabla_afectada=tabla_afectada,
+            id_usuario=id_usuario,
+        )
+        if desde:
+            query = query.filter(Auditoria.fecha >= desde)
+        if hasta:
+            query = query.filter(Auditoria.fecha <= hasta)
+        return paginar_keyset(
+            query,
+            (Auditoria.fecha, Auditoria.id_auditoria),
+            (datetime.fromisoformat, UUID),
+            cursor=cursor,
+            limit=limit,
+        )
+
+    @staticmethod
     def agregar_auditoria_usuario(nombre_accion: str, nombre_tabla: str):
         """
-        Método para agregar un registro a la tabla auditoria
+        Método para agregar un registro a la tabla auditoria.
+
+        El evento se encola y se escribe en segundo plano junto con otros
+        eventos en un INSERT multi-fila (ver Crud.auditoria_cola).
         """
-        db_gen = get_db()
-        db = next(db_gen)
-        try:
-            auditoria_crud = AuditoriaCRUD(db)
-            auditoria_crud.registrar_evento(
-                usuario_id="7d1a4c4c-7427-4ea0-b377-2f9d5e20fbf8",
-                tabla_afectada=nombre_tabla,
-                accion=nombre_accion,
-                descripcion=(f"{nombre_accion} en {nombre_tabla}"),
-            )
-            db.commit()
-        except Exception as e:
-            print(f"Error al registrar auditoría: {e}")
-            db.rollback()
-        finally:
-            db_gen.close()
+        from Crud.auditoria_cola import cola_auditoria
+
+        cola_auditoria.encolar(
+            {
+                "id_auditoria": uuid.uuid4(),
+                "id_usuario": ID_USUARIO_AUDITORIA,
+                "tabla_afectada": nombre_tabla,
+                "accion": nombre_accion,
+                "descripcion": f"{nombre_accion} en {nombre_tabla}",
+                "fecha": datetime.now(),
+            }
+        )
@@ -0,0 +1,199 @@
+"""
+Caché de entidades
+==================
+
+Caché en memoria del proceso para las búsquedas por ID y por llave natural
+(documento, email, placa). Guarda snapshots de los esquemas de salida
+(`UsuarioOut`, `EmpleadoOut`, `TransporteOut`), nunca objetos ORM, de modo
+que una entrada se puede entregar a cualquier petición sin tocar sesiones.
+
+Cada caché es LRU con capacidad máxima y TTL. Los métodos de escritura de
+los CRUD invalidan la entidad por su ID, lo que borra también todas sus
+llaves naturales. Una carga que empezó antes de una invalidación no se
+guarda, así que tras una escritura en este proceso nunca se sirve un dato
+anterior a ella.
+
+Solo se guarda lo leído de la primaria. Una réplica puede ir atrasada: si
+una lectura desde ella llenara la caché después de una invalidación, el
+dato anterior a la escritura se serviría a todos los clientes, incluido el
+que escribió y está fijado a la primaria, hasta que venza el TTL.
+
+La caché es de cada proceso: con varios workers, una escritura no invalida
+la de los demás, que pueden servir el dato anterior hasta que venza el TTL
+(ver `servidor.py`). `CACHE_ENTIDADES_CAPACIDAD=0` la desactiva.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+
+from database.config import lectura_en_replica
+from Entities.empleado import EmpleadoOut
+from Entities.transporte import TransporteOut
+from Entities.usuario import UsuarioOut
+
+
+class CacheEntidades:
+    """Caché LRU/TTL de snapshots de una entidad.
+
+    Atributos:
+        nombre (str): Nombre de la caché en las estadísticas.
+        esquema: Esquema Pydantic con el que se toma el snapshot.
+        campo_id (str): Campo con el ID de la entidad.
+        campos_llave (Iterable[str]): Llaves naturales por las que se busca.
+        capacidad (int): Número máximo de entidades guardadas.
+        ttl (float): Segundos de vida de cada entrada.
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        esquema,
+        campo_id: str,
+        campos_llave: Iterable[str] = (),
+        capacidad: int = 10000,
+        ttl: float = 60.0,
+    ):
+        self.nombre = nombre
+        self.esquema = esquema
+        self.campo_id = campo_id
+        self.campos_llave = tuple(campos_llave)
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # id -> (expira, snapshot, llaves)
+        self._llaves = {}  # (campo, valor) -> id
+        self._generacion = 0
+        self._lock = threading.Lock()
+        self._contadores = {
+            "aciertos": 0,
+            "fallos": 0,
+            "expirados": 0,
+            "desalojos": 0,
+            "invalidaciones": 0,
+        }
+
+    def obtener(self, campo: str, valor: Hashable, cargar: Callable):
+        """Busca una entidad en la caché y, si no está, la carga y la guarda.
+
+        Args:
+            campo (str): `campo_id` o uno de `campos_llave`.
+            valor (Hashable): Valor buscado.
+            cargar (Callable): Función sin argumentos que consulta la base de
+                datos y retorna el objeto ORM (o una fila con sus columnas) o
+                None.
+
+        Returns:
+            Snapshot del esquema de la entidad, o None si no existe.
+        """
+        with self._lock:
+            snapshot = self._leer(campo, valor)
+            if snapshot is not None:
+                self._contadores["aciertos"] += 1
+                return snapshot
+            self._contadores["fallos"] += 1
+            generacion = self._generacion
+
+        entidad = cargar()
+        if entidad is None:
+            return None
+        snapshot = self.esquema.model_validate(entidad)
+
+        if self.capacidad <= 0 or lectura_en_replica():
+            return snapshot
+        with self._lock:
+            if generacion == self._generacion:
+                self._guardar(snapshot)
+        return snapshot
+
+    def invalidar(self, id_entidad: Hashable):
+        """Elimina una entidad y todas sus llaves naturales.
+
+        Args:
+            id_entidad (Hashable): ID de la entidad modificada o eliminada.
+        """
+        with self._lock:
+            self._generacion += 1
+            self._contadores["invalidaciones"] += 1
+            self._quitar(id_entidad)
+
+    def limpiar(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._generacion += 1
+            self._entradas.clear()
+            self._llaves.clear()
+
+    def estadisticas(self) -> dict:
+        """Tamaño, capacidad y contadores de aciertos, fallos y desalojos."""
+        with self._lock:
+            consultas = self._contadores["aciertos"] + self._contadores["fallos"]
+            return {
+                "tamano": len(self._entradas),
+                "capacidad": self.capacidad,
+                "ttl_seg": self.ttl,
+                **self._contadores,
+                "tasa_aciertos": (
+                    round(self._contadores["aciertos"] / consultas, 4)
+                    if consultas
+                    else 0.0
+                ),
+            }
+
+    def _leer(self, campo: str, valor: Hashable):
+        id_entidad = (
+            valor if campo == self.campo_id else self._llaves.get((campo, valor))
+        )
+        entrada = self._entradas.get(id_entidad)
+        if entrada is None:
+            return None
+        if entrada[0] < time.monotonic():
+            self._contadores["expirados"] += 1
+            self._quitar(id_entidad)
+            return None
+        self._entradas.move_to_end(id_entidad)
+        return entrada[1]
+
+    def _guardar(self, snapshot):
+        id_entidad = getattr(snapshot, self.campo_id)
+        self._quitar(id_entidad)
+        llaves = [(campo, getattr(snapshot, campo)) for campo in self.campos_llave]
+        self._entradas[id_entidad] = (time.monotonic() + self.ttl, snapshot, llaves)
+        for llave in llaves:
+            self._llaves[llave] = id_entidad
+        while len(self._entradas) > self.capacidad:
+            antiguo, (_, _, llaves_antiguas) = self._entradas.popitem(last=False)
+            self._quitar_llaves(antiguo, llaves_antiguas)
+            self._contadores["desalojos"] += 1
+
+    def _quitar(self, id_entidad: Hashable):
+        entrada = self._entradas.pop(id_entidad, None)
+        if entrada is not None:
+            self._quitar_llaves(id_entidad, entrada[2])
+
+    def _quitar_llaves(self, id_entidad: Hashable, llaves: list):
+        for llave in llaves:
+            if self._llaves.get(llave) == id_entidad:
+                del self._llaves[llave]
+
+
+_CAPACIDAD = int(os.getenv("CACHE_ENTIDADES_CAPACIDAD", "10000"))
+_TTL = float(os.getenv("CACHE_ENTIDADES_TTL_SEG", "60"))
+
+cache_usuarios = CacheEntidades(
+    "usuarios", UsuarioOut, "id_usuario", ("documento", "email"), _CAPACIDAD, _TTL
+)
+cache_empleados = CacheEntidades(
+    "empleados", EmpleadoOut, "id_empleado", ("documento", "email"), _CAPACIDAD, _TTL
+)
+cache_transportes = CacheEntidades(
+    "transportes", TransporteOut, "id_transporte", ("placa",), _CAPACIDAD, _TTL
+)
+
+CACHES = (cache_usuarios, cache_empleados, cache_transportes)
+
+
+def estadisticas_cache() -> dict:
+    """Estadísticas de todas las cachés de entidades, por nombre."""
+    return {cache.nombre: cache.estadisticas() for cache in CACHES}
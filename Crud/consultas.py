@@ -0,0 +1,264 @@
+"""
+Construcción de consultas de listado
+====================================
+
+Funciones compartidas por las clases CRUD para traducir filtros,
+ordenamiento y paginación a WHERE / ORDER BY / OFFSET / LIMIT,
+de modo que la base de datos solo devuelva las filas solicitadas.
+
+Los listados y búsquedas de solo lectura seleccionan únicamente las
+columnas del esquema de salida (`proyectar`) y retornan filas `Row` en
+lugar de entidades: no se leen columnas que no se entregan (como la
+contraseña) ni se registran objetos en el identity map de la sesión.
+
+Las búsquedas de una sola entidad por ID (`obtener_por_id` de cada CRUD)
+usan `Session.get`, que primero mira el identity map y, si la entidad no
+está cargada, hace un SELECT por llave primaria.
+
+Para tablas muy grandes se ofrece paginación por cursor (keyset): la página
+siguiente se pide con un cursor opaco que codifica la última llave vista,
+por lo que la página N cuesta lo mismo que la primera.
+"""
+
+import base64
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect, tuple_
+from sqlalchemy.orm import Query, Session
+
+
+@lru_cache(maxsize=None)
+def columnas_salida(modelo, esquema) -> tuple:
+    """Atributos del modelo que corresponden a los campos de un esquema.
+
+    Args:
+        modelo: Clase del modelo SQLAlchemy.
+        esquema: Esquema Pydantic de salida; cada campo debe ser una columna
+            del modelo con el mismo nombre.
+
+    Returns:
+        tuple: Atributos instrumentados, en el orden de los campos.
+    """
+    return tuple(getattr(modelo, campo) for campo in esquema.model_fields)
+
+
+def proyectar(db: Session, modelo, esquema) -> Query:
+    """Consulta de solo las columnas que necesita el esquema de salida.
+
+    Las filas resultantes (`Row`) exponen cada columna como atributo, de modo
+    que sirven igual que la entidad para `model_validate` (from_attributes)
+    y para `respuesta_lista`, pero no quedan en el identity map de la sesión.
+
+    Args:
+        db (Session): Sesión de la base de datos.
+        modelo: Clase del modelo SQLAlchemy consultado.
+        esquema: Esquema Pydantic de salida.
+
+    Returns:
+        Query: Consulta a la que se pueden aplicar filtros, orden y paginación.
+    """
+    return db.query(*columnas_salida(modelo, esquema))
+
+
+def aplicar_filtros(query: Query, modelo, **filtros) -> Query:
+    """Agrega una condición de igualdad por cada filtro con valor.
+
+    Args:
+        query (Query): Consulta base.
+        modelo: Clase del modelo SQLAlchemy consultado.
+        **filtros: Pares columna=valor; los valores None se ignoran.
+
+    Returns:
+        Query: Consulta con las condiciones WHERE aplicadas.
+    """
+    for campo, valor in filtros.items():
+        if valor is not None:
+            query = query.filter(getattr(modelo, campo) == valor)
+    return query
+
+
+def aplicar_orden(
+    query: Query,
+    modelo,
+    orden: Optional[str] = None,
+    permitidos: Iterable[str] = (),
+) -> Query:
+    """Ordena la consulta por un campo permitido.
+
+    El formato de `orden` es "campo" (ascendente) o "-campo" (descendente).
+    Siempre se agrega la llave primaria como desempate para que la
+    paginación sea estable entre páginas.
+
+    Args:
+        query (Query): Consulta base.
+        modelo: Clase del modelo SQLAlchemy consultado.
+        orden (str, optional): Campo de ordenamiento.
+        permitidos (Iterable[str]): Campos por los que se permite ordenar.
+
+    Raises:
+        ValueError: Si el campo de ordenamiento no está permitido.
+
+    Returns:
+        Query: Consulta con ORDER BY aplicado.
+    """
+    llaves = list(inspect(modelo).primary_key)
+    if orden:
+        campo = orden.lstrip("-")
+        if campo not in permitidos:
+            raise ValueError(
+                f"No se puede ordenar por '{campo}'. "
+                f"Campos permitidos: {', '.join(permitidos)}"
+            )
+        columna = getattr(modelo, campo)
+        query = query.order_by(
+            columna.desc() if orden.startswith("-") else columna.asc()
+        )
+    return query.order_by(*llaves)
+
+
+def paginar(query: Query, skip: int = 0, limit: Optional[int] = None) -> Query:
+    """Aplica OFFSET y LIMIT a la consulta.
+
+    Args:
+        query (Query): Consulta base.
+        skip (int): Número de registros a saltar.
+        limit (int, optional): Número máximo de registros; None para todos.
+
+    Returns:
+        Query: Consulta paginada.
+    """
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def listar(
+    query: Query,
+    modelo,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    orden: Optional[str] = None,
+    permitidos: Iterable[str] = (),
+    **filtros,
+) -> list:
+    """Ejecuta una consulta de listado filtrada, ordenada y paginada en SQL.
+
+    Args:
+        query (Query): Consulta base (`db.query(modelo)` o `proyectar(...)`).
+        modelo: Clase del modelo SQLAlchemy consultado.
+        skip (int): Número de registros a saltar.
+        limit (int, optional): Número máximo de registros a retornar.
+        orden (str, optional): Campo de ordenamiento ("campo" o "-campo").
+        permitidos (Iterable[str]): Campos por los que se permite ordenar.
+        **filtros: Filtros de igualdad; los valores None se ignoran.
+
+    Returns:
+        list: Registros resultantes.
+    """
+    query = aplicar_filtros(query, modelo, **filtros)
+    query = aplicar_orden(query, modelo, orden, permitidos)
+    return paginar(query, skip, limit).all()
+
+
+def insert_con_conflictos(dialecto: str):
+    """Retorna el constructor `insert` con ON CONFLICT del dialecto, o None.
+
+    PostgreSQL y SQLite admiten `INSERT ... ON CONFLICT`; para otros motores
+    el llamador debe usar un camino alternativo.
+
+    Args:
+        dialecto (str): Nombre del dialecto (postgresql, sqlite, ...).
+    """
+    if dialecto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+    elif dialecto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+    else:
+        return None
+    return insert_dialecto
+
+
+def codificar_cursor(*valores) -> str:
+    """Codifica los valores de la llave de ordenamiento en un cursor opaco.
+
+    Args:
+        *valores: Valores de la última fila entregada (datetime, UUID, str, ...).
+
+    Returns:
+        str: Cursor en base64 apto para URLs.
+    """
+    crudo = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else str(v) for v in valores],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(crudo.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str, tipos: Sequence[Callable]) -> tuple:
+    """Decodifica un cursor generado por `codificar_cursor`.
+
+    Args:
+        cursor (str): Cursor recibido del cliente.
+        tipos (Sequence[Callable]): Conversores de cada valor de la llave.
+
+    Raises:
+        ValueError: Si el cursor no es válido.
+
+    Returns:
+        tuple: Valores de la llave convertidos a su tipo.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if len(valores) != len(tipos):
+            raise ValueError
+        return tuple(tipo(valor) for tipo, valor in zip(tipos, valores))
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido")
+
+
+def paginar_keyset(
+    query: Query,
+    columnas: Sequence,
+    tipos: Sequence[Callable],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descendente: bool = True,
+) -> Tuple[list, Optional[str]]:
+    """Pagina una consulta por cursor sobre una llave de ordenamiento única.
+
+    La condición `(col1, col2, ...) < (v1, v2, ...)` usa el índice compuesto
+    de las columnas, de modo que no hay OFFSET que recorrer.
+
+    Args:
+        query (Query): Consulta base, ya filtrada.
+        columnas (Sequence): Columnas de la llave; la última debe ser única.
+        tipos (Sequence[Callable]): Conversores de cada valor de la llave.
+        cursor (str, optional): Cursor de la página anterior.
+        limit (int): Tamaño de página.
+        descendente (bool): Dirección del ordenamiento.
+
+    Raises:
+        ValueError: Si el cursor no es válido.
+
+    Returns:
+        tuple: (filas de la página, cursor de la página siguiente o None).
+    """
+    if cursor:
+        valores = tuple_(
+            *decodificar_cursor(cursor, tipos), types=[c.type for c in columnas]
+        )
+        llave = tuple_(*columnas)
+        query = query.filter(llave < valores if descendente else llave > valores)
+    query = query.order_by(*(c.desc() if descendente else c.asc() for c in columnas))
+    filas = query.limit(limit + 1).all()
+    if len(filas) <= limit:
+        return filas, None
+    ultima = filas[limit - 1]
+    siguiente = codificar_cursor(*(getattr(ultima, c.key) for c in columnas))
+    return filas[:limit], siguiente
@@ -1,6 +1,10 @@
-from Entities.empleado import Empleado, EmpleadoCreate, EmpleadoUpdate
+from Entities.empleado import Empleado, EmpleadoCreate, EmpleadoOut, EmpleadoUpdate
+from typing import List
 from uuid import UUID
 from sqlalchemy.orm import Session
+from Crud.cache import cache_empleados
+from Crud.consultas import listar, proyectar
+from Crud.masivo import insertar_lote
 
 
 class EmpleadoCRUD:
@@ -10,6 +14,8 @@ class EmpleadoCRUD:
         db (Session): Sesión de la base de datos.
     """
 
+    CAMPOS_ORDEN = ("nombre", "apellido", "documento", "email", "rol", "estado")
+
     def __init__(self, db: Session):
         """Inicializa la clase con la sesión de la base de datos.
 
@@ -18,6 +24,68 @@ class EmpleadoCRUD:
         """
         self.db = db
 
+    def obtener_por_id(self, id_empleado: UUID):
+        """Obtiene un empleado por su llave primaria.
+
+        Args:
+            id_empleado (UUID): ID del empleado.
+
+        Returns:
+            Empleado | None: El empleado encontrado o None si no existe.
+        """
+        return self.db.get(Empleado, id_empleado)
+
+    def _proyeccion(self):
+        """Consulta de las columnas de `EmpleadoOut`."""
+        return proyectar(self.db, Empleado, EmpleadoOut)
+
+    def consultar_por_id(self, id_empleado: UUID):
+        """Consulta un empleado por su ID usando la caché de entidades.
+
+        Args:
+            id_empleado (UUID): ID del empleado.
+
+        Returns:
+            EmpleadoOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_empleados.obtener(
+            "id_empleado",
+            id_empleado,
+            lambda: self._proyeccion()
+            .filter(Empleado.id_empleado == id_empleado)
+            .first(),
+        )
+
+    def consultar_por_documento(self, documento: str):
+        """Consulta un empleado por su documento usando la caché de entidades.
+
+        Args:
+            documento (str): Documento del empleado.
+
+        Returns:
+            EmpleadoOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_empleados.obtener(
+            "documento",
+            documento,
+            lambda: self._proyeccion().filter(Empleado.documento == documento).first(),
+        )
+
+    def consultar_por_email(self, email: str):
+        """Consulta un empleado por su email usando la caché de entidades.
+
+        Args:
+            email (str): Email del empleado.
+
+        Returns:
+            EmpleadoOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_empleados.obtener(
+            "email",
+            email,
+            lambda: self._proyeccion().filter(Empleado.email == email).first(),
+        )
+
     def crear_empleado(self, empleado: EmpleadoCreate):
         """Crea un nuevo empleado en la base de datos.
 
@@ -33,6 +101,28 @@ class EmpleadoCRUD:
         self.db.refresh(nuevo)
         return nuevo
 
+    def crear_empleados_masivo(self, empleados: List[EmpleadoCreate]) -> dict:
+        """Crea un lote de empleados en una sola transacción.
+
+        Las filas con documento o email repetidos (en el lote o en la base de
+        datos) se reportan y no se insertan.
+
+        Args:
+            empleados (List[EmpleadoCreate]): Lote de empleados.
+
+        Raises:
+            ValueError: Si el lote está vacío o excede el máximo permitido.
+
+        Returns:
+            dict: Resultado con las filas creadas y los errores por fila.
+        """
+        return insertar_lote(
+            self.db,
+            Empleado,
+            [empleado.dict() for empleado in empleados],
+            ("documento", "email"),
+        )
+
     def actualizar_empleado(self, id_empleado: UUID, empleado_update: EmpleadoUpdate):
         """Actualiza los datos de un empleado existente.
 
@@ -46,12 +136,13 @@ class EmpleadoCRUD:
         Returns:
             Empleado: El empleado actualizado.
         """
-        empleado = self.db.query(Empleado).get(id_empleado)
+        empleado = self.obtener_por_id(id_empleado)
         if not empleado:
             raise ValueError("Empleado no encontrado")
         for key, value in empleado_update.dict(exclude_unset=True).items():
             setattr(empleado, key, value)
         self.db.commit()
+        cache_empleados.invalidar(id_empleado)
         self.db.refresh(empleado)
         return empleado
 
@@ -64,17 +155,41 @@ class EmpleadoCRUD:
         Returns:
             bool: True si el empleado fue eliminado, False si no fue encontrado.
         """
-        empleado = self.db.query(Empleado).get(id_empleado)
+        empleado = self.obtener_por_id(id_empleado)
         if empleado:
             self.db.delete(empleado)
             self.db.commit()
+            cache_empleados.invalidar(id_empleado)
             return True
         return False
 
-    def listar_empleados(self):
-        """Lista todos los empleados en la base de datos.
+    def listar_empleados(
+        self,
+        skip: int = 0,
+        limit: int | None = None,
+        rol: str | None = None,
+        estado: str | None = None,
+        orden: str | None = None,
+    ):
+        """Lista los empleados filtrando y paginando en la base de datos.
+
+        Args:
+            skip (int): Número de registros a saltar.
+            limit (int, optional): Número máximo de registros a retornar.
+            rol (str, optional): Filtrar por rol.
+            estado (str, optional): Filtrar por estado.
+            orden (str, optional): Campo de ordenamiento ("campo" o "-campo").
 
         Returns:
-            List[Empleado]: Lista de empleados.
+            List[Row]: Filas con las columnas de `EmpleadoOut`.
         """
-        return self.db.query(Empleado).all()
+        return listar(
+            self._proyeccion(),
+            Empleado,
+            skip=skip,
+            limit=limit,
+            orden=orden,
+            permitidos=self.CAMPOS_ORDEN,
+            rol=rol,
+            estado=estado,
+        )
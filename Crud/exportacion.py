@@ -0,0 +1,201 @@
+"""
+Exportación de transacciones y auditoría
+========================================
+
+Genera exportaciones completas en NDJSON o CSV sin cargar el resultado en
+memoria. La consulta se ejecuta con un cursor del servidor (`yield_per`) y
+las filas se serializan por lotes a medida que llegan, así que la memoria
+usada depende del tamaño del lote y no del número de filas exportadas.
+
+Se seleccionan columnas, no entidades: no se construyen objetos ORM ni
+esquemas Pydantic por fila.
+
+El generador abre y cierra su propia AsyncSession: la respuesta se sigue
+enviando después de que termina el handler, cuando la sesión de la
+dependencia `get_async_db` ya no está disponible.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from database.config import nueva_sesion_asincrona
+from Entities.auditoria import Auditoria
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion
+from Entities.usuario import Usuario
+
+TAMANO_LOTE_EXPORTACION = int(os.getenv("EXPORTACION_TAMANO_LOTE", "1000"))
+
+FORMATOS_EXPORTACION = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def consulta_transacciones(
+    documento: Optional[str] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    tipo: Optional[str] = None,
+) -> Select:
+    """Consulta de exportación de transacciones, en orden cronológico.
+
+    Args:
+        documento (str, optional): Documento del usuario dueño de la tarjeta.
+        desde (datetime, optional): Fecha mínima (inclusive).
+        hasta (datetime, optional): Fecha máxima (inclusive).
+        tipo (str, optional): Tipo de transacción.
+
+    Returns:
+        Select: Consulta de columnas lista para `exportar`.
+    """
+    consulta = select(
+        Transaccion.id_transaccion,
+        Transaccion.numero_tarjeta,
+        Transaccion.tipo_transaccion,
+        Transaccion.monto,
+        Transaccion.fecha_transaccion,
+    )
+    if documento:
+        consulta = (
+            consulta.join(Tarjeta, Tarjeta.numero_tarjeta == Transaccion.numero_tarjeta)
+            .join(Usuario, Usuario.id_usuario == Tarjeta.id_usuario)
+            .where(Usuario.documento == documento)
+        )
+    if desde:
+        consulta = consulta.where(Transaccion.fecha_transaccion >= desde)
+    if hasta:
+        consulta = consulta.where(Transaccion.fecha_transaccion <= hasta)
+    if tipo:
+        consulta = consulta.where(Transaccion.tipo_transaccion == tipo)
+    return consulta.order_by(Transaccion.fecha_transaccion, Transaccion.id_transaccion)
+
+
+def consulta_auditoria(
+    accion: Optional[str] = None,
+    tabla_afectada: Optional[str] = None,
+    id_usuario: Optional[UUID] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+) -> Select:
+    """Consulta de exportación de auditoría, en orden cronológico.
+
+    El orden (fecha, id_auditoria) recorre los índices del listado paginado.
+
+    Args:
+        accion (str, optional): Filtrar por acción (CREATE, READ, ...).
+        tabla_afectada (str, optional): Filtrar por tabla afectada.
+        id_usuario (UUID, optional): Filtrar por usuario.
+        desde (datetime, optional): Fecha mínima (inclusive).
+        hasta (datetime, optional): Fecha máxima (inclusive).
+
+    Returns:
+        Select: Consulta de columnas lista para `exportar`.
+    """
+    consulta = select(
+        Auditoria.id_auditoria,
+        Auditoria.id_usuario,
+        Auditoria.tabla_afectada,
+        Auditoria.accion,
+        Auditoria.descripcion,
+        Auditoria.fecha,
+    )
+    if accion:
+        consulta = consulta.where(Auditoria.accion == accion)
+    if tabla_afectada:
+        consulta = consulta.where(Auditoria.tabla_afectada == tabla_afectada)
+    if id_usuario:
+        consulta = consulta.where(Auditoria.id_usuario == id_usuario)
+    if desde:
+        consulta = consulta.where(Auditoria.fecha >= desde)
+    if hasta:
+        consulta = consulta.where(Auditoria.fecha <= hasta)
+    return consulta.order_by(Auditoria.fecha, Auditoria.id_auditoria)
+
+
+def _valor(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, UUID):
+        return str(valor)
+    return valor
+
+
+def filas_ndjson(columnas: list, filas) -> bytes:
+    """Filas como líneas NDJSON, un objeto por fila con las columnas como claves."""
+    return "".join(
+        json.dumps(
+            {columna: _valor(v) for columna, v in zip(columnas, fila)},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        + "\n"
+        for fila in filas
+    ).encode("utf-8")
+
+
+def filas_csv(filas) -> bytes:
+    """Filas como líneas CSV (sin encabezado)."""
+    salida = io.StringIO()
+    csv.writer(salida, lineterminator="\n").writerows(
+        [_valor(v) for v in fila] for fila in filas
+    )
+    return salida.getvalue().encode("utf-8")
+
+
+async def exportar(
+    consulta: Select, formato: str, tamano_lote: int = TAMANO_LOTE_EXPORTACION
+) -> AsyncIterator[bytes]:
+    """Ejecuta la consulta con un cursor del servidor y entrega el archivo por lotes.
+
+    Args:
+        consulta (Select): Consulta de columnas (ver `consulta_transacciones`).
+        formato (str): "ndjson" o "csv" (ver `FORMATOS_EXPORTACION`).
+        tamano_lote (int): Filas por viaje al cursor y por fragmento enviado.
+
+    Raises:
+        ValueError: Si el formato no está soportado.
+
+    Yields:
+        bytes: Fragmento del archivo; en CSV el primero es el encabezado.
+    """
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Formato no soportado: {formato}")
+
+    async with nueva_sesion_asincrona() as db:
+        resultado = await db.stream(consulta.execution_options(yield_per=tamano_lote))
+        columnas = list(resultado.keys())
+        if formato == "csv":
+            yield filas_csv([columnas])
+        async for filas in resultado.partitions():
+            yield (
+                filas_ndjson(columnas, filas)
+                if formato == "ndjson"
+                else filas_csv(filas)
+            )
+
+
+def respuesta_exportacion(consulta: Select, formato: str, nombre: str):
+    """Respuesta HTTP que transmite la exportación como archivo adjunto.
+
+    Args:
+        consulta (Select): Consulta de columnas a exportar.
+        formato (str): "ndjson" o "csv".
+        nombre (str): Nombre del archivo sin extensión.
+
+    Returns:
+        StreamingResponse: Respuesta con el archivo por fragmentos.
+    """
+    return StreamingResponse(
+        exportar(consulta, formato),
+        media_type=FORMATOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'},
+    )
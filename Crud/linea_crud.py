@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
 from typing import List
 from Entities.linea import Linea
-from sqlalchemy import select, update
+from sqlalchemy import delete, func, select, update
+from Entities.asignacionT import AsignacionT
+from Entities.ruta import Ruta
+from Entities.transporte import Transporte
 from Entities.usuario import Usuario
 from datetime import datetime
 import uuid
@@ -30,6 +33,17 @@ class LineaCRUD:
         """
         self.db = db
 
+    def obtener_por_id(self, id_linea: uuid.UUID):
+        """Obtiene una línea por su llave primaria.
+
+        Args:
+            id_linea (UUID): ID de la línea.
+
+        Returns:
+            Linea | None: La línea encontrada o None si no existe.
+        """
+        return self.db.get(Linea, id_linea)
+
     def registrar_linea(self, nombre_linea: str, descripcion: str) -> Linea:
         """Registra una nueva línea en la base de datos.
 
@@ -49,3 +63,43 @@ class LineaCRUD:
         self.db.commit()
         self.db.refresh(linea)
         return linea
+
+    def eliminar_linea(self, id_linea: uuid.UUID) -> bool:
+        """Elimina una línea con sus rutas y las asignaciones de esas rutas.
+
+        Todo se hace con un DELETE por tabla (sin cargar las rutas en memoria)
+        en una sola transacción.
+
+        Args:
+            id_linea (UUID): ID de la línea a eliminar.
+
+        Raises:
+            ValueError: Si la línea tiene transportes asignados.
+
+        Returns:
+            bool: True si la línea fue eliminada, False si no fue encontrada.
+        """
+        existe = self.db.scalar(
+            select(Linea.id_linea).where(Linea.id_linea == id_linea)
+        )
+        if existe is None:
+            return False
+        transportes = self.db.scalar(
+            select(func.count())
+            .select_from(Transporte)
+            .where(Transporte.id_linea == id_linea)
+        )
+        if transportes:
+            raise ValueError(
+                f"La línea tiene {transportes} transportes asignados; "
+                "reasígnelos o elimínelos primero"
+            )
+        rutas = select(Ruta.id_ruta).where(Ruta.id_linea == id_linea)
+        for sentencia in (
+            delete(AsignacionT).where(AsignacionT.id_ruta.in_(rutas)),
+            delete(Ruta).where(Ruta.id_linea == id_linea),
+            delete(Linea).where(Linea.id_linea == id_linea),
+        ):
+            self.db.execute(sentencia, execution_options={"synchronize_session": False})
+        self.db.commit()
+        return True
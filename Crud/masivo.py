@@ -0,0 +1,245 @@
+"""
+Carga masiva
+============
+
+Inserción de lotes grandes (miles de filas) en una sola transacción, con un
+reporte de errores por fila en lugar de abortar todo el lote.
+
+1. Se descartan las filas que repiten una llave única dentro del lote.
+2. Se consultan en bloque (`WHERE llave IN (...)`) las llaves que ya existen
+   y las referencias (llaves foráneas) que no existen.
+3. Las filas restantes se insertan con INSERT multi-fila de hasta
+   `FILAS_POR_INSERT` filas. En PostgreSQL y SQLite se usa
+   `ON CONFLICT DO NOTHING RETURNING`: una fila que choca con otra insertada
+   en paralelo después del paso 2 no se devuelve y se reporta como error.
+4. Un único commit al final.
+
+Cada fila lleva su llave primaria generada aquí, para asociar lo que
+devuelve el RETURNING con la posición de la fila en el lote.
+"""
+
+import os
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from Crud.consultas import insert_con_conflictos
+
+MAX_FILAS_MASIVO = int(os.getenv("CARGA_MASIVA_MAX_FILAS", "10000"))
+FILAS_POR_INSERT = 500
+_VALORES_POR_CONSULTA = 1000
+
+
+def validar_tamano_lote(cantidad: int):
+    """Verifica que el lote no esté vacío ni supere `CARGA_MASIVA_MAX_FILAS`.
+
+    Raises:
+        ValueError: Si el lote está vacío o es demasiado grande.
+    """
+    if cantidad == 0:
+        raise ValueError("El lote está vacío")
+    if cantidad > MAX_FILAS_MASIVO:
+        raise ValueError(
+            f"El lote tiene {cantidad} filas; el máximo es {MAX_FILAS_MASIVO}"
+        )
+
+
+def _error(indice: int, detalle: str, campo=None, valor=None) -> dict:
+    return {
+        "indice": indice,
+        "campo": campo,
+        "valor": None if valor is None else str(valor),
+        "detalle": detalle,
+    }
+
+
+def por_bloques(valores: Iterable) -> Iterator[list]:
+    """Divide los valores en bloques aptos para un `IN (...)`."""
+    valores = list(valores)
+    for inicio in range(0, len(valores), _VALORES_POR_CONSULTA):
+        yield valores[inicio : inicio + _VALORES_POR_CONSULTA]
+
+
+def _existentes(db: Session, columna, valores: set) -> set:
+    """Valores de `columna` que ya están en la tabla, consultados por bloques."""
+    encontrados = set()
+    for bloque in por_bloques(valores):
+        encontrados.update(db.scalars(select(columna).where(columna.in_(bloque))))
+    return encontrados
+
+
+def filtrar_lote(
+    db: Session,
+    modelo,
+    filas: List[dict],
+    llaves_unicas=(),
+    referencias: Optional[Dict[str, object]] = None,
+    errores: Optional[List[dict]] = None,
+) -> List[int]:
+    """Retorna las posiciones de las filas que se pueden insertar.
+
+    Args:
+        db (Session): Sesión de la base de datos.
+        modelo: Modelo SQLAlchemy de las filas.
+        filas (List[dict]): Valores de cada fila.
+        llaves_unicas (Iterable[str]): Columnas con restricción UNIQUE.
+        referencias (Dict[str, Column], optional): Columna de la fila -> columna
+            referenciada que debe existir (llave foránea).
+        errores (List[dict], optional): Lista donde se agregan los errores
+            por fila.
+
+    Returns:
+        List[int]: Posiciones válidas, en orden.
+    """
+    errores = [] if errores is None else errores
+    rechazadas = set()
+
+    for campo in llaves_unicas:
+        vistos = {}
+        for indice, fila in enumerate(filas):
+            valor = fila[campo]
+            if valor in vistos:
+                errores.append(
+                    _error(
+                        indice,
+                        f"Valor de {campo} repetido en la fila {vistos[valor]} del lote",
+                        campo,
+                        valor,
+                    )
+                )
+                rechazadas.add(indice)
+            else:
+                vistos[valor] = indice
+        repetidos = _existentes(db, getattr(modelo, campo), set(vistos))
+        for valor in repetidos:
+            indice = vistos[valor]
+            if indice not in rechazadas:
+                errores.append(
+                    _error(
+                        indice, f"Ya existe un registro con ese {campo}", campo, valor
+                    )
+                )
+                rechazadas.add(indice)
+
+    for campo, columna in (referencias or {}).items():
+        valores = {fila[campo] for fila in filas if fila.get(campo) is not None}
+        faltantes = valores - _existentes(db, columna, valores)
+        for indice, fila in enumerate(filas):
+            if fila.get(campo) in faltantes and indice not in rechazadas:
+                errores.append(
+                    _error(
+                        indice,
+                        "No existe el registro referenciado",
+                        campo,
+                        fila[campo],
+                    )
+                )
+                rechazadas.add(indice)
+
+    return [indice for indice in range(len(filas)) if indice not in rechazadas]
+
+
+def _mensaje_conflicto(error: IntegrityError) -> str:
+    """Explica un IntegrityError del INSERT de un lote ya validado.
+
+    ON CONFLICT DO NOTHING solo cubre las llaves únicas: una llave foránea
+    cuyo registro se eliminó después de `filtrar_lote` también llega aquí.
+    """
+    original = error.orig
+    codigo = getattr(original, "pgcode", None) or getattr(
+        original, "sqlite_errorname", None
+    )
+    if codigo in ("23503", "SQLITE_CONSTRAINT_FOREIGNKEY"):
+        return (
+            "Se eliminó un registro referenciado por el lote durante la carga; "
+            "vuelva a enviarlo"
+        )
+    if codigo in ("23505", "SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY"):
+        return "Otra operación registró datos repetidos del lote; vuelva a enviarlo"
+    return "Los datos del lote cambiaron durante la carga; vuelva a enviarlo"
+
+
+def insertar_lote(
+    db: Session,
+    modelo,
+    filas: List[dict],
+    llaves_unicas=(),
+    referencias: Optional[Dict[str, object]] = None,
+    preparar: Optional[Callable[[int, dict], dict]] = None,
+) -> dict:
+    """Inserta un lote en una transacción y reporta los errores por fila.
+
+    Args:
+        db (Session): Sesión de la base de datos.
+        modelo: Modelo SQLAlchemy de las filas; su llave primaria debe ser
+            una sola columna UUID.
+        filas (List[dict]): Valores de cada fila, sin la llave primaria.
+        llaves_unicas (Iterable[str]): Columnas con restricción UNIQUE.
+        referencias (Dict[str, Column], optional): Llaves foráneas a verificar.
+        preparar (Callable, optional): Recibe (posición, fila) y retorna la
+            fila a insertar; solo se llama para las filas válidas (por
+            ejemplo, para calcular el hash de la contraseña).
+
+    Raises:
+        ValueError: Si el lote está vacío o excede el máximo, si en un motor
+            sin ON CONFLICT una fila choca con otra insertada en paralelo, o
+            si un registro referenciado se eliminó durante la carga.
+
+    Returns:
+        dict: `recibidos`, `creados` ({indice, id}) y `errores`
+            ({indice, campo, valor, detalle}), como `ResultadoMasivo`.
+    """
+    validar_tamano_lote(len(filas))
+    filas = list(filas)
+    llave = modelo.__table__.primary_key.columns.values()[0]
+    errores = []
+    validas = filtrar_lote(db, modelo, filas, llaves_unicas, referencias, errores)
+    por_id = {}
+    for indice in validas:
+        id_fila = uuid.uuid4()
+        por_id[id_fila] = indice
+        fila = preparar(indice, filas[indice]) if preparar else filas[indice]
+        filas[indice] = {**fila, llave.key: id_fila}
+
+    insert_dialecto = insert_con_conflictos(db.get_bind().dialect.name)
+    insertados = set()
+    try:
+        for inicio in range(0, len(validas), FILAS_POR_INSERT):
+            bloque = [filas[i] for i in validas[inicio : inicio + FILAS_POR_INSERT]]
+            if insert_dialecto is not None:
+                sentencia = (
+                    insert_dialecto(modelo)
+                    .values(bloque)
+                    .on_conflict_do_nothing()
+                    .returning(llave)
+                )
+                insertados.update(db.scalars(sentencia))
+            else:
+                db.execute(insert(modelo), bloque)
+                insertados.update(fila[llave.key] for fila in bloque)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise ValueError(_mensaje_conflicto(e))
+    except Exception:
+        db.rollback()
+        raise
+
+    for id_fila, indice in por_id.items():
+        if id_fila not in insertados:
+            errores.append(
+                _error(indice, "Choca con un registro creado durante la carga")
+            )
+    errores.sort(key=lambda error: error["indice"])
+    creados = sorted(
+        (
+            {"indice": indice, "id": id_fila}
+            for id_fila, indice in por_id.items()
+            if id_fila in insertados
+        ),
+        key=lambda fila: fila["indice"],
+    )
+    return {"recibidos": len(filas), "creados": creados, "errores": errores}
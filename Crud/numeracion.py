@@ -0,0 +1,203 @@
+"""
+Numeración de tarjetas
+======================
+
+Asigna números de tarjeta únicos sin consultar la tabla de tarjetas. Cada
+proceso reserva bloques de seriales en la base de datos (secuencia nativa
+en PostgreSQL, tabla `secuencias` en los demás motores) y los entrega desde
+memoria, así que la base solo se toca una vez por bloque.
+
+Formato (16 dígitos): prefijo + serial permutado + dígito de control Luhn.
+La permutación `serial * A + B mod 10^n` es biyectiva, de modo que dos
+seriales distintos nunca producen el mismo número, y evita que los números
+emitidos sean consecutivos. No es un mecanismo de seguridad.
+
+El dígito de control permite descartar números mal digitados antes de
+cualquier consulta. Las tarjetas emitidas antes de este esquema tienen
+números aleatorios sin dígito de control, por lo que el rechazo se activa
+con `TARJETA_RECHAZAR_NO_LUHN` una vez reemitidas.
+"""
+
+import asyncio
+import os
+import threading
+from typing import List
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from database.config import engine
+from Entities.secuencia import SECUENCIA_TARJETAS, Secuencia
+
+LONGITUD_TARJETA = 16
+PREFIJO_TARJETA = os.getenv("TARJETA_PREFIJO", "8")
+BLOQUE_TARJETAS = int(os.getenv("TARJETA_BLOQUE_NUMEROS", "100"))
+RECHAZAR_NO_LUHN = os.getenv("TARJETA_RECHAZAR_NO_LUHN", "false").lower() in (
+    "1",
+    "true",
+    "si",
+    "sí",
+)
+
+_MULTIPLICADOR = 7_919_041_763_213
+_DESPLAZAMIENTO = 1_234_567_890_123
+
+
+def digito_luhn(parcial: str) -> str:
+    """Calcula el dígito de control Luhn de un número sin él.
+
+    Args:
+        parcial (str): Dígitos del número sin el dígito de control.
+
+    Returns:
+        str: Dígito de control.
+    """
+    total = 0
+    for posicion, caracter in enumerate(reversed(parcial)):
+        digito = int(caracter)
+        if posicion % 2 == 0:
+            digito *= 2
+            if digito > 9:
+                digito -= 9
+        total += digito
+    return str((10 - total % 10) % 10)
+
+
+def es_luhn_valido(numero: str) -> bool:
+    """Indica si un número completo tiene un dígito de control Luhn válido."""
+    return (
+        len(numero) > 1 and numero.isdigit() and digito_luhn(numero[:-1]) == numero[-1]
+    )
+
+
+def numero_aceptable(numero: str) -> bool:
+    """Filtro previo a las consultas por número de tarjeta.
+
+    Con `TARJETA_RECHAZAR_NO_LUHN` activo exige longitud y dígito de control
+    correctos; si no, solo exige dígitos para no rechazar tarjetas antiguas.
+
+    Args:
+        numero (str): Número de tarjeta recibido.
+
+    Returns:
+        bool: False si el número no puede corresponder a ninguna tarjeta.
+    """
+    if not numero.isdigit():
+        return False
+    if RECHAZAR_NO_LUHN:
+        return len(numero) == LONGITUD_TARJETA and es_luhn_valido(numero)
+    return True
+
+
+class AsignadorNumeros:
+    """Entrega números únicos a partir de bloques reservados en la base de datos.
+
+    Atributos:
+        nombre (str): Nombre del contador en la tabla `secuencias`.
+        secuencia (Sequence): Secuencia nativa usada en PostgreSQL.
+        prefijo (str): Dígitos fijos al inicio del número.
+        longitud (int): Longitud total del número, con el dígito de control.
+        bloque (int): Seriales reservados por viaje a la base de datos.
+    """
+
+    def __init__(self, nombre, secuencia, prefijo: str, longitud: int, bloque: int):
+        self.nombre = nombre
+        self.secuencia = secuencia
+        self.prefijo = prefijo
+        self.longitud = longitud
+        self.bloque = bloque
+        self._digitos = longitud - len(prefijo) - 1
+        self._modulo = 10**self._digitos
+        self._disponibles: List[int] = []
+        self._lock = threading.Lock()
+
+    def siguiente(self) -> str:
+        """Retorna un número nuevo; reserva otro bloque si el actual se agotó."""
+        with self._lock:
+            if self._disponibles:
+                return self._formatear(self._disponibles.pop())
+        # La reserva se hace sin el lock: dentro de `run_sync` cede el bucle
+        # de eventos, y otra petición del mismo hilo quedaría bloqueada en él.
+        propio, *resto = self._reservar_seriales(self.bloque)
+        with self._lock:
+            self._disponibles.extend(reversed(resto))
+        return self._formatear(propio)
+
+    def reservar(self, cantidad: int) -> List[str]:
+        """Retorna `cantidad` números nuevos con un solo viaje a la base de datos.
+
+        Args:
+            cantidad (int): Números solicitados (emisión masiva de tarjetas).
+
+        Returns:
+            List[str]: Números únicos con dígito de control.
+        """
+        with self._lock:
+            tomados = [
+                self._disponibles.pop()
+                for _ in range(min(cantidad, len(self._disponibles)))
+            ]
+        faltan = cantidad - len(tomados)
+        if faltan:
+            tomados += self._reservar_seriales(faltan)
+        return [self._formatear(serial) for serial in tomados]
+
+    def _reservar_seriales(self, cantidad: int) -> List[int]:
+        """Reserva `cantidad` seriales en una transacción propia y confirmada.
+
+        Dentro de `run_sync` (CRUD asíncronos) la reserva corre en otro hilo
+        y se espera sin bloquear el bucle de eventos.
+        """
+        if in_greenlet():
+            return await_only(asyncio.to_thread(self._reservar_en_base, cantidad))
+        return self._reservar_en_base(cantidad)
+
+    def _reservar_en_base(self, cantidad: int) -> List[int]:
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                return list(
+                    conn.execute(
+                        select(self.secuencia.next_value()).select_from(
+                            func.generate_series(1, cantidad)
+                        )
+                    ).scalars()
+                )
+            fin = conn.execute(
+                update(Secuencia)
+                .where(Secuencia.nombre == self.nombre)
+                .values(valor=Secuencia.valor + cantidad)
+                .returning(Secuencia.valor)
+            ).scalar()
+            if fin is None:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(
+                            insert(Secuencia).values(nombre=self.nombre, valor=cantidad)
+                        )
+                    fin = cantidad
+                except IntegrityError:
+                    # Otro proceso creó el contador al mismo tiempo.
+                    fin = conn.execute(
+                        update(Secuencia)
+                        .where(Secuencia.nombre == self.nombre)
+                        .values(valor=Secuencia.valor + cantidad)
+                        .returning(Secuencia.valor)
+                    ).scalar()
+            return list(range(fin - cantidad, fin))
+
+    def _formatear(self, serial: int) -> str:
+        if serial >= self._modulo:
+            raise ValueError("Numeración de tarjetas agotada para el prefijo")
+        permutado = (serial * _MULTIPLICADOR + _DESPLAZAMIENTO) % self._modulo
+        parcial = f"{self.prefijo}{permutado:0{self._digitos}d}"
+        return parcial + digito_luhn(parcial)
+
+
+asignador_tarjetas = AsignadorNumeros(
+    "tarjetas",
+    SECUENCIA_TARJETAS,
+    PREFIJO_TARJETA,
+    LONGITUD_TARJETA,
+    BLOQUE_TARJETAS,
+)
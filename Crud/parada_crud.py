@@ -1,6 +1,9 @@
-from Entities.parada import Parada, ParadaCreate, ParadaUpdate
+from Entities.parada import Parada, ParadaCreate, ParadaOut, ParadaUpdate
+from typing import List
 from uuid import UUID
 from sqlalchemy.orm import Session
+from Crud.consultas import aplicar_orden, listar, paginar, proyectar
+from Crud.masivo import insertar_lote
 
 
 class ParadaCRUD:
@@ -10,6 +13,8 @@ class ParadaCRUD:
         db (Session): Sesión de la base de datos
     """
 
+    CAMPOS_ORDEN = ("nombre", "direccion", "estado")
+
     def __init__(self, db: Session):
         """Inicializa la clase ParadaCRUD con una sesión de base de datos.
 
@@ -18,6 +23,32 @@ class ParadaCRUD:
         """
         self.db = db
 
+    def obtener_por_id(self, id_parada: UUID):
+        """Obtiene una parada por su llave primaria.
+
+        Args:
+            id_parada (UUID): ID de la parada.
+
+        Returns:
+            Parada | None: La parada encontrada o None si no existe.
+        """
+        return self.db.get(Parada, id_parada)
+
+    def _proyeccion(self):
+        """Consulta de las columnas de `ParadaOut`."""
+        return proyectar(self.db, Parada, ParadaOut)
+
+    def consultar_por_id(self, id_parada: UUID):
+        """Consulta una parada por su ID leyendo solo las columnas de salida.
+
+        Args:
+            id_parada (UUID): ID de la parada.
+
+        Returns:
+            Row | None: Fila con las columnas de `ParadaOut` o None si no existe.
+        """
+        return self._proyeccion().filter(Parada.id_parada == id_parada).first()
+
     def registrar_parada(self, parada: ParadaCreate):
         """Registra una nueva parada en la base de datos.
 
@@ -33,6 +64,21 @@ class ParadaCRUD:
         self.db.refresh(nueva)
         return nueva
 
+    def registrar_paradas_masivo(self, paradas: List[ParadaCreate]) -> dict:
+        """Registra un lote de paradas en una sola transacción.
+
+        Args:
+            paradas (List[ParadaCreate]): Lote de paradas.
+
+        Raises:
+            ValueError: Si el lote está vacío o excede el máximo permitido.
+
+        Returns:
+            dict: Resultado con las filas creadas; sin errores por fila, ya
+            que las paradas no tienen campos únicos ni referencias.
+        """
+        return insertar_lote(self.db, Parada, [parada.dict() for parada in paradas])
+
     def modificar_parada(self, id_parada: UUID, parada_update: ParadaUpdate):
         """Modifica una parada existente en la base de datos.
 
@@ -46,7 +92,7 @@ class ParadaCRUD:
         Returns:
             Parada: La parada modificada
         """
-        parada = self.db.query(Parada).get(id_parada)
+        parada = self.obtener_por_id(id_parada)
         if not parada:
             raise ValueError("Parada no encontrada")
         for key, value in parada_update.dict(exclude_unset=True).items():
@@ -64,12 +110,52 @@ class ParadaCRUD:
         Returns:
             bool: True si la parada fue eliminada, False si no fue encontrada
         """
-        parada = self.db.query(Parada).get(id_parada)
+        parada = self.obtener_por_id(id_parada)
         if parada:
             self.db.delete(parada)
             self.db.commit()
             return True
         return False
 
-    def listar_paradas(self):
-        return self.db.query(Parada).all()
+    def listar_paradas(
+        self,
+        skip: int = 0,
+        limit: int | None = None,
+        estado: str | None = None,
+        orden: str | None = None,
+    ):
+        """Lista las paradas filtrando y paginando en la base de datos.
+
+        Args:
+            skip (int): Número de registros a saltar.
+            limit (int, optional): Número máximo de registros a retornar.
+            estado (str, optional): Filtrar por estado.
+            orden (str, optional): Campo de ordenamiento ("campo" o "-campo").
+
+        Returns:
+            List[Row]: Filas con las columnas de `ParadaOut`.
+        """
+        return listar(
+            self._proyeccion(),
+            Parada,
+            skip=skip,
+            limit=limit,
+            orden=orden,
+            permitidos=self.CAMPOS_ORDEN,
+            estado=estado,
+        )
+
+    def buscar_por_nombre(self, nombre: str, skip: int = 0, limit: int | None = None):
+        """Busca paradas cuyo nombre contenga un texto, sin distinguir mayúsculas.
+
+        Args:
+            nombre (str): Texto a buscar en el nombre.
+            skip (int): Número de registros a saltar.
+            limit (int, optional): Número máximo de registros a retornar.
+
+        Returns:
+            List[Row]: Filas con las columnas de `ParadaOut`.
+        """
+        query = self._proyeccion().filter(Parada.nombre.ilike(f"%{nombre}%"))
+        query = aplicar_orden(query, Parada, "nombre", self.CAMPOS_ORDEN)
+        return paginar(query, skip, limit).all()
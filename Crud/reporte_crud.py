@@ -0,0 +1,204 @@
+"""
+Operaciones CRUD para los reportes de transacciones
+===================================================
+
+El resumen diario se mantiene de forma incremental: cada escritura de una
+Transaccion suma su monto a la fila (día, tipo de transacción, tipo de
+tarjeta) en la misma transacción de base de datos, con un upsert
+`INSERT ... ON CONFLICT DO UPDATE`. Los reportes leen solo esa tabla.
+"""
+
+import os
+import random
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from Crud.consultas import insert_con_conflictos
+from Entities.resumen import ResumenTransaccionDiario
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion
+
+PARTICIONES_RESUMEN = int(os.getenv("RESUMEN_PARTICIONES", "8"))
+
+_LLAVE_RESUMEN = ("dia", "tipo_transaccion", "tipo_tarjeta", "particion")
+
+
+def particion_aleatoria() -> int:
+    """Partición del contador en la que se acumula un movimiento."""
+    return random.randrange(PARTICIONES_RESUMEN)
+
+
+def acumular(sentencia):
+    """Convierte un INSERT en el resumen en un upsert que suma cantidad y total.
+
+    Args:
+        sentencia: INSERT de PostgreSQL o SQLite sobre ResumenTransaccionDiario.
+    """
+    return sentencia.on_conflict_do_update(
+        index_elements=list(_LLAVE_RESUMEN),
+        set_={
+            "cantidad": ResumenTransaccionDiario.cantidad + sentencia.excluded.cantidad,
+            "total": ResumenTransaccionDiario.total + sentencia.excluded.total,
+        },
+    )
+
+
+def acumular_en_resumen(
+    db: Session,
+    fecha: datetime,
+    tipo_transaccion: str,
+    tipo_tarjeta: str,
+    monto: float,
+    cantidad: int = 1,
+):
+    """Suma un movimiento al resumen diario sin hacer commit.
+
+    Debe llamarse en la misma transacción que inserta la Transaccion, para
+    que el resumen y el detalle nunca difieran.
+
+    Args:
+        db (Session): Sesión con la transacción en curso.
+        fecha (datetime): Fecha de la transacción.
+        tipo_transaccion (str): Tipo de transacción.
+        tipo_tarjeta (str): Tipo de la tarjeta.
+        monto (float): Monto de la transacción.
+        cantidad (int): Número de transacciones que representa.
+    """
+    valores = {
+        "dia": fecha.date(),
+        "tipo_transaccion": tipo_transaccion,
+        "tipo_tarjeta": tipo_tarjeta,
+        "particion": particion_aleatoria(),
+        "cantidad": cantidad,
+        "total": monto,
+    }
+    insert_dialecto = insert_con_conflictos(db.get_bind().dialect.name)
+    if insert_dialecto is not None:
+        db.execute(acumular(insert_dialecto(ResumenTransaccionDiario).values(valores)))
+        return
+
+    llave = [
+        getattr(ResumenTransaccionDiario, campo) == valores[campo]
+        for campo in _LLAVE_RESUMEN
+    ]
+    actualizadas = db.execute(
+        update(ResumenTransaccionDiario)
+        .where(*llave)
+        .values(
+            cantidad=ResumenTransaccionDiario.cantidad + cantidad,
+            total=ResumenTransaccionDiario.total + monto,
+        )
+    ).rowcount
+    if not actualizadas:
+        db.execute(insert(ResumenTransaccionDiario).values(valores))
+
+
+class ReporteCRUD:
+    """Clase para los reportes de transacciones
+
+    Atributos:
+        db (Session): Sesión de la base de datos
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def resumen_diario(
+        self,
+        desde: date,
+        hasta: date,
+        tipo_transaccion: Optional[str] = None,
+        tipo_tarjeta: Optional[str] = None,
+    ) -> List:
+        """Obtiene los totales por día, tipo de transacción y tipo de tarjeta.
+
+        Solo lee la tabla de resumen (llave primaria encabezada por el día),
+        así que el costo depende del número de días, no de transacciones.
+
+        Args:
+            desde (date): Primer día (inclusive).
+            hasta (date): Último día (inclusive).
+            tipo_transaccion (str, optional): Filtrar por tipo de transacción.
+            tipo_tarjeta (str, optional): Filtrar por tipo de tarjeta.
+
+        Returns:
+            List: Filas con dia, tipo_transaccion, tipo_tarjeta, cantidad y total.
+        """
+        resumen = ResumenTransaccionDiario
+        consulta = select(
+            resumen.dia,
+            resumen.tipo_transaccion,
+            resumen.tipo_tarjeta,
+            func.sum(resumen.cantidad).label("cantidad"),
+            func.sum(resumen.total).label("total"),
+        ).where(resumen.dia >= desde, resumen.dia <= hasta)
+        if tipo_transaccion:
+            consulta = consulta.where(resumen.tipo_transaccion == tipo_transaccion)
+        if tipo_tarjeta:
+            consulta = consulta.where(resumen.tipo_tarjeta == tipo_tarjeta)
+        # Los grupos cuyas transacciones se borraron (ver
+        # `UsuarioCRUD.eliminar_usuarios`) suman cero y no se reportan, igual
+        # que si el resumen se hubiera recalculado.
+        consulta = (
+            consulta.group_by(
+                resumen.dia, resumen.tipo_transaccion, resumen.tipo_tarjeta
+            )
+            .having(func.sum(resumen.cantidad) != 0)
+            .order_by(resumen.dia, resumen.tipo_transaccion, resumen.tipo_tarjeta)
+        )
+        return self.db.execute(consulta).all()
+
+    def recalcular_resumen(self, desde: date, hasta: date) -> int:
+        """Reconstruye el resumen de un rango de días a partir de las transacciones.
+
+        Borra el resumen del rango e inserta los totales agregados en SQL,
+        todo en una transacción. Pensado para la carga inicial y para
+        corregir días cerrados; los días en curso se mantienen solos.
+
+        Args:
+            desde (date): Primer día (inclusive).
+            hasta (date): Último día (inclusive).
+
+        Returns:
+            int: Número de filas de resumen escritas.
+        """
+        inicio = datetime.combine(desde, time.min)
+        fin = datetime.combine(hasta + timedelta(days=1), time.min)
+        dia = func.date(Transaccion.fecha_transaccion)
+        agregado = (
+            select(
+                dia,
+                Transaccion.tipo_transaccion,
+                Tarjeta.tipo_tarjeta,
+                literal(0),
+                func.count(),
+                func.sum(Transaccion.monto),
+            )
+            .join(Tarjeta, Tarjeta.numero_tarjeta == Transaccion.numero_tarjeta)
+            .where(
+                Transaccion.fecha_transaccion >= inicio,
+                Transaccion.fecha_transaccion < fin,
+            )
+            .group_by(dia, Transaccion.tipo_transaccion, Tarjeta.tipo_tarjeta)
+        )
+        try:
+            self.db.execute(
+                delete(ResumenTransaccionDiario).where(
+                    ResumenTransaccionDiario.dia >= desde,
+                    ResumenTransaccionDiario.dia <= hasta,
+                )
+            )
+            escritas = self.db.execute(
+                insert(ResumenTransaccionDiario).from_select(
+                    list(_LLAVE_RESUMEN) + ["cantidad", "total"],
+                    agregado,
+                )
+            ).rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return escritas
@@ -19,6 +19,17 @@ class RutaCRUD:
     def __init__(self, db: Session):
         self.db = db
 
+    def obtener_por_id(self, id_ruta: uuid.UUID):
+        """Obtiene una ruta por su llave primaria.
+
+        Args:
+            id_ruta (UUID): ID de la ruta.
+
+        Returns:
+            Ruta | None: La ruta encontrada o None si no existe.
+        """
+        return self.db.get(Ruta, id_ruta)
+
     def registrar_ruta(
         self,
         nombre_ruta: str,
@@ -68,7 +79,7 @@ class RutaCRUD:
 
         Returns:
             Ruta: Objeto de la ruta modificada"""
-        ruta = self.db.query(Ruta).filter(Ruta.id_ruta == id_ruta).first()
+        ruta = self.obtener_por_id(id_ruta)
         if not ruta:
             raise ValueError("Ruta no encontrada")
 
@@ -0,0 +1,191 @@
+"""
+Hashing de contraseñas
+======================
+
+bcrypt consume entre 100 y 300 ms de CPU por llamada. Las funciones
+síncronas sirven a scripts y a los CRUD; la API usa `pool_hashing`, que
+ejecuta el hash y la verificación en un pool de procesos acotado para no
+congelar el event loop y repartir la carga entre los núcleos.
+
+Este módulo no importa la base de datos: los procesos del pool solo
+necesitan bcrypt. Los procesos se crean con `spawn`, así que los scripts que
+usen el pool deben proteger su código con `if __name__ == "__main__":`.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+
+def hash_contrasena(contrasena: str) -> str:
+    """Genera el hash bcrypt de una contraseña.
+
+    Args:
+        contrasena (str): Contraseña en texto plano.
+
+    Returns:
+        str: Hash bcrypt en texto.
+    """
+    return bcrypt.hashpw(contrasena.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def verificar_contrasena(contrasena: str, contrasena_hash: str) -> bool:
+    """Verifica una contraseña contra su hash bcrypt.
+
+    Args:
+        contrasena (str): Contraseña en texto plano.
+        contrasena_hash (str): Hash almacenado.
+
+    Returns:
+        bool: True si la contraseña corresponde al hash.
+    """
+    return bcrypt.checkpw(contrasena.encode("utf-8"), contrasena_hash.encode("utf-8"))
+
+
+def _hash_varias(contrasenas: list) -> list:
+    """Calcula varios hashes en una sola tarea del pool."""
+    return [hash_contrasena(contrasena) for contrasena in contrasenas]
+
+
+def _medido(funcion, *args):
+    """Ejecuta `funcion` en el proceso del pool y devuelve cuándo empezó."""
+    return time.time(), funcion(*args)
+
+
+class PoolHashing:
+    """Pool de procesos para bcrypt con límite de concurrencia y métricas.
+
+    Atributos:
+        procesos (int): Número de procesos del pool.
+        max_concurrencia (int): Operaciones admitidas a la vez; el resto
+            espera su turno sin ocupar el pool.
+    """
+
+    def __init__(self, procesos: int, max_concurrencia: int):
+        self.procesos = procesos
+        self.max_concurrencia = max_concurrencia
+        self._executor = None
+        self._lock = threading.Lock()
+        self._semaforos = weakref.WeakKeyDictionary()
+        self._en_curso = 0
+        self._operaciones = 0
+        self._espera_total_ms = 0.0
+        self._espera_max_ms = 0.0
+        self._ejecucion_total_ms = 0.0
+
+    def _obtener_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: los procesos no heredan hilos ni conexiones del padre.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.procesos,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _semaforo(self) -> asyncio.Semaphore:
+        # Un semáforo por event loop: asyncio.Semaphore queda ligado a su loop.
+        loop = asyncio.get_running_loop()
+        semaforo = self._semaforos.get(loop)
+        if semaforo is None:
+            semaforo = self._semaforos[loop] = asyncio.Semaphore(self.max_concurrencia)
+        return semaforo
+
+    async def _ejecutar(self, funcion, *args):
+        solicitada = time.time()
+        async with self._semaforo():
+            self._en_curso += 1
+            try:
+                inicio, resultado = await asyncio.get_running_loop().run_in_executor(
+                    self._obtener_executor(), _medido, funcion, *args
+                )
+            finally:
+                self._en_curso -= 1
+        fin = time.time()
+        espera = (inicio - solicitada) * 1000
+        self._operaciones += 1
+        self._espera_total_ms += espera
+        self._espera_max_ms = max(self._espera_max_ms, espera)
+        self._ejecucion_total_ms += (fin - inicio) * 1000
+        return resultado
+
+    async def hash(self, contrasena: str) -> str:
+        """Versión asíncrona de `hash_contrasena`."""
+        return await self._ejecutar(hash_contrasena, contrasena)
+
+    async def hash_lote(self, contrasenas: list, por_tarea: int = 8) -> list:
+        """Calcula los hashes de un lote repartiéndolos entre los procesos.
+
+        Las contraseñas se envían en tareas de `por_tarea` para no pagar la
+        comunicación entre procesos por cada una. El lote ocupa como máximo
+        la mitad de los turnos del semáforo, así que los logins y las
+        altas individuales siguen atendiéndose mientras se procesa.
+
+        Args:
+            contrasenas (list): Contraseñas en texto plano.
+            por_tarea (int): Contraseñas por tarea enviada al pool.
+
+        Returns:
+            list: Hashes en el mismo orden.
+        """
+        turnos = asyncio.Semaphore(max(1, self.max_concurrencia // 2))
+
+        async def tarea(bloque):
+            async with turnos:
+                return await self._ejecutar(_hash_varias, bloque)
+
+        resultados = await asyncio.gather(
+            *(
+                tarea(contrasenas[inicio : inicio + por_tarea])
+                for inicio in range(0, len(contrasenas), por_tarea)
+            )
+        )
+        return [hash_ for bloque in resultados for hash_ in bloque]
+
+    async def verificar(self, contrasena: str, contrasena_hash: str) -> bool:
+        """Versión asíncrona de `verificar_contrasena`."""
+        return await self._ejecutar(verificar_contrasena, contrasena, contrasena_hash)
+
+    def iniciar(self):
+        """Crea los procesos del pool por adelantado."""
+        executor = self._obtener_executor()
+        for _ in range(self.procesos):
+            executor.submit(time.time)
+
+    def cerrar(self):
+        """Detiene los procesos del pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def estadisticas(self) -> dict:
+        """Operaciones realizadas, en curso y tiempos de espera en cola."""
+        operaciones = self._operaciones
+        return {
+            "procesos": self.procesos,
+            "max_concurrencia": self.max_concurrencia,
+            "en_curso": self._en_curso,
+            "operaciones": operaciones,
+            "espera_promedio_ms": (
+                round(self._espera_total_ms / operaciones, 3) if operaciones else 0.0
+            ),
+            "espera_max_ms": round(self._espera_max_ms, 3),
+            "ejecucion_promedio_ms": (
+                round(self._ejecucion_total_ms / operaciones, 3) if operaciones else 0.0
+            ),
+        }
+
+
+_PROCESOS = int(os.getenv("BCRYPT_PROCESOS", "0")) or os.cpu_count() or 1
+
+pool_hashing = PoolHashing(
+    procesos=_PROCESOS,
+    max_concurrencia=int(os.getenv("BCRYPT_MAX_CONCURRENCIA", "0")) or 2 * _PROCESOS,
+)
@@ -1,14 +1,22 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from Entities.tarjeta import Tarjeta
-from sqlalchemy import select, update
+from Entities.transaccion import Transaccion
+from sqlalchemy import insert, literal, select, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from Entities.usuario import Usuario
 from datetime import datetime
+import os
 import uuid
 from fastapi import HTTPException
-import random
+from Crud.numeracion import asignador_tarjetas, numero_aceptable
+from Crud.reporte_crud import acumular, acumular_en_resumen, particion_aleatoria
+from Entities.resumen import ResumenTransaccionDiario
 from Crud.transacciones_crud import TransaccionCRUD
 
+TARIFA_PASAJE = float(os.getenv("TARIFA_PASAJE", "3200"))
+
 
 class TarjetaCRUD:
     """
@@ -27,6 +35,17 @@ class TarjetaCRUD:
         """
         self.db = db
 
+    def obtener_por_id(self, id_tarjeta: uuid.UUID):
+        """Obtiene una tarjeta por su llave primaria.
+
+        Args:
+            id_tarjeta (UUID): ID de la tarjeta.
+
+        Returns:
+            Tarjeta | None: La tarjeta encontrada o None si no existe.
+        """
+        return self.db.get(Tarjeta, id_tarjeta)
+
     def registrar_tarjeta(
         self,
         id_usuario: uuid.UUID,
@@ -46,38 +65,96 @@ class TarjetaCRUD:
         Returns:
             Tarjeta: La tarjeta recién creada.
         """
-        numero_tarjeta = self.generar_numero_tarjeta()
-        tarjeta = Tarjeta(
-            id_usuario=id_usuario,
-            tipo_tarjeta=tipo_tarjeta,
-            estado=estado,
-            numero_tarjeta=numero_tarjeta,
-            fecha_ultima_recarga=None,
-            saldo=saldo,
+        while True:
+            numero_tarjeta = self.generar_numero_tarjeta()
+            tarjeta = Tarjeta(
+                id_usuario=id_usuario,
+                tipo_tarjeta=tipo_tarjeta,
+                estado=estado,
+                numero_tarjeta=numero_tarjeta,
+                fecha_ultima_recarga=None,
+                saldo=saldo,
+            )
+            self.db.add(tarjeta)
+            try:
+                self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+                # Solo se reintenta si el número choca con una tarjeta antigua
+                # de numeración aleatoria; cualquier otro conflicto se propaga.
+                if self.db.execute(
+                    select(Tarjeta.id_tarjeta).where(
+                        Tarjeta.numero_tarjeta == numero_tarjeta
+                    )
+                ).first():
+                    continue
+                raise
+            self.db.refresh(tarjeta)
+            return tarjeta
+
+    def crear_tarjeta_por_documento(
+        self, documento: str, tipo_tarjeta: str, estado: str, saldo
+    ) -> Tarjeta:
+        """Crea la tarjeta de un usuario identificado por su documento.
+
+        Args:
+            documento (str): Documento del usuario.
+            tipo_tarjeta (str): Tipo de la tarjeta.
+            estado (str): Estado inicial de la tarjeta.
+            saldo (float): Saldo inicial de la tarjeta.
+
+        Raises:
+            ValueError: Si el usuario no existe o ya tiene una tarjeta.
+
+        Returns:
+            Tarjeta: La tarjeta recién creada.
+        """
+        id_usuario = self.db.execute(
+            select(Usuario.id_usuario).where(Usuario.documento == documento)
+        ).scalar_one_or_none()
+
+        if not id_usuario:
+            raise ValueError("Usuario no encontrado con el documento proporcionado.")
+
+        tarjeta_existente = (
+            self.db.query(Tarjeta.id_tarjeta).filter_by(id_usuario=id_usuario).first()
         )
-        self.db.add(tarjeta)
-        self.db.commit()
-        self.db.refresh(tarjeta)
-        return tarjeta
+        if tarjeta_existente:
+            raise ValueError(
+                "El usuario ya tiene una tarjeta registrada. No se puede crear otra."
+            )
+
+        return self.registrar_tarjeta(id_usuario, tipo_tarjeta, estado, saldo)
 
     def generar_numero_tarjeta(self) -> str:
-        """Genera un número de tarjeta único.
+        """Genera un número de tarjeta único con dígito de control Luhn.
+
+        El número sale de un bloque reservado en memoria por el asignador,
+        sin consultar la tabla de tarjetas.
 
         Returns:
             str: Número de tarjeta generado.
         """
+        return asignador_tarjetas.siguiente()
 
-        while True:
-            numero = "".join(str(random.randint(0, 9)) for _ in range(16))
-            existe = (
-                self.db.query(Tarjeta).filter(Tarjeta.numero_tarjeta == numero).first()
-            )
-            if not existe:
-                return numero
+    def generar_numeros_tarjeta(self, cantidad: int) -> List[str]:
+        """Genera varios números de tarjeta únicos para una emisión masiva.
+
+        Args:
+            cantidad (int): Números a generar.
 
-    def recargar_tarjeta(self, documento: str, monto: float) -> Tarjeta:
+        Returns:
+            List[str]: Números de tarjeta generados.
+        """
+        return asignador_tarjetas.reservar(cantidad)
+
+    def recargar_tarjeta(self, documento: str, monto: float) -> dict:
         """Recarga el saldo de una tarjeta asociada a un usuario por su documento.
 
+        La recarga es un UPDATE condicional `saldo = saldo + monto` y queda
+        registrada como Transaccion de tipo "Recarga" en la misma transacción,
+        por lo que dos recargas simultáneas nunca se pisan.
+
         Args:
             documento (str): Documento del usuario.
             monto (float): Monto a recargar.
@@ -86,27 +163,191 @@ class TarjetaCRUD:
             ValueError: Si no se encuentra la tarjeta para el usuario con el documento proporcionado.
 
         Returns:
-            Tarjeta: La tarjeta actualizada con el nuevo saldo.
+            dict: Número de tarjeta, nuevo saldo y datos de la transacción.
         """
-        tarjeta = (
-            self.db.query(Tarjeta)
-            .join(Usuario, Usuario.id_usuario == Tarjeta.id_usuario)
-            .filter(Usuario.documento == documento)
-            .first()
+        id_usuario = (
+            select(Usuario.id_usuario)
+            .where(Usuario.documento == documento)
+            .scalar_subquery()
         )
-        if tarjeta:
-            tarjeta.saldo += monto
-            tarjeta.fecha_ultima_recarga = datetime.now()
-            self.db.commit()
-            self.db.refresh(tarjeta)
+        ahora = datetime.now()
+        movimiento = self._movimiento(
+            Tarjeta.id_usuario == id_usuario,
+            monto,
+            "Recarga",
+            monto,
+            ahora,
+            fecha_ultima_recarga=ahora,
+        )
+        if movimiento is None:
+            raise ValueError(
+                "Tarjeta no encontrada para el usuario con el documento proporcionado."
+            )
+        return movimiento
 
-            return tarjeta
+    def validar_tarjeta(
+        self, numero_tarjeta: str, tarifa: float = TARIFA_PASAJE
+    ) -> Optional[dict]:
+        """Cobra un pasaje a la tarjeta ("tap" en el validador).
 
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail="Tarjeta no encontrada para el usuario con el documento proporcionado.",
-            )
+        Un único UPDATE condicional comprueba que la tarjeta esté activa y
+        tenga saldo, descuenta la tarifa e inserta la Transaccion de tipo
+        "Pago". Los taps simultáneos sobre la misma tarjeta se serializan en
+        la fila, así que el saldo nunca queda negativo ni se pierden cobros.
+
+        Args:
+            numero_tarjeta (str): Número de la tarjeta.
+            tarifa (float): Valor del pasaje.
+
+        Raises:
+            ValueError: Si el número es inválido, o si la tarjeta no está activa
+                o no tiene saldo suficiente.
+
+        Returns:
+            dict | None: Número de tarjeta, saldo restante y datos de la
+                transacción, o None si la tarjeta no existe.
+        """
+        if not numero_aceptable(numero_tarjeta):
+            raise ValueError("Número de tarjeta inválido")
+
+        movimiento = self._movimiento(
+            (Tarjeta.numero_tarjeta == numero_tarjeta)
+            & (Tarjeta.estado == "Activa")
+            & (Tarjeta.saldo >= tarifa),
+            -tarifa,
+            "Pago",
+            tarifa,
+            datetime.now(),
+        )
+        if movimiento is not None:
+            return movimiento
+
+        tarjeta = self.db.execute(
+            select(Tarjeta.estado).where(Tarjeta.numero_tarjeta == numero_tarjeta)
+        ).first()
+        if tarjeta is None:
+            return None
+        if tarjeta.estado != "Activa":
+            raise ValueError("La tarjeta no está activa")
+        raise ValueError("Saldo insuficiente")
+
+    def _movimiento(
+        self,
+        condicion,
+        variacion: float,
+        tipo_transaccion: str,
+        monto: float,
+        fecha: datetime,
+        **valores,
+    ) -> Optional[dict]:
+        """Aplica `saldo += variacion` a la tarjeta que cumpla `condicion` y
+        registra la Transaccion y su suma en el resumen diario en la misma
+        transacción.
+
+        En PostgreSQL las tres escrituras van en una sola sentencia
+        (`WITH ... UPDATE ... RETURNING` + `INSERT ... SELECT` + upsert del
+        resumen); en otros motores se ejecutan seguidas antes del commit.
+
+        Returns:
+            dict | None: Datos del movimiento, o None si ninguna tarjeta
+                cumplió la condición.
+        """
+        id_transaccion = uuid.uuid4()
+        actualizacion = (
+            update(Tarjeta)
+            .where(condicion)
+            .values(saldo=Tarjeta.saldo + variacion, **valores)
+            .returning(Tarjeta.numero_tarjeta, Tarjeta.saldo, Tarjeta.tipo_tarjeta)
+        )
+        try:
+            if self.db.get_bind().dialect.name == "postgresql":
+                debito = actualizacion.cte("debito")
+                registro = (
+                    insert(Transaccion)
+                    .from_select(
+                        [
+                            "id_transaccion",
+                            "numero_tarjeta",
+                            "tipo_transaccion",
+                            "monto",
+                            "fecha_transaccion",
+                        ],
+                        select(
+                            literal(id_transaccion, Transaccion.id_transaccion.type),
+                            debito.c.numero_tarjeta,
+                            literal(
+                                tipo_transaccion, Transaccion.tipo_transaccion.type
+                            ),
+                            literal(monto, Transaccion.monto.type),
+                            literal(fecha, Transaccion.fecha_transaccion.type),
+                        ),
+                    )
+                    .returning(Transaccion.id_transaccion)
+                    .cte("registro")
+                )
+                resumen = ResumenTransaccionDiario
+                acumulado = (
+                    acumular(
+                        pg_insert(resumen).from_select(
+                            [
+                                "dia",
+                                "tipo_transaccion",
+                                "tipo_tarjeta",
+                                "particion",
+                                "cantidad",
+                                "total",
+                            ],
+                            select(
+                                literal(fecha.date(), resumen.dia.type),
+                                literal(
+                                    tipo_transaccion, resumen.tipo_transaccion.type
+                                ),
+                                debito.c.tipo_tarjeta,
+                                literal(particion_aleatoria(), resumen.particion.type),
+                                literal(1, resumen.cantidad.type),
+                                literal(monto, resumen.total.type),
+                            ),
+                        )
+                    )
+                    .returning(resumen.dia)
+                    .cte("acumulado")
+                )
+                fila = self.db.execute(
+                    select(debito.c.numero_tarjeta, debito.c.saldo)
+                    .select_from(debito)
+                    .join(registro, true())
+                    .join(acumulado, true())
+                ).first()
+            else:
+                fila = self.db.execute(actualizacion).first()
+                if fila is not None:
+                    self.db.execute(
+                        insert(Transaccion).values(
+                            id_transaccion=id_transaccion,
+                            numero_tarjeta=fila.numero_tarjeta,
+                            tipo_transaccion=tipo_transaccion,
+                            monto=monto,
+                            fecha_transaccion=fecha,
+                        )
+                    )
+                    acumular_en_resumen(
+                        self.db, fecha, tipo_transaccion, fila.tipo_tarjeta, monto
+                    )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if fila is None:
+            return None
+        return {
+            "numero_tarjeta": fila.numero_tarjeta,
+            "saldo": fila.saldo,
+            "id_transaccion": id_transaccion,
+            "tipo_transaccion": tipo_transaccion,
+            "monto": monto,
+            "fecha_transaccion": fecha,
+        }
 
     def obtener_saldo(self, documento: str) -> float:
         """Obtiene el saldo de una tarjeta asociada a un usuario por su documento.
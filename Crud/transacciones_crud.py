@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from Entities.transaccion import Transaccion
+from Crud.consultas import paginar_keyset
+from Crud.reporte_crud import acumular_en_resumen
 
 from sqlalchemy import select, update
 from Entities.usuario import Usuario
@@ -19,19 +21,41 @@ class TransaccionCRUD:
     def __init__(self, db: Session):
         self.db = db
 
+    def obtener_por_id(self, id_transaccion: uuid.UUID):
+        """Obtiene una transacción por su llave primaria.
+
+        Args:
+            id_transaccion (UUID): ID de la transacción.
+
+        Returns:
+            Transaccion | None: La transacción encontrada o None si no existe.
+        """
+        return self.db.get(Transaccion, id_transaccion)
+
     def registrar_transaccion(
         self, numero_tarjeta: str, tipo_transaccion: str, monto: float
     ) -> Transaccion:
         """Registra una nueva transacción en la base de datos.
 
+        El resumen diario se actualiza en la misma transacción.
+
         Args:
             numero_tarjeta (str): Número de la tarjeta asociada a la transacción.
             tipo_transaccion (str): Tipo de transacción (e.g., 'recarga', 'pago').
             monto (float): Monto de la transacción.
 
+        Raises:
+            ValueError: Si la tarjeta no existe.
+
         Returns:
             Transaccion: La transacción registrada.
         """
+        tipo_tarjeta = self.db.execute(
+            select(Tarjeta.tipo_tarjeta).where(Tarjeta.numero_tarjeta == numero_tarjeta)
+        ).scalar_one_or_none()
+        if tipo_tarjeta is None:
+            raise ValueError("Tarjeta no encontrada")
+
         transaccion = Transaccion(
             id_transaccion=uuid.uuid4(),
             numero_tarjeta=numero_tarjeta,
@@ -40,6 +64,13 @@ class TransaccionCRUD:
             fecha_transaccion=datetime.now(),
         )
         self.db.add(transaccion)
+        acumular_en_resumen(
+            self.db,
+            transaccion.fecha_transaccion,
+            tipo_transaccion,
+            tipo_tarjeta,
+            monto,
+        )
         self.db.commit()
         self.db.refresh(transaccion)
         return transaccion
@@ -61,3 +92,59 @@ class TransaccionCRUD:
             .all()
         )
         return transacciones
+
+    def obtener_pagina(
+        self,
+        documento: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        tipo: Optional[str] = None,
+    ) -> Tuple[List[Transaccion], Optional[str]]:
+        """Obtiene una página del historial de la tarjeta de un usuario.
+
+        Primero resuelve el número de tarjeta del documento y luego consulta
+        solo `transacciones`, de la más reciente a la más antigua, con
+        paginación por cursor sobre (fecha_transaccion, id_transaccion). La
+        consulta recorre el índice ix_transacciones_tarjeta_fecha_id.
+
+        Args:
+            documento (str): Documento del usuario.
+            limit (int): Número máximo de transacciones de la página.
+            cursor (str, optional): Cursor devuelto por la página anterior.
+            desde (datetime, optional): Fecha mínima (inclusive).
+            hasta (datetime, optional): Fecha máxima (inclusive).
+            tipo (str, optional): Filtrar por tipo de transacción (Recarga, Pago).
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+
+        Returns:
+            tuple: (transacciones de la página, cursor de la página siguiente
+                o None), o None si el usuario no tiene tarjeta.
+        """
+        numero_tarjeta = self.db.execute(
+            select(Tarjeta.numero_tarjeta)
+            .join(Usuario, Usuario.id_usuario == Tarjeta.id_usuario)
+            .where(Usuario.documento == documento)
+        ).scalar_one_or_none()
+        if numero_tarjeta is None:
+            return None
+
+        query = self.db.query(Transaccion).filter(
+            Transaccion.numero_tarjeta == numero_tarjeta
+        )
+        if desde:
+            query = query.filter(Transaccion.fecha_transaccion >= desde)
+        if hasta:
+            query = query.filter(Transaccion.fecha_transaccion <= hasta)
+        if tipo:
+            query = query.filter(Transaccion.tipo_transaccion == tipo)
+        return paginar_keyset(
+            query,
+            (Transaccion.fecha_transaccion, Transaccion.id_transaccion),
+            (datetime.fromisoformat, uuid.UUID),
+            cursor=cursor,
+            limit=limit,
+        )
@@ -1,6 +1,16 @@
-from Entities.transporte import Transporte, TransporteCreate, TransporteUpdate
+from Entities.transporte import (
+    Transporte,
+    TransporteCreate,
+    TransporteOut,
+    TransporteUpdate,
+)
+from typing import List
 from uuid import UUID
 from sqlalchemy.orm import Session
+from Crud.cache import cache_transportes
+from Crud.consultas import listar, proyectar
+from Crud.masivo import insertar_lote
+from Entities.linea import Linea
 
 
 class TransporteCRUD:
@@ -10,9 +20,58 @@ class TransporteCRUD:
         db: Session - Sesión de la base de datos
     """
 
+    CAMPOS_ORDEN = ("tipo", "placa", "capacidad", "estado")
+
     def __init__(self, db: Session):
         self.db = db
 
+    def obtener_por_id(self, id_transporte: UUID):
+        """Obtiene un transporte por su llave primaria.
+
+        Args:
+            id_transporte (UUID): ID del transporte.
+
+        Returns:
+            Transporte | None: El transporte encontrado o None si no existe.
+        """
+        return self.db.get(Transporte, id_transporte)
+
+    def _proyeccion(self):
+        """Consulta de las columnas de `TransporteOut`."""
+        return proyectar(self.db, Transporte, TransporteOut)
+
+    def consultar_por_id(self, id_transporte: UUID):
+        """Consulta un transporte por su ID usando la caché de entidades.
+
+        Args:
+            id_transporte (UUID): ID del transporte.
+
+        Returns:
+            TransporteOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_transportes.obtener(
+            "id_transporte",
+            id_transporte,
+            lambda: self._proyeccion()
+            .filter(Transporte.id_transporte == id_transporte)
+            .first(),
+        )
+
+    def consultar_por_placa(self, placa: str):
+        """Consulta un transporte por su placa usando la caché de entidades.
+
+        Args:
+            placa (str): Placa del vehículo.
+
+        Returns:
+            TransporteOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_transportes.obtener(
+            "placa",
+            placa,
+            lambda: self._proyeccion().filter(Transporte.placa == placa).first(),
+        )
+
     def registrar_transporte(self, transporte: TransporteCreate):
         """Registra un nuevo transporte en la base de datos
 
@@ -28,6 +87,29 @@ class TransporteCRUD:
         self.db.refresh(nuevo)
         return nuevo
 
+    def registrar_transportes_masivo(self, transportes: List[TransporteCreate]) -> dict:
+        """Registra un lote de transportes en una sola transacción.
+
+        Las filas con placa repetida (en el lote o en la base de datos) o con
+        una línea inexistente se reportan y no se insertan.
+
+        Args:
+            transportes (List[TransporteCreate]): Lote de transportes.
+
+        Raises:
+            ValueError: Si el lote está vacío o excede el máximo permitido.
+
+        Returns:
+            dict: Resultado con las filas creadas y los errores por fila.
+        """
+        return insertar_lote(
+            self.db,
+            Transporte,
+            [transporte.dict() for transporte in transportes],
+            ("placa",),
+            {"id_linea": Linea.id_linea},
+        )
+
     def modificar_transporte(
         self, id_transporte: UUID, transporte_update: TransporteUpdate
     ):
@@ -43,12 +125,13 @@ class TransporteCRUD:
         Returns:
             Transporte: El transporte modificado
         """
-        transporte = self.db.query(Transporte).get(id_transporte)
+        transporte = self.obtener_por_id(id_transporte)
         if not transporte:
             raise ValueError("Transporte no encontrado")
         for key, value in transporte_update.dict(exclude_unset=True).items():
             setattr(transporte, key, value)
         self.db.commit()
+        cache_transportes.invalidar(id_transporte)
         self.db.refresh(transporte)
         return transporte
 
@@ -60,17 +143,38 @@ class TransporteCRUD:
         Returns:
             bool: True si se eliminó, False si no se encontró
         """
-        transporte = self.db.query(Transporte).get(id_transporte)
+        transporte = self.obtener_por_id(id_transporte)
         if transporte:
             self.db.delete(transporte)
             self.db.commit()
+            cache_transportes.invalidar(id_transporte)
             return True
         return False
 
-    def listar_transportes(self):
-        """Lista todos los transportes en la base de datos
+    def listar_transportes(
+        self,
+        skip: int = 0,
+        limit: int | None = None,
+        estado: str | None = None,
+        orden: str | None = None,
+    ):
+        """Lista los transportes filtrando y paginando en la base de datos
+
+        Args:
+            skip (int): Número de registros a saltar
+            limit (int, optional): Número máximo de registros a retornar
+            estado (str, optional): Filtrar por estado
+            orden (str, optional): Campo de ordenamiento ("campo" o "-campo")
 
         Returns:
-            List[Transporte]: Lista de transportes
+            List[Row]: Filas con las columnas de `TransporteOut`
         """
-        return self.db.query(Transporte).all()
+        return listar(
+            self._proyeccion(),
+            Transporte,
+            skip=skip,
+            limit=limit,
+            orden=orden,
+            permitidos=self.CAMPOS_ORDEN,
+            estado=estado,
+        )
@@ -1,6 +1,31 @@
+from datetime import datetime, time
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import Date, delete, func, select
 from sqlalchemy.orm import Session
-from Entities import Usuario, UsuarioCreate, UsuarioUpdate
-import bcrypt
+from Entities import Rol, Usuario, UsuarioCreate, UsuarioUpdate
+from Entities.asignacionT import AsignacionT
+from Entities.auditoria import Auditoria
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion
+from Entities.usuario import UsuarioOut
+from Crud.cache import cache_usuarios
+from Crud.consultas import listar, proyectar
+from Crud.masivo import filtrar_lote, insertar_lote, por_bloques, validar_tamano_lote
+from Crud.reporte_crud import acumular_en_resumen
+from Crud.seguridad import hash_contrasena, verificar_contrasena
+
+
+def _fila_usuario(usuario_data: UsuarioCreate) -> dict:
+    """Valores de un usuario del lote, normalizados como en `crear_usuario`."""
+    return {
+        "id_rol": usuario_data.id_rol or 2,
+        "nombre": usuario_data.nombre.strip().title(),
+        "apellido": usuario_data.apellido.strip().title(),
+        "documento": usuario_data.documento.strip(),
+        "email": usuario_data.email.lower().strip(),
+        "contrasena": usuario_data.contrasena,
+    }
 
 
 class UsuarioCRUD:
@@ -10,28 +35,137 @@ class UsuarioCRUD:
         db (Session): Sesión de la base de datos
     """
 
+    CAMPOS_ORDEN = ("nombre", "apellido", "documento", "email", "fecha_registro")
+
     def __init__(self, db: Session):
         self.db = db
 
-    def crear_usuario(self, usuario_data: UsuarioCreate):
+    def obtener_por_id(self, usuario_id: UUID):
+        """Obtiene un usuario por su llave primaria.
+
+        Args:
+            usuario_id (UUID): ID del usuario.
+
+        Returns:
+            Usuario | None: El usuario encontrado o None si no existe.
+        """
+        return self.db.get(Usuario, usuario_id)
+
+    def _proyeccion(self):
+        """Consulta de las columnas de `UsuarioOut` (sin la contraseña)."""
+        return proyectar(self.db, Usuario, UsuarioOut)
+
+    def consultar_por_id(self, id_usuario: UUID):
+        """Consulta un usuario por su ID usando la caché de entidades.
+
+        Args:
+            id_usuario (UUID): ID del usuario.
+
+        Returns:
+            UsuarioOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_usuarios.obtener(
+            "id_usuario",
+            id_usuario,
+            lambda: self._proyeccion().filter(Usuario.id_usuario == id_usuario).first(),
+        )
+
+    def consultar_por_documento(self, documento: str):
+        """Consulta un usuario por su documento usando la caché de entidades.
+
+        Args:
+            documento (str): Documento del usuario.
+
+        Returns:
+            UsuarioOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_usuarios.obtener(
+            "documento",
+            documento,
+            lambda: self._proyeccion().filter(Usuario.documento == documento).first(),
+        )
+
+    def consultar_por_email(self, email: str):
+        """Consulta un usuario por su email usando la caché de entidades.
+
+        Args:
+            email (str): Email del usuario.
+
+        Returns:
+            UsuarioOut | None: Snapshot de solo lectura o None si no existe.
+        """
+        return cache_usuarios.obtener(
+            "email",
+            email.lower().strip(),
+            lambda: self._proyeccion()
+            .filter(Usuario.email == email.lower().strip())
+            .first(),
+        )
+
+    def crear_usuario(
+        self, usuario_data: UsuarioCreate, contrasena_hash: str | None = None
+    ):
         """Crea un usuario nuevo en la base de datos
 
         Validaciones:
         - El email no debe estar registrado
         - El documento no debe estar registrado
         - La contraseña debe tener al menos 6 caracteres
+        - El rol debe existir
 
         Args:
             usuario_data (UsuarioCreate): Datos del usuario a crear
+            contrasena_hash (str, optional): Hash bcrypt ya calculado (por ejemplo
+                en el pool de procesos); si es None se calcula aquí
 
         Raises:
-            ValueError: Si el email o documento ya están registrados, o si la contraseña es muy
-                        corta
+            ValueError: Si el email o documento ya están registrados, si la contraseña es muy
+                        corta o si el rol no existe
 
         Returns:
             Usuario: El usuario creado
         """
+        self._validar_nuevo_usuario(usuario_data)
+
+        hashed_password = contrasena_hash or hash_contrasena(usuario_data.contrasena)
+
+        nuevo_usuario = Usuario(
+            id_rol=usuario_data.id_rol or 2,
+            nombre=usuario_data.nombre.strip().title(),
+            apellido=usuario_data.apellido.strip().title(),
+            documento=usuario_data.documento.strip(),
+            email=usuario_data.email.lower().strip(),
+            contrasena=hashed_password,
+        )
 
+        self.db.add(nuevo_usuario)
+        self.db.commit()
+        self.db.refresh(nuevo_usuario)
+
+        return nuevo_usuario
+
+    def validar_usuario(self, usuario_data: UsuarioCreate):
+        """Verifica que un usuario se pueda crear, antes de calcular su hash.
+
+        Permite rechazar un usuario repetido o con un rol inexistente sin
+        ocupar el pool de bcrypt; `crear_usuario` repite la verificación al
+        insertar.
+
+        Args:
+            usuario_data (UsuarioCreate): Datos del usuario a crear
+
+        Raises:
+            ValueError: Si el email o documento ya están registrados, si la
+                        contraseña es muy corta o si el rol no existe
+        """
+        try:
+            self._validar_nuevo_usuario(usuario_data)
+        finally:
+            # Cierra la transacción de lectura para no retener la conexión
+            # mientras se calcula el hash.
+            self.db.rollback()
+
+    def _validar_nuevo_usuario(self, usuario_data: UsuarioCreate):
         if self.db.query(Usuario).filter(Usuario.email == usuario_data.email).first():
             raise ValueError("El email ya está registrado")
 
@@ -45,24 +179,71 @@ class UsuarioCRUD:
         if len(usuario_data.contrasena) < 6:
             raise ValueError("La contraseña debe tener al menos 6 caracteres")
 
-        hashed_password = bcrypt.hashpw(
-            usuario_data.contrasena.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        if self.db.get(Rol, usuario_data.id_rol or 2) is None:
+            raise ValueError("El rol no existe")
 
-        nuevo_usuario = Usuario(
-            id_rol=usuario_data.id_rol or 2,
-            nombre=usuario_data.nombre.strip().title(),
-            apellido=usuario_data.apellido.strip().title(),
-            documento=usuario_data.documento.strip(),
-            email=usuario_data.email.lower().strip(),
-            contrasena=hashed_password,
+    def validar_usuarios_masivo(self, usuarios: List[UsuarioCreate]) -> List[int]:
+        """Obtiene las posiciones del lote que no chocan con usuarios existentes.
+
+        Permite calcular los hashes bcrypt solo de esas filas antes de llamar
+        a `crear_usuarios_masivo`, que repite la verificación al insertar.
+
+        Args:
+            usuarios (List[UsuarioCreate]): Lote de usuarios.
+
+        Raises:
+            ValueError: Si el lote está vacío o excede el máximo permitido.
+
+        Returns:
+            List[int]: Posiciones válidas del lote.
+        """
+        validar_tamano_lote(len(usuarios))
+        validas = filtrar_lote(
+            self.db,
+            Usuario,
+            [_fila_usuario(usuario) for usuario in usuarios],
+            ("documento", "email"),
+            {"id_rol": Rol.id_rol},
         )
+        # Cierra la transacción de lectura para no retener la conexión
+        # mientras se calculan los hashes.
+        self.db.rollback()
+        return validas
 
-        self.db.add(nuevo_usuario)
-        self.db.commit()
-        self.db.refresh(nuevo_usuario)
+    def crear_usuarios_masivo(
+        self,
+        usuarios: List[UsuarioCreate],
+        contrasenas_hash: Optional[Dict[int, str]] = None,
+    ) -> dict:
+        """Crea un lote de usuarios en una sola transacción.
 
-        return nuevo_usuario
+        Las filas con documento o email repetidos (en el lote o en la base de
+        datos) o con un rol inexistente se reportan y no se insertan.
+
+        Args:
+            usuarios (List[UsuarioCreate]): Lote de usuarios.
+            contrasenas_hash (Dict[int, str], optional): Hash bcrypt ya
+                calculado por posición del lote; las filas sin hash lo
+                calculan aquí.
+
+        Raises:
+            ValueError: Si el lote está vacío o excede el máximo permitido.
+
+        Returns:
+            dict: Resultado con las filas creadas y los errores por fila.
+        """
+        hashes = contrasenas_hash or {}
+        return insertar_lote(
+            self.db,
+            Usuario,
+            [_fila_usuario(usuario) for usuario in usuarios],
+            ("documento", "email"),
+            {"id_rol": Rol.id_rol},
+            preparar=lambda indice, fila: {
+                **fila,
+                "contrasena": hashes.get(indice) or hash_contrasena(fila["contrasena"]),
+            },
+        )
 
     def obtener_por_email(self, email: str):
         """
@@ -100,9 +281,7 @@ class UsuarioCRUD:
         if not usuario:
             raise ValueError("Usuario no encontrado")
 
-        if not bcrypt.checkpw(
-            contrasena.encode("utf-8"), usuario.contrasena.encode("utf-8")
-        ):
+        if not verificar_contrasena(contrasena, usuario.contrasena):
             raise ValueError("Contraseña incorrecta")
 
         return usuario
@@ -122,9 +301,7 @@ class UsuarioCRUD:
             Usuario: El usuario actualizado
 
         """
-        usuario = (
-            self.db.query(Usuario).filter(Usuario.id_usuario == usuario_id).first()
-        )
+        usuario = self.obtener_por_id(usuario_id)
 
         if not usuario:
             raise ValueError("Usuario no encontrado")
@@ -151,60 +328,144 @@ class UsuarioCRUD:
             usuario.id_rol = usuario_update.id_rol
 
         self.db.commit()
+        cache_usuarios.invalidar(usuario_id)
         self.db.refresh(usuario)
 
         return usuario
 
-    def eliminar_usuario(self, usuario_id: int):
+    def eliminar_usuario(self, usuario_id: UUID):
         """
-        Elimina un usuario por su ID, eliminando primero sus asignaciones, transacciones y tarjetas asociadas.
+        Elimina un usuario por su ID junto con sus asignaciones, registros de
+        auditoría, tarjetas y transacciones, en una sola transacción.
 
         Args:
-            usuario_id (int): ID del usuario a eliminar
+            usuario_id (UUID): ID del usuario a eliminar
 
         Raises:
             ValueError: Si el usuario no existe
         Returns:
             bool: True si el usuario fue eliminado exitosamente
         """
-        usuario = (
-            self.db.query(Usuario).filter(Usuario.id_usuario == usuario_id).first()
-        )
-
-        if not usuario:
+        if not self.eliminar_usuarios([usuario_id])["eliminados"]:
             raise ValueError("Usuario no encontrado")
+        return True
 
-        from Entities.auditoria import Auditoria
-
-        self.db.query(Auditoria).filter(Auditoria.id_usuario == usuario_id).delete()
-        self.db.commit()
+    def eliminar_usuarios(self, usuario_ids: List[UUID]) -> dict:
+        """
+        Elimina un lote de usuarios y sus datos asociados en una sola transacción.
 
-        from Entities.asignacionT import AsignacionT
+        En lugar de cargar cada usuario y sus tarjetas, ejecuta un DELETE por
+        tabla dependiente (transacciones de sus tarjetas, tarjetas,
+        asignaciones, auditoría y por último usuarios) con `WHERE ... IN` por
+        bloques de IDs, y hace un único commit. Los totales de las
+        transacciones borradas se restan del resumen diario en la misma
+        transacción.
 
-        self.db.query(AsignacionT).filter(AsignacionT.id_usuario == usuario_id).delete()
-        self.db.commit()
+        Args:
+            usuario_ids (List[UUID]): IDs de los usuarios a eliminar; los
+                repetidos se cuentan una vez.
 
-        from Entities.tarjeta import Tarjeta
-        from Entities.transaccion import Transaccion
+        Raises:
+            ValueError: Si el lote está vacío o excede el máximo permitido.
 
-        tarjetas = self.db.query(Tarjeta).filter(Tarjeta.id_usuario == usuario_id).all()
-        for tarjeta in tarjetas:
-            self.db.query(Transaccion).filter(
-                Transaccion.numero_tarjeta == tarjeta.numero_tarjeta
-            ).delete()
-            self.db.delete(tarjeta)
+        Returns:
+            dict: IDs recibidos, usuarios eliminados y los IDs no encontrados.
+        """
+        ids = list(dict.fromkeys(usuario_ids))
+        validar_tamano_lote(len(ids))
+
+        eliminados = set()
+        for bloque in por_bloques(ids):
+            existentes = list(
+                self.db.scalars(
+                    select(Usuario.id_usuario).where(Usuario.id_usuario.in_(bloque))
+                )
+            )
+            if not existentes:
+                continue
+            tarjetas = select(Tarjeta.numero_tarjeta).where(
+                Tarjeta.id_usuario.in_(existentes)
+            )
+            self._descontar_del_resumen(existentes)
+            for sentencia in (
+                delete(Transaccion).where(Transaccion.numero_tarjeta.in_(tarjetas)),
+                delete(Tarjeta).where(Tarjeta.id_usuario.in_(existentes)),
+                delete(AsignacionT).where(AsignacionT.id_usuario.in_(existentes)),
+                delete(Auditoria).where(Auditoria.id_usuario.in_(existentes)),
+                delete(Usuario).where(Usuario.id_usuario.in_(existentes)),
+            ):
+                self.db.execute(
+                    sentencia, execution_options={"synchronize_session": False}
+                )
+            eliminados.update(existentes)
         self.db.commit()
 
-        self.db.delete(usuario)
-        self.db.commit()
-        return True
+        for usuario_id in eliminados:
+            cache_usuarios.invalidar(usuario_id)
+        return {
+            "recibidos": len(ids),
+            "eliminados": len(eliminados),
+            "no_encontrados": [
+                usuario_id for usuario_id in ids if usuario_id not in eliminados
+            ],
+        }
 
-    def listar_usuarios(self):
+    def _descontar_del_resumen(self, usuario_ids: List[UUID]):
+        """Resta del resumen diario las transacciones de las tarjetas de los
+        usuarios, sin hacer commit, para que siga cuadrando con la tabla de
+        transacciones después de borrarlas."""
+        dia = func.date(Transaccion.fecha_transaccion, type_=Date)
+        totales = self.db.execute(
+            select(
+                dia,
+                Transaccion.tipo_transaccion,
+                Tarjeta.tipo_tarjeta,
+                func.count(),
+                func.sum(Transaccion.monto),
+            )
+            .join(Tarjeta, Tarjeta.numero_tarjeta == Transaccion.numero_tarjeta)
+            .where(Tarjeta.id_usuario.in_(usuario_ids))
+            .group_by(dia, Transaccion.tipo_transaccion, Tarjeta.tipo_tarjeta)
+        )
+        for fecha, tipo_transaccion, tipo_tarjeta, cantidad, total in totales:
+            acumular_en_resumen(
+                self.db,
+                datetime.combine(fecha, time.min),
+                tipo_transaccion,
+                tipo_tarjeta,
+                -total,
+                cantidad=-cantidad,
+            )
+
+    def listar_usuarios(
+        self,
+        skip: int = 0,
+        limit: int | None = None,
+        id_rol: int | None = None,
+        orden: str | None = None,
+    ):
         """
-        Obtiene todos los usuarios
+        Obtiene los usuarios filtrando y paginando en la base de datos
+
+        Args:
+            skip (int): Número de registros a saltar
+            limit (int, optional): Número máximo de registros a retornar
+            id_rol (int, optional): Filtrar por rol (1: admin, 2: cliente)
+            orden (str, optional): Campo de ordenamiento ("campo" o "-campo")
+
+        Returns:
+            List[Row]: Filas con las columnas de `UsuarioOut`
 
         """
-        return self.db.query(Usuario).all()
+        return listar(
+            self._proyeccion(),
+            Usuario,
+            skip=skip,
+            limit=limit,
+            orden=orden,
+            permitidos=self.CAMPOS_ORDEN,
+            id_rol=id_rol,
+        )
 
     def mostrar_usuario(self, usuario_id: int):
         """
@@ -217,9 +478,7 @@ class UsuarioCRUD:
             dict: Información del usuario
 
         """
-        usuario = (
-            self.db.query(Usuario).filter(Usuario.id_usuario == usuario_id).first()
-        )
+        usuario = self.obtener_por_id(usuario_id)
 
         if not usuario:
             raise ValueError("Usuario no encontrado")
@@ -23,6 +23,8 @@ from .asignacionT import AsignacionT
 from .transaccion import Transaccion
 from .auditoria import Auditoria
 from .auditoria import Auditoria
+from .secuencia import Secuencia
+from .resumen import ResumenTransaccionDiario
 
 __all__ = [
     "Usuario",
@@ -6,8 +6,7 @@ Modelo de AsignacionT con SQLAlchemy y esquemas de validación con Pydantic.
 """
 
 import uuid
-from sqlalchemy import Column, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, DateTime, Uuid
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field
 from datetime import datetime
@@ -20,13 +19,11 @@ class AsignacionT(Base):
     """
 
     __tablename__ = "asignaciones"
-    id_asignacion = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    id_usuario = Column(UUID(as_uuid=True), ForeignKey("usuarios.id_usuario"))
-    id_empleado = Column(
-        UUID(as_uuid=True), ForeignKey("empleados.id_empleado", ondelete="CASCADE")
-    )
-    id_transporte = Column(UUID(as_uuid=True), ForeignKey("transportes.id_transporte"))
-    id_ruta = Column(UUID(as_uuid=True), ForeignKey("rutas.id_ruta"))
+    id_asignacion = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    id_usuario = Column(Uuid, ForeignKey("usuarios.id_usuario"))
+    id_empleado = Column(Uuid, ForeignKey("empleados.id_empleado", ondelete="CASCADE"))
+    id_transporte = Column(Uuid, ForeignKey("transportes.id_transporte"))
+    id_ruta = Column(Uuid, ForeignKey("rutas.id_ruta"))
     fecha_registro = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizar = Column(
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
@@ -1,11 +1,11 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, Uuid, event
 from uuid import UUID as UUIDType
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from database.config import Base
+from database.particiones import asegurar_particiones
 from pydantic import BaseModel
 
 
@@ -22,15 +22,27 @@ class Auditoria(Base):
     """
 
     __tablename__ = "auditoria"
-
-    id_auditoria = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    id_usuario = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id_usuario"), nullable=False
+    # Índices para la paginación por cursor (fecha, id_auditoria), sola o
+    # precedida por cada filtro de igualdad que admite el listado.
+    __table_args__ = (
+        Index("ix_auditoria_fecha_id", "fecha", "id_auditoria"),
+        Index("ix_auditoria_accion_fecha_id", "accion", "fecha", "id_auditoria"),
+        Index("ix_auditoria_tabla_fecha_id", "tabla_afectada", "fecha", "id_auditoria"),
+        Index("ix_auditoria_usuario_fecha_id", "id_usuario", "fecha", "id_auditoria"),
+        # En PostgreSQL, una partición por mes (ver database/particiones.py).
+        {"postgresql_partition_by": "RANGE (fecha)"},
     )
+
+    id_auditoria = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    id_usuario = Column(Uuid, ForeignKey("usuarios.id_usuario"), nullable=False)
     tabla_afectada = Column(String(20), nullable=False)
     accion = Column(String(20), nullable=False)
     descripcion = Column(Text, nullable=False)
-    fecha = Column(DateTime, default=datetime.now, nullable=False)
+    # PostgreSQL exige que la llave primaria de una tabla particionada incluya
+    # la columna de partición; para el ORM la identidad sigue siendo el ID.
+    fecha = Column(DateTime, default=datetime.now, nullable=False, primary_key=True)
+
+    __mapper_args__ = {"primary_key": [id_auditoria]}
 
     usuario = relationship("Usuario", back_populates="auditorias")
 
@@ -39,6 +51,13 @@ class Auditoria(Base):
         return f"<Auditoria(id_auditoria={self.id_auditoria}, id_usuario={self.id_usuario}, tabla_afectada='{self.tabla_afectada}', accion='{self.accion}', fecha={self.fecha})>"
 
 
+@event.listens_for(Auditoria.__table__, "after_create")
+def _crear_particiones(tabla, conexion, **kw):
+    """Al crear la tabla en PostgreSQL, crea su partición por defecto y las
+    de los próximos meses."""
+    asegurar_particiones(conexion, tabla.name, "fecha")
+
+
 class AuditoriaOut(BaseModel):
     """Esquema de salida para representar un empleado.
     Se excluye la fecha de registro y actualizacion.
@@ -55,3 +74,12 @@ class AuditoriaOut(BaseModel):
         """Configuración para permitir la conversión desde objetos SQLAlchemy."""
 
         from_attributes = True
+
+
+class AuditoriaPagina(BaseModel):
+    """Esquema de salida para una página de auditorías.
+    `siguiente_cursor` es None cuando no hay más resultados.
+    """
+
+    items: List[AuditoriaOut]
+    siguiente_cursor: Optional[str] = None
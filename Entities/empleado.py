@@ -7,8 +7,7 @@ Modelo de Empleado con SQLAlchemy y esquemas de validación con Pydantic.
 
 from datetime import datetime
 import uuid
-from sqlalchemy import Column, DateTime, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Index, String, Uuid
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field
 from database.config import Base
@@ -21,7 +20,12 @@ class Empleado(Base):
     """
 
     __tablename__ = "empleados"
-    id_empleado = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        # Filtro + llave primaria: el listado paginado se resuelve en el índice.
+        Index("ix_empleados_rol_id", "rol", "id_empleado"),
+        Index("ix_empleados_estado_id", "estado", "id_empleado"),
+    )
+    id_empleado = Column(Uuid, primary_key=True, default=uuid.uuid4)
     nombre = Column(String, nullable=False)
     apellido = Column(String, nullable=False)
     documento = Column(String, unique=True, nullable=False)
@@ -1,7 +1,6 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Float
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Float, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import datetime
 from typing import Optional
@@ -22,7 +21,7 @@ class Linea(Base):
 
     __tablename__ = "lineas"
 
-    id_linea = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_linea = Column(Uuid, primary_key=True, default=uuid.uuid4)
     nombre = Column(String(100), nullable=False, unique=True, index=True)
     descripcion = Column(String(255), nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
@@ -30,7 +29,13 @@ class Linea(Base):
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
     )
 
-    ruta = relationship("Ruta", back_populates="linea", cascade="all, delete-orphan")
+    # La base de datos borra las rutas (ON DELETE CASCADE): no se cargan.
+    ruta = relationship(
+        "Ruta",
+        back_populates="linea",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __repr__(self):
         """Representación en string del objeto Linea"""
@@ -0,0 +1,45 @@
+"""
+Esquemas de carga masiva
+========================
+
+Resultado de los endpoints `POST .../bulk`: las filas creadas y un reporte
+de errores por fila, identificadas por su posición en el lote recibido; y de
+los de eliminación masiva (`POST .../bulk/eliminar`).
+"""
+
+from typing import List, Optional
+from uuid import UUID as UUIDType
+
+from pydantic import BaseModel
+
+
+class FilaCreadaMasiva(BaseModel):
+    """Fila del lote que se insertó."""
+
+    indice: int
+    id: UUIDType
+
+
+class ErrorFilaMasiva(BaseModel):
+    """Fila del lote que no se insertó y el motivo."""
+
+    indice: int
+    campo: Optional[str] = None
+    valor: Optional[str] = None
+    detalle: str
+
+
+class ResultadoMasivo(BaseModel):
+    """Esquema de salida de una carga masiva."""
+
+    recibidos: int
+    creados: List[FilaCreadaMasiva]
+    errores: List[ErrorFilaMasiva]
+
+
+class ResultadoEliminacionMasiva(BaseModel):
+    """Esquema de salida de una eliminación masiva."""
+
+    recibidos: int
+    eliminados: int
+    no_encontrados: List[UUIDType]
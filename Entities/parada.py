@@ -7,8 +7,7 @@ Modelo de Parada con SQLAlchemy y esquemas de validación con Pydantic.
 
 from datetime import datetime
 import uuid
-from sqlalchemy import Column, DateTime, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Index, String, Uuid
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field
 from database.config import Base
@@ -20,7 +19,8 @@ class Parada(Base):
     """
 
     __tablename__ = "paradas"
-    id_parada = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (Index("ix_paradas_estado_id", "estado", "id_parada"),)
+    id_parada = Column(Uuid, primary_key=True, default=uuid.uuid4)
     nombre = Column(String, nullable=False)
     direccion = Column(String, nullable=False)
     coordenadas = Column(String, nullable=True)
@@ -0,0 +1,66 @@
+"""
+Entidad ResumenTransaccionDiario
+================================
+
+Totales diarios de transacciones por tipo de transacción y tipo de tarjeta,
+mantenidos en la misma transacción que registra cada movimiento.
+"""
+
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy import BigInteger, Column, Date, Float, Integer, String
+
+from database.config import Base
+
+
+class ResumenTransaccionDiario(Base):
+    """Modelo de ResumenTransaccionDiario
+
+    Cada combinación (día, tipo de transacción, tipo de tarjeta) se reparte
+    en varias particiones para que los pagos simultáneos no compitan por la
+    misma fila; los reportes suman las particiones.
+
+    Atributos:
+        dia (date): Día de las transacciones.
+        tipo_transaccion (str): Tipo de transacción (Ej: "Recarga", "Pago").
+        tipo_tarjeta (str): Tipo de la tarjeta (Ej: "Estudiante", "Frecuente").
+        particion (int): Partición del contador.
+        cantidad (int): Número de transacciones.
+        total (float): Suma de los montos.
+    """
+
+    __tablename__ = "resumen_transacciones_diario"
+
+    dia = Column(Date, primary_key=True)
+    tipo_transaccion = Column(String(50), primary_key=True)
+    tipo_tarjeta = Column(String(20), primary_key=True)
+    particion = Column(Integer, primary_key=True, default=0)
+    cantidad = Column(BigInteger, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        """Representación en string del objeto ResumenTransaccionDiario"""
+        return f"<ResumenTransaccionDiario(dia={self.dia}, tipo_transaccion='{self.tipo_transaccion}', tipo_tarjeta='{self.tipo_tarjeta}', cantidad={self.cantidad}, total={self.total})>"
+
+
+class ResumenDiarioOut(BaseModel):
+    """Esquema de salida con los totales de un día."""
+
+    dia: date
+    tipo_transaccion: str
+    tipo_tarjeta: str
+    cantidad: int
+    total: float
+
+    class Config:
+        from_attributes = True
+
+
+class ReporteDiario(BaseModel):
+    """Esquema de salida del reporte diario de transacciones."""
+
+    items: List[ResumenDiarioOut]
+    cantidad: int
+    total: float
@@ -1,7 +1,6 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Float
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Float, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import datetime
 from typing import Optional
@@ -24,9 +23,9 @@ class Ruta(Base):
 
     __tablename__ = "rutas"
 
-    id_ruta = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_ruta = Column(Uuid, primary_key=True, default=uuid.uuid4)
     id_linea = Column(
-        UUID(as_uuid=True),
+        Uuid,
         ForeignKey("lineas.id_linea", ondelete="CASCADE"),
         nullable=False,
         index=True,
@@ -0,0 +1,33 @@
+"""
+Entidad Secuencia
+=================
+
+Contadores persistentes para reservar bloques de números. En PostgreSQL se
+usan secuencias nativas; la tabla `secuencias` cumple la misma función en
+los motores que no las tienen.
+"""
+
+from sqlalchemy import BigInteger, Column, Sequence, String
+from database.config import Base
+
+SECUENCIA_TARJETAS = Sequence(
+    "tarjetas_numero_seq", start=0, minvalue=0, metadata=Base.metadata
+)
+
+
+class Secuencia(Base):
+    """Modelo de Secuencia
+
+    Atributos:
+        nombre (str): Nombre del contador.
+        valor (int): Siguiente valor libre del contador.
+    """
+
+    __tablename__ = "secuencias"
+
+    nombre = Column(String(50), primary_key=True)
+    valor = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        """Representación en string del objeto Secuencia"""
+        return f"<Secuencia(nombre='{self.nombre}', valor={self.valor})>"
@@ -1,7 +1,6 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Float
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Float, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import datetime
 from typing import Optional
@@ -23,11 +22,9 @@ class Tarjeta(Base):
 
     __tablename__ = "tarjetas"
 
-    id_tarjeta = Column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
-    )
+    id_tarjeta = Column(Uuid, primary_key=True, default=uuid.uuid4, nullable=False)
     id_usuario = Column(
-        UUID(as_uuid=True),
+        Uuid,
         ForeignKey("usuarios.id_usuario", ondelete="CASCADE"),
         nullable=False,
         unique=True,
@@ -92,6 +89,16 @@ class TarjetaUpdate(BaseModel):
         return v
 
 
+class TarjetaValidacion(BaseModel):
+    """Esquema de salida del cobro de un pasaje con la tarjeta."""
+
+    numero_tarjeta: str
+    saldo: float
+    monto: float
+    id_transaccion: uuid.UUID
+    fecha_transaccion: datetime
+
+
 class TarjetaOut(BaseModel):
     """Esquema de salida para la creación de tarjetas."""
 
@@ -100,4 +107,4 @@ class TarjetaOut(BaseModel):
     mensaje: str
 
     class Config:
-        from_atributes = True
+        from_attributes = True
@@ -1,9 +1,8 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Float
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DateTime, Float, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from database.config import Base
 import uuid
 
@@ -20,16 +19,23 @@ class Transaccion(Base):
     """
 
     __tablename__ = "transacciones"
+    # Historial por tarjeta: filtra por número y rango de fechas y pagina por
+    # (fecha, id) recorriendo el índice en orden, sin ordenar en memoria.
+    __table_args__ = (
+        Index(
+            "ix_transacciones_tarjeta_fecha_id",
+            "numero_tarjeta",
+            "fecha_transaccion",
+            "id_transaccion",
+        ),
+    )
     import uuid
 
-    id_transaccion = Column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
-    )
+    id_transaccion = Column(Uuid, primary_key=True, default=uuid.uuid4, nullable=False)
     numero_tarjeta = Column(
         String(20),
         ForeignKey("tarjetas.numero_tarjeta", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     tipo_transaccion = Column(String(50), nullable=False)
     monto = Column(Float, nullable=False)
@@ -52,4 +58,13 @@ class TransaccionOut(BaseModel):
     fecha_transaccion: datetime
 
     class Config:
-        from_atributes = True
+        from_attributes = True
+
+
+class TransaccionPagina(BaseModel):
+    """Esquema de salida para una página del historial de transacciones.
+    `siguiente_cursor` es None cuando no hay más resultados.
+    """
+
+    items: List[TransaccionOut]
+    siguiente_cursor: Optional[str] = None
@@ -6,8 +6,7 @@ Modelo de Transporte con SQLAlchemy y esquemas de validación con Pydantic.
 """
 
 import uuid
-from sqlalchemy import Column, DateTime, String, ForeignKey, Integer
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, String, ForeignKey, Index, Integer, Uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database.config import Base
@@ -20,12 +19,13 @@ class Transporte(Base):
     """
 
     __tablename__ = "transportes"
-    id_transporte = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (Index("ix_transportes_estado_id", "estado", "id_transporte"),)
+    id_transporte = Column(Uuid, primary_key=True, default=uuid.uuid4)
     tipo = Column(String, nullable=False)
     placa = Column(String, unique=True, nullable=False)
     capacidad = Column(Integer, nullable=False)
     estado = Column(String, default="Activo")
-    id_linea = Column(UUID(as_uuid=True), ForeignKey("lineas.id_linea"))
+    id_linea = Column(Uuid, ForeignKey("lineas.id_linea"))
     fecha_registro = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizar = Column(
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
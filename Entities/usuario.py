@@ -6,9 +6,8 @@ Modelo de Usuario con SQLAlchemy y esquemas de validación con Pydantic.
 """
 
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DateTime, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import datetime
 from typing import Optional
@@ -33,8 +32,9 @@ class Usuario(Base):
     """
 
     __tablename__ = "usuarios"
+    __table_args__ = (Index("ix_usuarios_rol_id", "id_rol", "id_usuario"),)
 
-    id_usuario = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_usuario = Column(Uuid, primary_key=True, default=uuid.uuid4)
     id_rol = Column(Integer, ForeignKey("roles.id_rol"), nullable=False, default=2)
     nombre = Column(String(50), nullable=False, index=True)
     apellido = Column(String(50), nullable=False, index=True)
@@ -48,8 +48,12 @@ class Usuario(Base):
 
     auditorias = relationship("Auditoria", back_populates="usuario")
     rol = relationship("Rol", back_populates="usuario")
+    # La base de datos borra las tarjetas (ON DELETE CASCADE): no se cargan.
     tarjetas = relationship(
-        "Tarjeta", back_populates="usuario", cascade="all, delete-orphan"
+        "Tarjeta",
+        back_populates="usuario",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self):
@@ -154,6 +158,17 @@ class UsuarioUpdate(BaseModel):
     )
 
 
+class UsuarioLogin(BaseModel):
+    """
+    Esquema para el inicio de sesión de un usuario.
+    """
+
+    email: EmailStr = Field(..., description="Correo electrónico del usuario")
+    contrasena: str = Field(
+        ..., min_length=1, max_length=200, description="Contraseña del usuario"
+    )
+
+
 class UsuarioOut(BaseModel):
     """Esquema de salida para representar un empleado.
     Se excluye la fecha de registro y actualizacion.
@@ -0,0 +1,117 @@
+"""
+Calentamiento al iniciar
+========================
+
+Trabajo que de otro modo pagarían las primeras peticiones de cada worker
+después de un despliegue, hecho en el lifespan antes de aceptar tráfico:
+
+- Configuración de los mappers de SQLAlchemy (relaciones, columnas y
+  cargadores de todas las entidades), que se hace perezosamente en la
+  primera consulta ORM.
+- Esquema OpenAPI: genera los JSON Schema de todos los modelos de Pydantic
+  y queda en caché para `/docs` y `/openapi.json`.
+- Conexiones de los pools (primaria síncrona y asíncrona, y réplicas):
+  abre `CALENTAR_CONEXIONES` a la vez en cada engine (como máximo
+  `DB_POOL_TAMANO`, las que el pool conserva), con su handshake TLS,
+  autenticación y `SET` de sesión. Si la base no responde se registra una
+  advertencia y el worker arranca igual.
+
+Se desactiva con `CALENTAR_AL_INICIAR=false` (p. ej. en pruebas que no
+necesitan la base de datos al arrancar).
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from database.config import (
+    POOL_TAMANO,
+    async_engine,
+    async_engines_replica,
+    engine,
+)
+
+CALENTAR_AL_INICIAR = os.getenv("CALENTAR_AL_INICIAR", "true").lower() in (
+    "1",
+    "true",
+    "si",
+    "sí",
+)
+CALENTAR_CONEXIONES = min(
+    int(os.getenv("CALENTAR_CONEXIONES", str(POOL_TAMANO))), POOL_TAMANO
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _abrir_conexiones_sync(engine_sync, cantidad: int):
+    """Abre `cantidad` conexiones a la vez y las devuelve al pool."""
+    conexiones = []
+    try:
+        for _ in range(cantidad):
+            conexion = engine_sync.connect()
+            conexiones.append(conexion)
+            conexion.execute(text("SELECT 1"))
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+
+
+async def _abrir_conexiones(engine_async, cantidad: int):
+    """Versión asíncrona: abre las conexiones en paralelo."""
+
+    async def abrir(pendientes: asyncio.Event, abiertas: list):
+        async with engine_async.connect() as conexion:
+            await conexion.execute(text("SELECT 1"))
+            abiertas.append(conexion)
+            if len(abiertas) == cantidad:
+                pendientes.set()
+            # Retener la conexión hasta que estén todas, para que el pool
+            # abra `cantidad` distintas en lugar de reutilizar la primera.
+            await pendientes.wait()
+
+    pendientes, abiertas = asyncio.Event(), []
+    await asyncio.gather(*(abrir(pendientes, abiertas) for _ in range(cantidad)))
+
+
+async def calentar(app) -> dict:
+    """Prepara mappers, esquemas y conexiones antes de atender peticiones.
+
+    Args:
+        app (FastAPI): Aplicación cuyo esquema OpenAPI se genera.
+
+    Returns:
+        dict: Milisegundos de cada paso (`mappers`, `openapi`, `conexiones`).
+    """
+    tiempos = {}
+
+    inicio = time.perf_counter()
+    configure_mappers()
+    tiempos["mappers"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    app.openapi()
+    tiempos["openapi"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    if CALENTAR_CONEXIONES > 0:
+        try:
+            await asyncio.gather(
+                asyncio.to_thread(_abrir_conexiones_sync, engine, CALENTAR_CONEXIONES),
+                _abrir_conexiones(async_engine, CALENTAR_CONEXIONES),
+                *(
+                    _abrir_conexiones(replica, CALENTAR_CONEXIONES)
+                    for replica in async_engines_replica
+                ),
+            )
+        except Exception as error:
+            logger.warning("No se pudieron abrir las conexiones iniciales: %s", error)
+    tiempos["conexiones"] = time.perf_counter() - inicio
+
+    tiempos = {paso: round(segundos * 1000, 1) for paso, segundos in tiempos.items()}
+    logger.info("Calentamiento del worker %d (ms): %s", os.getpid(), tiempos)
+    return tiempos
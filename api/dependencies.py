@@ -6,8 +6,9 @@ Funciones de dependencia para la aplicación FastAPI, incluyendo
 manejo de sesiones de base de datos y autenticación.
 """
 
-from typing import Generator
-from database.config import SessionLocal
+from typing import AsyncGenerator, Generator
+from database.config import SessionLocal, nueva_sesion_asincrona
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -25,6 +26,22 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependencia para obtener una sesión asíncrona de base de datos.
+
+    Las consultas no bloquean el event loop, por lo que un mismo worker
+    atiende otras peticiones mientras espera a la base de datos. Las
+    peticiones de solo lectura usan una réplica si hay configuradas (ver
+    `api.replicas`); las demás, la primaria.
+
+    Yields:
+        AsyncSession: Sesión asíncrona de SQLAlchemy.
+    """
+    async with nueva_sesion_asincrona() as db:
+        yield db
+
+
 def get_pagination_params(skip: int = 0, limit: int = 100):
     """
     Parámetros de paginación para endpoints de listado.
@@ -0,0 +1,252 @@
+"""
+Depuración de consultas por petición
+====================================
+
+Modo opcional (`DEBUG_CONSULTAS=1`) que registra cada sentencia SQL emitida
+durante una petición HTTP y agrega a la respuesta:
+
+- `X-Query-Count`: número de sentencias ejecutadas.
+- `Server-Timing`: tiempo en la base de datos (`db`), en la serialización de
+  la respuesta (`serialization`) y total hasta enviar los encabezados
+  (`total`), visible en las herramientas de desarrollo del navegador.
+
+Si la misma forma de SQL (la sentencia con los parámetros normalizados) se
+repite más de `DEBUG_CONSULTAS_UMBRAL` veces en una petición, se registra una
+advertencia con la ruta y el punto del código que la emitió: es el patrón
+N+1 (una consulta por elemento de una lista en lugar de una sola).
+
+El rastreo se guarda en una `ContextVar`, que llega tanto a las rutas
+síncronas (el threadpool copia el contexto) como a las sesiones asíncronas
+(los greenlets de SQLAlchemy comparten el contexto de la tarea). Las
+consultas de hilos en segundo plano, como la cola de auditoría, no cuentan.
+
+En las respuestas por streaming los encabezados se envían antes de leer las
+filas, así que solo incluyen las consultas hechas hasta ese momento.
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from api.metricas import plantilla_ruta
+
+DEBUG_CONSULTAS = os.getenv("DEBUG_CONSULTAS", "false").lower() in (
+    "1",
+    "true",
+    "si",
+    "sí",
+)
+UMBRAL_REPETICIONES = int(os.getenv("DEBUG_CONSULTAS_UMBRAL", "5"))
+
+logger = logging.getLogger(__name__)
+
+_RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ARCHIVOS_PROPIOS = (
+    os.path.abspath(__file__),
+    os.path.join(_RAIZ_PROYECTO, "api", "metricas.py"),
+)
+
+# Marcadores de parámetros de los distintos drivers: ?, :nombre, %(nombre)s, $1.
+_PARAMETRO = re.compile(r"\?|%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+# Listas expandidas de IN (...) y VALUES (...), (...): cambian con el tamaño.
+_LISTA_PARAMETROS = re.compile(r"\?(\s*,\s*\?)+")
+_FILAS_VALUES = re.compile(r"\(\?\)(\s*,\s*\(\?\))+")
+
+
+def forma_sql(sentencia: str) -> str:
+    """Forma normalizada de una sentencia, para agrupar las repetidas.
+
+    Args:
+        sentencia (str): SQL tal como se envía al driver.
+
+    Returns:
+        str: La sentencia sin espacios repetidos y con cada parámetro (o
+        lista de parámetros) reemplazado por `?`.
+    """
+    forma = _PARAMETRO.sub("?", " ".join(sentencia.split()))
+    forma = _LISTA_PARAMETROS.sub("?", forma)
+    return _FILAS_VALUES.sub("(?)", forma)
+
+
+def punto_de_llamada() -> str:
+    """Primer marco de la pila que pertenece al proyecto (archivo:línea en función).
+
+    Se omiten las bibliotecas y este módulo. Si no hay ninguno (consultas
+    lanzadas desde el propio driver o desde código asíncrono cuyo marco no
+    está en la pila del greenlet), retorna una cadena vacía.
+    """
+    marco = sys._getframe(1)
+    while marco is not None:
+        archivo = marco.f_code.co_filename
+        if (
+            archivo.startswith(_RAIZ_PROYECTO)
+            and archivo not in _ARCHIVOS_PROPIOS
+            and "site-packages" not in archivo
+        ):
+            relativo = os.path.relpath(archivo, _RAIZ_PROYECTO)
+            return f"{relativo}:{marco.f_lineno} en {marco.f_code.co_name}"
+        marco = marco.f_back
+    return ""
+
+
+class RastreoConsultas:
+    """Consultas y tiempos de una petición.
+
+    Atributos:
+        metodo (str): Método HTTP de la petición.
+        consultas (int): Sentencias ejecutadas.
+        tiempo_db (float): Segundos en el driver de la base de datos.
+        tiempo_serializacion (float): Segundos serializando la respuesta.
+        formas (Counter): Repeticiones por forma de SQL.
+    """
+
+    __slots__ = (
+        "metodo",
+        "scope",
+        "consultas",
+        "tiempo_db",
+        "tiempo_serializacion",
+        "formas",
+        "_avisadas",
+    )
+
+    def __init__(self, scope):
+        self.metodo = scope.get("method", "")
+        self.scope = scope
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.tiempo_serializacion = 0.0
+        self.formas = Counter()
+        self._avisadas = set()
+
+    def registrar(self, sentencia: str, duracion: float):
+        """Suma una sentencia y avisa la primera vez que su forma supera el umbral."""
+        self.consultas += 1
+        self.tiempo_db += duracion
+        forma = forma_sql(sentencia)
+        self.formas[forma] += 1
+        if self.formas[forma] > UMBRAL_REPETICIONES and forma not in self._avisadas:
+            self._avisadas.add(forma)
+            logger.warning(
+                "Posible N+1 en %s %s: la misma consulta se ejecutó más de %d veces "
+                "(%s): %s",
+                self.metodo,
+                plantilla_ruta(self.scope),
+                UMBRAL_REPETICIONES,
+                punto_de_llamada() or "punto de llamada desconocido",
+                forma[:300],
+            )
+
+    def server_timing(self, total: float) -> str:
+        """Valor del encabezado `Server-Timing` (duraciones en milisegundos)."""
+        return (
+            f'db;dur={self.tiempo_db * 1000:.2f};desc="{self.consultas} consultas", '
+            f"serialization;dur={self.tiempo_serializacion * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+
+
+_rastreo_actual: ContextVar[Optional[RastreoConsultas]] = ContextVar(
+    "rastreo_consultas", default=None
+)
+
+
+class MiddlewareDepuracionConsultas:
+    """Middleware ASGI que abre un rastreo por petición y agrega los encabezados."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rastreo = RastreoConsultas(scope)
+        inicio = time.perf_counter()
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                encabezados = MutableHeaders(scope=mensaje)
+                encabezados.append("X-Query-Count", str(rastreo.consultas))
+                encabezados.append(
+                    "Server-Timing", rastreo.server_timing(time.perf_counter() - inicio)
+                )
+            await send(mensaje)
+
+        token = _rastreo_actual.set(rastreo)
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _rastreo_actual.reset(token)
+
+
+def _rastrear_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        if _rastreo_actual.get() is not None:
+            conn.info.setdefault("depuracion_inicio", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        rastreo = _rastreo_actual.get()
+        pila = conn.info.get("depuracion_inicio")
+        if rastreo is not None and pila:
+            rastreo.registrar(statement, time.perf_counter() - pila.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(contexto):
+        pila = (
+            contexto.connection.info.get("depuracion_inicio")
+            if contexto.connection
+            else None
+        )
+        if pila:
+            pila.pop()
+
+
+def _medir_serializacion():
+    """Mide `fastapi.routing.serialize_response` (validación y volcado del modelo).
+
+    FastAPI no ofrece un evento para la serialización; se envuelve la función
+    del módulo, que el manejador de rutas busca en cada llamada.
+    """
+    import fastapi.routing
+
+    original = fastapi.routing.serialize_response
+    if getattr(original, "_depuracion", False):
+        return
+
+    async def serialize_response(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            rastreo = _rastreo_actual.get()
+            if rastreo is not None:
+                rastreo.tiempo_serializacion += time.perf_counter() - inicio
+
+    serialize_response._depuracion = True
+    fastapi.routing.serialize_response = serialize_response
+
+
+def activar_depuracion_consultas(app, *engines):
+    """Activa el rastreo de consultas por petición.
+
+    Args:
+        app (FastAPI): Aplicación a la que se agrega el middleware.
+        *engines (Engine): Engines síncronos a rastrear (para uno
+            asíncrono, `.sync_engine`).
+    """
+    for engine in engines:
+        _rastrear_engine(engine)
+    _medir_serializacion()
+    app.add_middleware(MiddlewareDepuracionConsultas)
@@ -8,6 +8,7 @@ Manejo centralizado de errores y excepciones de la API.
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import TimeoutError as TimeoutPool
 from pydantic import ValidationError
 
 
@@ -38,6 +39,23 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
     )
 
 
+async def pool_timeout_handler(request: Request, exc: TimeoutPool):
+    """
+    Manejador para peticiones que no obtuvieron conexión del pool a tiempo.
+
+    Es saturación, no un error de la petición: se responde 503 para que el
+    cliente o el balanceador reintente.
+    """
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content={
+            "detail": "Servicio saturado",
+            "message": "No hay conexiones disponibles con la base de datos, intente de nuevo",
+        },
+    )
+
+
 async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Manejador personalizado para HTTPException.
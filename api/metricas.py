@@ -0,0 +1,432 @@
+"""
+Métricas de la API
+==================
+
+Métricas en memoria del proceso, expuestas en formato de texto de
+Prometheus en `GET /metrics`:
+
+- Peticiones HTTP por método, ruta (la plantilla, p. ej.
+  `/api/usuarios/{usuario_id}`) y código de estado; histograma de latencia
+  por método y ruta; peticiones en curso.
+- Consultas SQL (número y duración) por motor (`sync` / `async`), a partir
+  de los eventos `before_cursor_execute` / `after_cursor_execute`.
+- Checkouts del pool de conexiones, tiempo de espera hasta obtener una
+  conexión y checkouts que agotaron `DB_POOL_TIMEOUT_SEG`; conexiones en
+  uso, libres y de desborde, leídas del pool en el momento de la consulta
+  (también en JSON en `GET /db/pool/estadisticas`).
+- Estado de la cola de auditoría, del pool de bcrypt y de las cachés de
+  entidades, leído en el momento de la consulta.
+
+Registrar una petición cuesta unas pocas sumas bajo un lock; el texto solo
+se genera cuando se consulta `/metrics`. Con varios workers cada proceso
+tiene sus propias métricas: Prometheus debe consultar cada uno o agregarlas.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as TimeoutPool
+
+CONTENT_TYPE_METRICAS = "text/plain; version=0.0.4; charset=utf-8"
+
+BUCKETS_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_SQL = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+RUTA_DESCONOCIDA = "sin_ruta"
+
+
+class Histograma:
+    """Histograma acumulativo con buckets fijos (formato Prometheus).
+
+    Atributos:
+        buckets (Tuple[float]): Límites superiores, en segundos.
+    """
+
+    __slots__ = ("buckets", "conteos", "suma", "total")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.conteos = [0] * (len(buckets) + 1)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        """Registra una observación (el llamador tiene el lock)."""
+        self.conteos[bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def lineas(self, nombre: str, etiquetas: str) -> Iterable[str]:
+        """Líneas `_bucket`, `_sum` y `_count` del histograma."""
+        separador = "," if etiquetas else ""
+        acumulado = 0
+        for limite, conteo in zip(self.buckets, self.conteos):
+            acumulado += conteo
+            yield f'{nombre}_bucket{{{etiquetas}{separador}le="{limite}"}} {acumulado}'
+        yield f'{nombre}_bucket{{{etiquetas}{separador}le="+Inf"}} {self.total}'
+        llaves = f"{{{etiquetas}}}" if etiquetas else ""
+        yield f"{nombre}_sum{llaves} {self.suma}"
+        yield f"{nombre}_count{llaves} {self.total}"
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(**valores) -> str:
+    return ",".join(f'{llave}="{_escapar(valor)}"' for llave, valor in valores.items())
+
+
+class RegistroMetricas:
+    """Contadores e histogramas de la API y de la base de datos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.en_curso = 0
+        self._peticiones: Dict[tuple, int] = {}
+        self._latencias: Dict[tuple, Histograma] = {}
+        self._consultas: Dict[str, Histograma] = {}
+        self._errores_sql: Dict[str, int] = {}
+        self._checkouts: Dict[str, int] = {}
+        self._esperas_pool: Dict[str, Histograma] = {}
+        self._espera_max_pool: Dict[str, float] = {}
+        self._timeouts_pool: Dict[str, int] = {}
+        self._engines: Dict[str, object] = {}
+
+    def observar_peticion(self, metodo: str, ruta: str, codigo: int, duracion: float):
+        """Registra una petición HTTP terminada."""
+        with self._lock:
+            llave = (metodo, ruta, codigo)
+            self._peticiones[llave] = self._peticiones.get(llave, 0) + 1
+            histograma = self._latencias.get((metodo, ruta))
+            if histograma is None:
+                histograma = self._latencias[(metodo, ruta)] = Histograma(BUCKETS_HTTP)
+            histograma.observar(duracion)
+
+    def observar_consulta(self, motor: str, duracion: float, error: bool = False):
+        """Registra una sentencia SQL ejecutada (o fallida)."""
+        with self._lock:
+            histograma = self._consultas.get(motor)
+            if histograma is None:
+                histograma = self._consultas[motor] = Histograma(BUCKETS_SQL)
+            histograma.observar(duracion)
+            if error:
+                self._errores_sql[motor] = self._errores_sql.get(motor, 0) + 1
+
+    def observar_checkout(self, motor: str, espera: float):
+        """Registra la entrega de una conexión del pool y cuánto se esperó."""
+        with self._lock:
+            self._checkouts[motor] = self._checkouts.get(motor, 0) + 1
+            histograma = self._esperas_pool.get(motor)
+            if histograma is None:
+                histograma = self._esperas_pool[motor] = Histograma(BUCKETS_SQL)
+            histograma.observar(espera)
+            if espera > self._espera_max_pool.get(motor, 0.0):
+                self._espera_max_pool[motor] = espera
+
+    def observar_timeout_pool(self, motor: str):
+        """Registra un checkout que agotó el tiempo de espera del pool."""
+        with self._lock:
+            self._timeouts_pool[motor] = self._timeouts_pool.get(motor, 0) + 1
+
+    def registrar_engine(self, motor: str, engine):
+        """Asocia un engine a su etiqueta para leer el estado de su pool."""
+        self._engines[motor] = engine
+
+    def estadisticas_pool(self) -> Dict[str, dict]:
+        """Estado y contadores del pool de cada engine registrado.
+
+        Returns:
+            Dict[str, dict]: Por motor, la configuración del pool (`tamano`,
+            `desborde_max`, `timeout_seg`), su ocupación actual (`en_uso`,
+            `libres`, `desborde`) y los acumulados desde el inicio
+            (`checkouts`, `timeouts`, `espera_media_ms`, `espera_max_ms`).
+            Los pools sin esas operaciones (p. ej. `NullPool`) solo
+            informan los acumulados.
+        """
+        resultado = {}
+        for motor, engine in sorted(self._engines.items()):
+            pool = engine.pool
+            datos = {"clase": type(pool).__name__}
+            for clave, metodo in (
+                ("tamano", "size"),
+                ("en_uso", "checkedout"),
+                ("libres", "checkedin"),
+                ("desborde", "overflow"),
+            ):
+                if hasattr(pool, metodo):
+                    datos[clave] = getattr(pool, metodo)()
+            if "desborde" in datos:
+                # QueuePool cuenta el desborde desde -tamano (sin conexiones abiertas).
+                datos["desborde"] = max(datos["desborde"], 0)
+                # -1 en SQLAlchemy: desborde sin límite.
+                datos["desborde_max"] = (
+                    pool._max_overflow if pool._max_overflow >= 0 else None
+                )
+                datos["timeout_seg"] = pool._timeout
+            with self._lock:
+                histograma = self._esperas_pool.get(motor)
+                checkouts = histograma.total if histograma else 0
+                datos["checkouts"] = checkouts
+                datos["timeouts"] = self._timeouts_pool.get(motor, 0)
+                datos["espera_media_ms"] = round(
+                    histograma.suma / checkouts * 1000 if checkouts else 0.0, 3
+                )
+                datos["espera_max_ms"] = round(
+                    self._espera_max_pool.get(motor, 0.0) * 1000, 3
+                )
+            resultado[motor] = datos
+        return resultado
+
+    def texto(self, externas: Dict[str, dict] = None) -> str:
+        """Genera el texto de exposición de Prometheus.
+
+        Args:
+            externas (Dict[str, dict], optional): Estadísticas de otros
+                componentes por nombre (ver `estadisticas_componentes`); sus
+                valores numéricos se exponen como gauges.
+
+        Returns:
+            str: Métricas en formato de texto de Prometheus.
+        """
+        lineas = []
+
+        def familia(nombre, tipo, ayuda):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+
+        with self._lock:
+            familia("http_peticiones_total", "counter", "Peticiones HTTP atendidas.")
+            for (metodo, ruta, codigo), total in sorted(self._peticiones.items()):
+                etiquetas = _etiquetas(metodo=metodo, ruta=ruta, codigo=codigo)
+                lineas.append(f"http_peticiones_total{{{etiquetas}}} {total}")
+
+            familia(
+                "http_duracion_segundos",
+                "histogram",
+                "Latencia de las peticiones HTTP.",
+            )
+            for (metodo, ruta), histograma in sorted(self._latencias.items()):
+                lineas.extend(
+                    histograma.lineas(
+                        "http_duracion_segundos", _etiquetas(metodo=metodo, ruta=ruta)
+                    )
+                )
+
+            familia("http_peticiones_en_curso", "gauge", "Peticiones HTTP en curso.")
+            lineas.append(f"http_peticiones_en_curso {self.en_curso}")
+
+            familia(
+                "db_consulta_duracion_segundos",
+                "histogram",
+                "Duración de las sentencias SQL; _count es el número de consultas.",
+            )
+            for motor, histograma in sorted(self._consultas.items()):
+                lineas.extend(
+                    histograma.lineas(
+                        "db_consulta_duracion_segundos", _etiquetas(motor=motor)
+                    )
+                )
+
+            familia("db_consulta_errores_total", "counter", "Sentencias SQL fallidas.")
+            for motor, total in sorted(self._errores_sql.items()):
+                etiquetas = _etiquetas(motor=motor)
+                lineas.append(f"db_consulta_errores_total{{{etiquetas}}} {total}")
+
+            familia(
+                "db_pool_checkouts_total",
+                "counter",
+                "Conexiones entregadas por el pool.",
+            )
+            for motor, total in sorted(self._checkouts.items()):
+                etiquetas = _etiquetas(motor=motor)
+                lineas.append(f"db_pool_checkouts_total{{{etiquetas}}} {total}")
+
+            familia(
+                "db_pool_espera_segundos",
+                "histogram",
+                "Espera hasta obtener una conexión del pool (incluye abrirla).",
+            )
+            for motor, histograma in sorted(self._esperas_pool.items()):
+                lineas.extend(
+                    histograma.lineas(
+                        "db_pool_espera_segundos", _etiquetas(motor=motor)
+                    )
+                )
+
+            familia(
+                "db_pool_timeouts_total",
+                "counter",
+                "Checkouts que agotaron la espera del pool (respondidos con 503).",
+            )
+            for motor, total in sorted(self._timeouts_pool.items()):
+                etiquetas = _etiquetas(motor=motor)
+                lineas.append(f"db_pool_timeouts_total{{{etiquetas}}} {total}")
+
+        pools = self.estadisticas_pool()
+        familia(
+            "db_pool_conexiones",
+            "gauge",
+            "Conexiones del pool por estado (en_uso, libres, desborde).",
+        )
+        for motor, datos in pools.items():
+            for estado in ("en_uso", "libres", "desborde"):
+                if estado in datos:
+                    etiquetas = _etiquetas(motor=motor, estado=estado)
+                    lineas.append(f"db_pool_conexiones{{{etiquetas}}} {datos[estado]}")
+        familia(
+            "db_pool_capacidad",
+            "gauge",
+            "Conexiones máximas del pool (tamaño más desborde), si tiene límite.",
+        )
+        for motor, datos in pools.items():
+            if datos.get("desborde_max") is not None:
+                capacidad = datos["tamano"] + datos["desborde_max"]
+                lineas.append(
+                    f"db_pool_capacidad{{{_etiquetas(motor=motor)}}} {capacidad}"
+                )
+
+        for componente, estadisticas in (externas or {}).items():
+            for clave, valor in estadisticas.items():
+                if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+                    continue
+                nombre = f"transporte_{componente}_{clave}"
+                familia(nombre, "gauge", f"{clave} de {componente}.")
+                lineas.append(f"{nombre} {valor}")
+
+        return "\n".join(lineas) + "\n"
+
+
+metricas = RegistroMetricas()
+
+
+def plantilla_ruta(scope) -> str:
+    """Plantilla completa de la ruta resuelta, p. ej. `/api/usuarios/{usuario_id}`.
+
+    FastAPI ya no aplana los routers incluidos: `scope["route"]` es la ruta
+    del router original, sin el prefijo de `include_router`. La plantilla con
+    prefijo está en el contexto efectivo que FastAPI deja en el scope; si no
+    existe (versiones que aplanan las rutas), `route.path` ya es completa.
+    """
+    contexto = (scope.get("fastapi") or {}).get("effective_route_context")
+    plantilla = getattr(contexto, "path_format", None)
+    if plantilla:
+        return plantilla
+    return getattr(scope.get("route"), "path", None) or RUTA_DESCONOCIDA
+
+
+class MiddlewareMetricas:
+    """Middleware ASGI que mide cada petición HTTP.
+
+    Es ASGI puro (no `BaseHTTPMiddleware`) para no agregar tareas ni copias
+    del cuerpo por petición. La ruta se toma del scope que el router completa
+    al resolver la petición (ver `plantilla_ruta`); las que no coinciden con
+    ninguna ruta se agrupan en `sin_ruta` para no crear una serie por URL.
+    """
+
+    def __init__(self, app, registro: RegistroMetricas = metricas):
+        self.app = app
+        self.registro = registro
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = {"codigo": 500}
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["codigo"] = mensaje["status"]
+            await send(mensaje)
+
+        self.registro.en_curso += 1
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.registro.en_curso -= 1
+            self.registro.observar_peticion(
+                scope["method"], plantilla_ruta(scope), estado["codigo"], duracion
+            )
+
+
+def _medir_espera_pool(pool, motor: str):
+    """Envuelve `_do_get` del pool para medir la espera de cada checkout.
+
+    `_do_get` es el punto donde el pool espera una conexión libre (o abre
+    una nueva); el evento `checkout` solo avisa cuando ya se obtuvo.
+    """
+    if getattr(pool, "_metricas_motor", None):
+        return
+    original = pool._do_get
+
+    def _do_get():
+        inicio = time.perf_counter()
+        try:
+            conexion = original()
+        except TimeoutPool:
+            metricas.observar_timeout_pool(motor)
+            raise
+        metricas.observar_checkout(motor, time.perf_counter() - inicio)
+        return conexion
+
+    pool._do_get = _do_get
+    pool._metricas_motor = motor
+
+
+def instrumentar_engine(engine, motor: str):
+    """Registra las consultas y las esperas del pool de un engine.
+
+    Args:
+        engine (Engine): Engine síncrono (para uno asíncrono, `.sync_engine`).
+        motor (str): Valor de la etiqueta `motor` en las métricas.
+    """
+    if getattr(engine.pool, "_metricas_motor", None):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metricas_inicio", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["metricas_inicio"].pop()
+        metricas.observar_consulta(motor, time.perf_counter() - inicio)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(contexto):
+        pila = (
+            contexto.connection.info.get("metricas_inicio")
+            if contexto.connection
+            else None
+        )
+        if pila:
+            metricas.observar_consulta(motor, time.perf_counter() - pila.pop(), True)
+
+    _medir_espera_pool(engine.pool, motor)
+    metricas.registrar_engine(motor, engine)
+
+    @event.listens_for(engine, "engine_disposed")
+    def _pool_nuevo(engine):
+        # `dispose()` reemplaza el pool por uno nuevo sin la medición.
+        _medir_espera_pool(engine.pool, motor)
+
+
+def estadisticas_componentes() -> Dict[str, dict]:
+    """Estadísticas de la cola de auditoría, bcrypt y cachés, por componente."""
+    from Crud.auditoria_cola import cola_auditoria
+    from Crud.cache import estadisticas_cache
+    from Crud.seguridad import pool_hashing
+
+    componentes = {
+        "auditoria_cola": cola_auditoria.estadisticas(),
+        "bcrypt": pool_hashing.estadisticas(),
+    }
+    for nombre, estadisticas in estadisticas_cache().items():
+        componentes[f"cache_{nombre}"] = estadisticas
+    return componentes
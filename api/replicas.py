@@ -0,0 +1,90 @@
+"""
+Enrutamiento de lecturas a réplicas
+===================================
+
+Con `DATABASE_REPLICA_URLS` configurada, las peticiones `GET` y `HEAD` leen
+de una réplica (en turno rotativo) y el resto va a la primaria. La decisión
+se toma por petición en `MiddlewareReplicas` y la aplican `get_async_db` y
+las exportaciones al abrir la sesión (`nueva_sesion_asincrona`).
+
+Lectura de lo propio: una réplica puede ir unos instantes detrás de la
+primaria. Tras una escritura exitosa la respuesta incluye la cookie
+`leer_primaria_hasta`, y mientras no venza (`DB_REPLICA_PRIMARIA_SEG`) las
+lecturas de ese cliente van a la primaria. Los clientes sin cookies pueden
+enviar el encabezado `X-Leer-Primaria: 1` en las lecturas que deban ver sus
+propios cambios.
+
+Cada respuesta indica en `X-Origen-Datos` qué base atendió la petición
+(`primaria`, `replica0`, ...), para verificar el enrutamiento. Las
+exportaciones por streaming abren la sesión después de enviar los
+encabezados, así que no lo incluyen.
+"""
+
+import os
+import time
+from http.cookies import CookieError, SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+
+from database.config import destino_lectura
+
+PRIMARIA_SEG = float(os.getenv("DB_REPLICA_PRIMARIA_SEG", "5"))
+
+COOKIE_PRIMARIA = "leer_primaria_hasta"
+METODOS_LECTURA = ("GET", "HEAD")
+
+
+def _fijada_a_primaria(scope) -> bool:
+    """Indica si la petición pide leer de la primaria (encabezado o cookie vigente)."""
+    for nombre, valor in scope.get("headers", ()):
+        if nombre == b"x-leer-primaria":
+            if valor.decode("latin-1").strip().lower() in ("1", "true", "si", "sí"):
+                return True
+        elif nombre == b"cookie":
+            cookie = SimpleCookie()
+            try:
+                cookie.load(valor.decode("latin-1"))
+                hasta = float(cookie[COOKIE_PRIMARIA].value)
+            except (CookieError, KeyError, ValueError):
+                continue
+            if hasta > time.time():
+                return True
+    return False
+
+
+class MiddlewareReplicas:
+    """Middleware ASGI que elige primaria o réplica para cada petición."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        lectura = scope["method"] in METODOS_LECTURA
+        destino = {
+            "replica": lectura and not _fijada_a_primaria(scope),
+            "origen": None,
+        }
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                encabezados = MutableHeaders(scope=mensaje)
+                if destino["origen"]:
+                    encabezados.append("X-Origen-Datos", destino["origen"])
+                if not lectura and mensaje["status"] < 400:
+                    hasta = time.time() + PRIMARIA_SEG
+                    encabezados.append(
+                        "Set-Cookie",
+                        f"{COOKIE_PRIMARIA}={hasta:.3f}; Max-Age={int(PRIMARIA_SEG) + 1}; "
+                        "Path=/; HttpOnly; SameSite=Lax",
+                    )
+            await send(mensaje)
+
+        token = destino_lectura.set(destino)
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            destino_lectura.reset(token)
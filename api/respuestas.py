@@ -0,0 +1,153 @@
+"""
+Respuestas JSON rápidas para listados
+=====================================
+
+Con `response_model=List[...Out]` FastAPI valida cada fila contra el
+esquema (`from_attributes`: un objeto Pydantic por fila leído atributo por
+atributo) y luego lo serializa. En páginas grandes eso cuesta más que la
+consulta.
+
+`respuesta_lista` toma las filas tal como las entrega el CRUD (entidades,
+`Row` o mapeos de columnas), extrae solo los campos del esquema con un
+extractor precalculado por esquema y las convierte directamente en bytes
+JSON con orjson (o con `pydantic_core.to_json` si orjson no está
+instalado). La salida es idéntica byte a byte a la del camino de Pydantic
+para los tipos admitidos (UUID, texto, números, booleanos y fechas sin
+zona horaria); la ruta conserva su `response_model` para la documentación.
+
+La diferencia es que no se valida la salida: los tipos los garantiza el
+esquema de la base de datos. `RESPUESTAS_RAPIDAS=false` vuelve al camino de
+Pydantic en todas las rutas.
+"""
+
+import os
+import types
+import typing
+import uuid
+from collections.abc import Mapping
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Iterable, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+
+    def _a_json(valor):
+        return orjson.dumps(valor, default=_uuid_a_texto)
+
+except ImportError:
+    from pydantic_core import to_json as _a_json
+
+RESPUESTAS_RAPIDAS = os.getenv("RESPUESTAS_RAPIDAS", "true").lower() in (
+    "1",
+    "true",
+    "si",
+    "sí",
+)
+
+# Tipos que orjson y Pydantic escriben igual. Las fechas con zona horaria
+# no están: Pydantic escribe UTC como "Z" y orjson como "+00:00".
+TIPOS_ADMITIDOS = (uuid.UUID, str, int, float, bool, datetime, date, type(None))
+
+
+def _uuid_a_texto(valor):
+    """Subclases de UUID (asyncpg entrega la suya), que orjson no reconoce."""
+    if isinstance(valor, uuid.UUID):
+        return str(valor)
+    raise TypeError
+
+
+def _tipos_campo(anotacion) -> tuple:
+    """Tipos concretos de una anotación, desarmando `Optional` y uniones."""
+    if typing.get_origin(anotacion) in (typing.Union, types.UnionType):
+        return tuple(
+            tipo for arg in typing.get_args(anotacion) for tipo in _tipos_campo(arg)
+        )
+    return (anotacion,)
+
+
+class SerializadorEsquema:
+    """Convierte filas en JSON con los campos de un esquema de salida.
+
+    Atributos:
+        esquema (Type[BaseModel]): Esquema cuyo contrato se reproduce.
+        claves (tuple): Nombres de los campos en la salida, en orden.
+    """
+
+    def __init__(self, esquema: Type[BaseModel]):
+        self.esquema = esquema
+        campos = esquema.model_fields
+        for nombre, campo in campos.items():
+            no_admitidos = [
+                tipo
+                for tipo in _tipos_campo(campo.annotation)
+                if tipo not in TIPOS_ADMITIDOS
+            ]
+            if no_admitidos:
+                raise TypeError(
+                    f"{esquema.__name__}.{nombre}: tipo {no_admitidos[0]!r} no "
+                    "admitido por la serialización rápida"
+                )
+        atributos = tuple(campos)
+        # by_alias=True en FastAPI: la salida usa el alias si lo hay.
+        self.claves = tuple(
+            campo.serialization_alias or campo.alias or nombre
+            for nombre, campo in campos.items()
+        )
+        # attrgetter/itemgetter con un solo nombre no retorna una tupla.
+        if len(atributos) == 1:
+            (nombre,) = atributos
+            self._de_objeto = lambda fila: (getattr(fila, nombre),)
+            self._de_mapeo = lambda fila: (fila[nombre],)
+        else:
+            self._de_objeto = attrgetter(*atributos)
+            self._de_mapeo = itemgetter(*atributos)
+
+    def diccionarios(self, filas: Iterable) -> list:
+        """Filas como diccionarios con solo las claves del esquema."""
+        filas = list(filas)
+        if not filas:
+            return []
+        extraer = self._de_mapeo if isinstance(filas[0], Mapping) else self._de_objeto
+        claves = self.claves
+        return [dict(zip(claves, extraer(fila))) for fila in filas]
+
+    def json(self, filas: Iterable) -> bytes:
+        """Filas serializadas como un arreglo JSON."""
+        return _a_json(self.diccionarios(filas))
+
+
+@lru_cache(maxsize=None)
+def serializador(esquema: Type[BaseModel]) -> SerializadorEsquema:
+    """Serializador del esquema, creado una vez por esquema.
+
+    Raises:
+        TypeError: Si algún campo tiene un tipo que no se puede serializar
+            igual que Pydantic (ver `TIPOS_ADMITIDOS`).
+    """
+    return SerializadorEsquema(esquema)
+
+
+def respuesta_lista(esquema: Type[BaseModel], filas: Iterable, status_code: int = 200):
+    """Respuesta JSON de un listado con el contrato de `List[esquema]`.
+
+    Args:
+        esquema (Type[BaseModel]): Esquema de salida de cada elemento.
+        filas (Iterable): Entidades, `Row` o mapeos de columnas.
+        status_code (int): Código HTTP de la respuesta.
+
+    Returns:
+        Response | list: Los bytes JSON ya serializados; con
+        `RESPUESTAS_RAPIDAS=false`, las filas para que FastAPI las valide.
+    """
+    if not RESPUESTAS_RAPIDAS:
+        return filas
+    return Response(
+        serializador(esquema).json(filas),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -9,10 +9,11 @@ Incluye crear, leer y eliminar asignaciones entre usuarios, empleados, transport
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.dependencies import get_db
-from Crud.asignacionT_crud import AsignacionTCRUD
+from api.dependencies import get_async_db
+from api.respuestas import respuesta_lista
+from Crud.asincrono import AsignacionTCRUDAsync
 from Crud.auditoria_crud import AuditoriaCRUD
 from Entities.asignacionT import AsignacionTCreate, AsignacionTOut
 
@@ -21,38 +22,45 @@ router = APIRouter()
 
 @router.get("/", response_model=List[AsignacionTOut])
 async def listar_asignaciones(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(
         100, ge=1, le=1000, description="Número máximo de registros a retornar"
     ),
+    orden: str = Query(
+        None, description="Campo de ordenamiento, prefijo '-' para descendente"
+    ),
 ):
     """
     Obtener lista de todas las asignaciones.
 
     - **skip**: número de registros a saltar (para paginación)
     - **limit**: número máximo de registros a retornar
+    - **orden**: campo de ordenamiento, ej. `-fecha_registro` (opcional)
     """
-    crud = AsignacionTCRUD(db)
-    asignaciones = crud.listar_asignaciones()
+    crud = AsignacionTCRUDAsync(db)
+    try:
+        asignaciones = await crud.listar_asignaciones(
+            skip=skip, limit=limit, orden=orden
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "AsignacionT")
 
-    return asignaciones[skip : skip + limit]
+    return respuesta_lista(AsignacionTOut, asignaciones)
 
 
 @router.get("/{asignacion_id}", response_model=AsignacionTOut)
-async def obtener_asignacion(asignacion_id: UUID, db: Session = Depends(get_db)):
+async def obtener_asignacion(
+    asignacion_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener una asignación específica por su ID.
 
     - **asignacion_id**: ID único de la asignación
     """
-    crud = AsignacionTCRUD(db)
-    asignaciones = crud.listar_asignaciones()
-
-    asignacion = next(
-        (a for a in asignaciones if str(a.id_asignacion) == str(asignacion_id)), None
-    )
+    crud = AsignacionTCRUDAsync(db)
+    asignacion = await crud.consultar_por_id(asignacion_id)
 
     if not asignacion:
         raise HTTPException(status_code=404, detail="Asignación no encontrada")
@@ -63,7 +71,7 @@ async def obtener_asignacion(asignacion_id: UUID, db: Session = Depends(get_db))
 
 @router.post("/", response_model=AsignacionTOut, status_code=201)
 async def crear_asignacion(
-    asignacion: AsignacionTCreate, db: Session = Depends(get_db)
+    asignacion: AsignacionTCreate, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Crear una nueva asignación.
@@ -74,8 +82,8 @@ async def crear_asignacion(
     - **id_ruta**: ID de la ruta asignada
     """
     try:
-        crud = AsignacionTCRUD(db)
-        nueva_asignacion = crud.registrar_asignacion(asignacion)
+        crud = AsignacionTCRUDAsync(db)
+        nueva_asignacion = await crud.registrar_asignacion(asignacion)
         AuditoriaCRUD.agregar_auditoria_usuario("CREATE", "AsignacionT")
         return nueva_asignacion
     except Exception as e:
@@ -85,14 +93,16 @@ async def crear_asignacion(
 
 
 @router.delete("/{asignacion_id}")
-async def eliminar_asignacion(asignacion_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_asignacion(
+    asignacion_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Eliminar una asignación.
 
     - **asignacion_id**: ID único de la asignación a eliminar
     """
-    crud = AsignacionTCRUD(db)
-    eliminada = crud.eliminar_asignacion(asignacion_id)
+    crud = AsignacionTCRUDAsync(db)
+    eliminada = await crud.eliminar_asignacion(asignacion_id)
 
     if not eliminada:
         raise HTTPException(status_code=404, detail="Asignación no encontrada")
@@ -102,55 +112,55 @@ async def eliminar_asignacion(asignacion_id: UUID, db: Session = Depends(get_db)
 
 @router.get("/usuario/{usuario_id}", response_model=List[AsignacionTOut])
 async def obtener_asignaciones_por_usuario(
-    usuario_id: UUID, db: Session = Depends(get_db)
+    usuario_id: UUID, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener todas las asignaciones realizadas por un usuario específico.
 
     - **usuario_id**: ID del usuario
     """
-    crud = AsignacionTCRUD(db)
-    asignaciones = crud.obtener_por_usuario(usuario_id)
+    crud = AsignacionTCRUDAsync(db)
+    asignaciones = await crud.obtener_por_usuario(usuario_id)
 
     if not asignaciones:
         raise HTTPException(
             status_code=404, detail="No se encontraron asignaciones para este usuario"
         )
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "AsignacionT")
-    return asignaciones
+    return respuesta_lista(AsignacionTOut, asignaciones)
 
 
 @router.get("/empleado/{empleado_id}", response_model=List[AsignacionTOut])
 async def obtener_asignaciones_por_empleado(
-    empleado_id: UUID, db: Session = Depends(get_db)
+    empleado_id: UUID, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener todas las asignaciones de un empleado específico.
 
     - **empleado_id**: ID del empleado
     """
-    crud = AsignacionTCRUD(db)
-    asignaciones = crud.obtener_por_empleado(empleado_id)
+    crud = AsignacionTCRUDAsync(db)
+    asignaciones = await crud.obtener_por_empleado(empleado_id)
 
     if not asignaciones:
         raise HTTPException(
             status_code=404, detail="No se encontraron asignaciones para este empleado"
         )
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "AsignacionT")
-    return asignaciones
+    return respuesta_lista(AsignacionTOut, asignaciones)
 
 
 @router.get("/transporte/{transporte_id}", response_model=List[AsignacionTOut])
 async def obtener_asignaciones_por_transporte(
-    transporte_id: UUID, db: Session = Depends(get_db)
+    transporte_id: UUID, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener todas las asignaciones de un transporte específico.
 
     - **transporte_id**: ID del transporte
     """
-    crud = AsignacionTCRUD(db)
-    asignaciones = crud.obtener_por_transporte(transporte_id)
+    crud = AsignacionTCRUDAsync(db)
+    asignaciones = await crud.obtener_por_transporte(transporte_id)
 
     if not asignaciones:
         raise HTTPException(
@@ -158,20 +168,20 @@ async def obtener_asignaciones_por_transporte(
             detail="No se encontraron asignaciones para este transporte",
         )
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "AsignacionT")
-    return asignaciones
+    return respuesta_lista(AsignacionTOut, asignaciones)
 
 
 @router.get("/disponibilidad/empleado/{empleado_id}")
 async def verificar_disponibilidad_empleado(
-    empleado_id: UUID, db: Session = Depends(get_db)
+    empleado_id: UUID, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verificar si un empleado tiene asignaciones activas.
 
     - **empleado_id**: ID del empleado a verificar
     """
-    crud = AsignacionTCRUD(db)
-    asignaciones = crud.obtener_por_empleado(empleado_id)
+    crud = AsignacionTCRUDAsync(db)
+    asignaciones = await crud.obtener_por_empleado(empleado_id)
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "AsignacionT")
     return {
         "empleado_id": str(empleado_id),
@@ -182,15 +192,15 @@ async def verificar_disponibilidad_empleado(
 
 @router.get("/disponibilidad/transporte/{transporte_id}")
 async def verificar_disponibilidad_transporte(
-    transporte_id: UUID, db: Session = Depends(get_db)
+    transporte_id: UUID, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verificar si un transporte tiene asignaciones activas.
 
     - **transporte_id**: ID del transporte a verificar
     """
-    crud = AsignacionTCRUD(db)
-    asignaciones = crud.obtener_por_transporte(transporte_id)
+    crud = AsignacionTCRUDAsync(db)
+    asignaciones = await crud.obtener_por_transporte(transporte_id)
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "AsignacionT")
     return {
         "transporte_id": str(transporte_id),
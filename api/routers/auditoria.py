@@ -3,43 +3,143 @@ Router para manejar operaciones relacionadas con Auditoria.
 ===================================================
 
 Endpoints FastAPI para operaciones CRUD de la entidad usuario.
-Incluye leer las Auditorias.
+Incluye leer y exportar las Auditorias, y consultar los meses archivados.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import datetime
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.dependencies import get_db
+from api.dependencies import get_async_db
+from Crud.auditoria_archivo import archivo_de_mes, leer_archivo, meses_archivados
+from Crud.auditoria_cola import cola_auditoria
+from Crud.asincrono import AuditoriaCRUDAsync
 from Crud.auditoria_crud import AuditoriaCRUD
-from Entities.auditoria import Auditoria, AuditoriaOut
+from Crud.exportacion import consulta_auditoria, respuesta_exportacion
+from Entities.auditoria import AuditoriaPagina
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[AuditoriaOut])
+@router.get("/", response_model=AuditoriaPagina)
 async def listar_Auditoria(
-    db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0, description="Número de registros a saltar"),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = Query(
         100, ge=1, le=1000, description="Número máximo de registros a retornar"
     ),
+    cursor: str = Query(
+        None, description="Cursor devuelto en `siguiente_cursor` por la página anterior"
+    ),
     accion: str = Query(
         None,
         description="Filtrar por accion del Auditoria: CREATE, UPDATE, DELETE, READ",
     ),
+    tabla_afectada: str = Query(None, description="Filtrar por tabla afectada"),
+    id_usuario: UUID = Query(None, description="Filtrar por usuario"),
+    desde: datetime = Query(None, description="Fecha mínima (inclusive)"),
+    hasta: datetime = Query(None, description="Fecha máxima (inclusive)"),
 ):
     """
-    Obtener lista de todos los Auditoria.
+    Obtener las Auditorias de la más reciente a la más antigua, paginadas por cursor.
 
-    - **skip**: número de registros a saltar (para paginación)
     - **limit**: número máximo de registros a retornar
+    - **cursor**: cursor de la página siguiente (opcional)
     - **accion**: filtrar Auditoria por accion (opcional)
+    - **tabla_afectada**: filtrar por tabla afectada (opcional)
+    - **id_usuario**: filtrar por usuario (opcional)
+    - **desde** / **hasta**: rango de fechas (opcional)
+    """
+    crud = AuditoriaCRUDAsync(db)
+    try:
+        items, siguiente_cursor = await crud.obtener_pagina(
+            limit=limit,
+            cursor=cursor,
+            accion=accion,
+            tabla_afectada=tabla_afectada,
+            id_usuario=id_usuario,
+            desde=desde,
+            hasta=hasta,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "siguiente_cursor": siguiente_cursor}
+
+
+@router.get("/exportar")
+async def exportar_auditoria(
+    formato: str = Query(
+        "ndjson", pattern="^(ndjson|csv)$", description="Formato: ndjson o csv"
+    ),
+    accion: str = Query(None, description="Filtrar por accion del Auditoria"),
+    tabla_afectada: str = Query(None, description="Filtrar por tabla afectada"),
+    id_usuario: UUID = Query(None, description="Filtrar por usuario"),
+    desde: datetime = Query(None, description="Fecha mínima (inclusive)"),
+    hasta: datetime = Query(None, description="Fecha máxima (inclusive)"),
+):
     """
-    crud = AuditoriaCRUD(db)
-    Auditoria = crud.obtener_todas()
+    Exportar Auditorias en orden cronológico como NDJSON o CSV.
 
-    if accion:
-        Auditoria = [e for e in Auditoria if e.accion == accion]
+    Las filas se transmiten a medida que se leen de la base de datos,
+    así que el tamaño de la exportación no está limitado por la memoria.
 
-    return Auditoria[skip : skip + limit]
+    - **formato**: ndjson (un registro JSON por línea) o csv
+    - **accion** / **tabla_afectada** / **id_usuario**: filtros (opcionales)
+    - **desde** / **hasta**: rango de fechas (opcional)
+    """
+    AuditoriaCRUD.agregar_auditoria_usuario("EXPORT", "Auditoria")
+    return respuesta_exportacion(
+        consulta_auditoria(accion, tabla_afectada, id_usuario, desde, hasta),
+        formato,
+        "auditoria",
+    )
+
+
+@router.get("/archivo")
+async def listar_meses_archivados():
+    """
+    Listar los meses de auditoría archivados (ver `scripts/archivar_auditoria.py`).
+
+    Cada mes indica el formato, sus archivos y su tamaño comprimido.
+    """
+    return meses_archivados()
+
+
+@router.get("/archivo/{mes}")
+async def consultar_mes_archivado(
+    mes: str = Path(..., pattern=r"^\d{4}-\d{2}$", description="Mes AAAA-MM"),
+    accion: str = Query(None, description="Filtrar por accion del Auditoria"),
+    tabla_afectada: str = Query(None, description="Filtrar por tabla afectada"),
+    id_usuario: UUID = Query(None, description="Filtrar por usuario"),
+):
+    """
+    Consultar las Auditorias de un mes archivado, como NDJSON.
+
+    El archivo comprimido se lee y se filtra a medida que se transmite,
+    sin restaurarlo en la base de datos.
+
+    - **mes**: mes archivado (AAAA-MM)
+    - **accion** / **tabla_afectada** / **id_usuario**: filtros (opcionales)
+    """
+    archivo = archivo_de_mes(mes)
+    if archivo is None:
+        raise HTTPException(status_code=404, detail=f"El mes {mes} no está archivado")
+    AuditoriaCRUD.agregar_auditoria_usuario("READ_ARCHIVE", "Auditoria")
+    rutas, formato = archivo
+    return StreamingResponse(
+        leer_archivo(rutas, formato, accion, tabla_afectada, id_usuario),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/cola/estadisticas")
+async def estadisticas_cola_auditoria():
+    """
+    Consultar el estado de la cola de escritura de auditoría.
+
+    Incluye profundidad de la cola, eventos escritos y descartados,
+    y latencia de vaciado de los lotes.
+    """
+    return cola_auditoria.estadisticas()
@@ -9,25 +9,30 @@ Incluye crear, leer, actualizar y eliminar empleados.
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from Crud.auditoria_crud import AuditoriaCRUD
-from api.dependencies import get_db
-from Crud.empleado_crud import EmpleadoCRUD
+from api.dependencies import get_async_db
+from api.respuestas import respuesta_lista
+from Crud.asincrono import EmpleadoCRUDAsync
 from Entities.empleado import EmpleadoCreate, EmpleadoUpdate, EmpleadoOut
+from Entities.masivo import ResultadoMasivo
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[EmpleadoOut])
 async def listar_empleados(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(
         100, ge=1, le=1000, description="Número máximo de registros a retornar"
     ),
     rol: str = Query(None, description="Filtrar por rol del empleado"),
     estado: str = Query(None, description="Filtrar por estado (Activo, Inactivo)"),
+    orden: str = Query(
+        None, description="Campo de ordenamiento, prefijo '-' para descendente"
+    ),
 ):
     """
     Obtener lista de todos los empleados.
@@ -36,32 +41,28 @@ async def listar_empleados(
     - **limit**: número máximo de registros a retornar
     - **rol**: filtrar empleados por rol (opcional)
     - **estado**: filtrar empleados por estado (opcional)
+    - **orden**: campo de ordenamiento, ej. `nombre` o `-nombre` (opcional)
     """
-    crud = EmpleadoCRUD(db)
-    empleados = crud.listar_empleados()
-
-    if rol:
-        empleados = [e for e in empleados if e.rol == rol]
-
-    if estado:
-        empleados = [e for e in empleados if e.estado == estado]
+    crud = EmpleadoCRUDAsync(db)
+    try:
+        empleados = await crud.listar_empleados(
+            skip=skip, limit=limit, rol=rol, estado=estado, orden=orden
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Empleado")
-    return empleados[skip : skip + limit]
+    return respuesta_lista(EmpleadoOut, empleados)
 
 
 @router.get("/{empleado_id}", response_model=EmpleadoOut)
-async def obtener_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
+async def obtener_empleado(empleado_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """
     Obtener un empleado específico por su ID.
 
     - **empleado_id**: ID único del empleado
     """
-    crud = EmpleadoCRUD(db)
-    empleados = crud.listar_empleados()
-
-    empleado = next(
-        (e for e in empleados if str(e.id_empleado) == str(empleado_id)), None
-    )
+    crud = EmpleadoCRUDAsync(db)
+    empleado = await crud.consultar_por_id(empleado_id)
 
     if not empleado:
         raise HTTPException(status_code=404, detail="Empleado no encontrado")
@@ -70,7 +71,9 @@ async def obtener_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=EmpleadoOut, status_code=201)
-async def crear_empleado(empleado: EmpleadoCreate, db: Session = Depends(get_db)):
+async def crear_empleado(
+    empleado: EmpleadoCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Crear un nuevo empleado.
 
@@ -81,8 +84,8 @@ async def crear_empleado(empleado: EmpleadoCreate, db: Session = Depends(get_db)
     - **rol**: rol del empleado en el sistema
     """
     try:
-        crud = EmpleadoCRUD(db)
-        nuevo_empleado = crud.crear_empleado(empleado)
+        crud = EmpleadoCRUDAsync(db)
+        nuevo_empleado = await crud.crear_empleado(empleado)
         AuditoriaCRUD.agregar_auditoria_usuario("CREATE", "Empleado")
         return nuevo_empleado
     except Exception as e:
@@ -91,9 +94,32 @@ async def crear_empleado(empleado: EmpleadoCreate, db: Session = Depends(get_db)
         )
 
 
+@router.post("/bulk", response_model=ResultadoMasivo)
+async def crear_empleados_masivo(
+    empleados: List[EmpleadoCreate], db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crear un lote de empleados en una sola transacción.
+
+    Las filas válidas se insertan con INSERT multi-fila. Las que no se pueden
+    crear (documento o email ya registrados o repetidos en el lote) se
+    reportan en **errores** con su posición en el lote (**indice**) sin
+    afectar al resto.
+    """
+    crud = EmpleadoCRUDAsync(db)
+    try:
+        resultado = await crud.crear_empleados_masivo(empleados)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    AuditoriaCRUD.agregar_auditoria_usuario("BULK_CREATE", "Empleado")
+    return resultado
+
+
 @router.put("/{empleado_id}", response_model=EmpleadoOut)
 async def actualizar_empleado(
-    empleado_id: UUID, empleado_update: EmpleadoUpdate, db: Session = Depends(get_db)
+    empleado_id: UUID,
+    empleado_update: EmpleadoUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualizar un empleado existente.
@@ -102,8 +128,10 @@ async def actualizar_empleado(
     - Campos opcionales a actualizar: nombre, apellido, email, rol, estado
     """
     try:
-        crud = EmpleadoCRUD(db)
-        empleado_actualizado = crud.actualizar_empleado(empleado_id, empleado_update)
+        crud = EmpleadoCRUDAsync(db)
+        empleado_actualizado = await crud.actualizar_empleado(
+            empleado_id, empleado_update
+        )
         AuditoriaCRUD.agregar_auditoria_usuario("UPDATE", "Empleado")
         return empleado_actualizado
     except ValueError as e:
@@ -115,14 +143,16 @@ async def actualizar_empleado(
 
 
 @router.delete("/{empleado_id}")
-async def eliminar_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_empleado(
+    empleado_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Eliminar un empleado.
 
     - **empleado_id**: ID único del empleado a eliminar
     """
-    crud = EmpleadoCRUD(db)
-    eliminado = crud.eliminar_empleado(empleado_id)
+    crud = EmpleadoCRUDAsync(db)
+    eliminado = await crud.eliminar_empleado(empleado_id)
 
     if not eliminado:
         raise HTTPException(status_code=404, detail="Empleado no encontrado")
@@ -131,16 +161,16 @@ async def eliminar_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/documento/{documento}", response_model=EmpleadoOut)
-async def obtener_empleado_por_documento(documento: str, db: Session = Depends(get_db)):
+async def obtener_empleado_por_documento(
+    documento: str, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener un empleado por su documento de identidad.
 
     - **documento**: documento de identidad del empleado
     """
-    crud = EmpleadoCRUD(db)
-    empleados = crud.listar_empleados()
-
-    empleado = next((e for e in empleados if e.documento == documento), None)
+    crud = EmpleadoCRUDAsync(db)
+    empleado = await crud.consultar_por_documento(documento)
 
     if not empleado:
         raise HTTPException(
@@ -151,16 +181,16 @@ async def obtener_empleado_por_documento(documento: str, db: Session = Depends(g
 
 
 @router.get("/email/{email}", response_model=EmpleadoOut)
-async def obtener_empleado_por_email(email: str, db: Session = Depends(get_db)):
+async def obtener_empleado_por_email(
+    email: str, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener un empleado por su email.
 
     - **email**: correo electrónico del empleado
     """
-    crud = EmpleadoCRUD(db)
-    empleados = crud.listar_empleados()
-
-    empleado = next((e for e in empleados if e.email == email), None)
+    crud = EmpleadoCRUDAsync(db)
+    empleado = await crud.consultar_por_email(email)
 
     if not empleado:
         raise HTTPException(
@@ -171,15 +201,13 @@ async def obtener_empleado_por_email(email: str, db: Session = Depends(get_db)):
 
 
 @router.get("/rol/{rol}", response_model=List[EmpleadoOut])
-async def obtener_empleados_por_rol(rol: str, db: Session = Depends(get_db)):
+async def obtener_empleados_por_rol(rol: str, db: AsyncSession = Depends(get_async_db)):
     """
     Obtener todos los empleados con un rol específico.
 
     - **rol**: rol de los empleados a buscar
     """
-    crud = EmpleadoCRUD(db)
-    empleados = crud.listar_empleados()
-
-    empleados_filtrados = [e for e in empleados if e.rol == rol]
+    crud = EmpleadoCRUDAsync(db)
+    empleados_filtrados = await crud.listar_empleados(rol=rol)
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Empleado")
-    return empleados_filtrados
+    return respuesta_lista(EmpleadoOut, empleados_filtrados)
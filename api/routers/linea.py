@@ -3,13 +3,13 @@ Router de Linea
 ===================
 
 Endpoints FastAPI para operaciones CRUD de la entidad Linea.
-Incluye crear lineas.
+Incluye crear y eliminar lineas.
 """
 
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import (
     create_engine,
     Column,
@@ -20,26 +20,25 @@ from sqlalchemy import (
     select,
 )
 
-from api.dependencies import get_db, get_pagination_params
-from Crud.linea_crud import LineaCRUD
+from api.dependencies import get_async_db, get_pagination_params
+from Crud.asincrono import LineaCRUDAsync
 from Entities.linea import LineaCreate
 from Crud.auditoria_crud import AuditoriaCRUD
 
-
 router = APIRouter()
 
 
 @router.post("/", response_model=LineaCreate, status_code=201)
-async def crear_linea(linea: LineaCreate, db: Session = Depends(get_db)):
+async def crear_linea(linea: LineaCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Crear una nueva línea.
 
     - **nombre**: Nombre de la línea
     - **descripcion**: Descripción de la línea
     """
-    crud = LineaCRUD(db)
+    crud = LineaCRUDAsync(db)
     try:
-        nueva_linea = crud.registrar_linea(linea.nombre, linea.descripcion)
+        nueva_linea = await crud.registrar_linea(linea.nombre, linea.descripcion)
         AuditoriaCRUD.agregar_auditoria_usuario("CREATE", "Linea")
         return {
             "nombre": nueva_linea.nombre,
@@ -47,3 +46,22 @@ async def crear_linea(linea: LineaCreate, db: Session = Depends(get_db)):
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/{linea_id}")
+async def eliminar_linea(linea_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Eliminar una línea junto con sus rutas y las asignaciones de esas rutas.
+
+    - **linea_id**: ID único de la línea a eliminar
+    """
+    crud = LineaCRUDAsync(db)
+    try:
+        eliminada = await crud.eliminar_linea(linea_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not eliminada:
+        raise HTTPException(status_code=404, detail="Línea no encontrada")
+    AuditoriaCRUD.agregar_auditoria_usuario("DELETE", "Linea")
+    return {"message": "Línea eliminada correctamente"}
@@ -9,24 +9,29 @@ Incluye crear, leer, actualizar y eliminar paradas.
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from Crud.auditoria_crud import AuditoriaCRUD
-from api.dependencies import get_db
-from Crud.parada_crud import ParadaCRUD
+from api.dependencies import get_async_db
+from api.respuestas import respuesta_lista
+from Crud.asincrono import ParadaCRUDAsync
 from Entities.parada import ParadaCreate, ParadaUpdate, ParadaOut
+from Entities.masivo import ResultadoMasivo
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ParadaOut])
 async def listar_paradas(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(
         100, ge=1, le=1000, description="Número máximo de registros a retornar"
     ),
     estado: str = Query(None, description="Filtrar por estado (Activa, Inactiva)"),
+    orden: str = Query(
+        None, description="Campo de ordenamiento, prefijo '-' para descendente"
+    ),
 ):
     """
     Obtener lista de todas las paradas.
@@ -34,26 +39,28 @@ async def listar_paradas(
     - **skip**: número de registros a saltar (para paginación)
     - **limit**: número máximo de registros a retornar
     - **estado**: filtrar paradas por estado (opcional)
+    - **orden**: campo de ordenamiento, ej. `nombre` o `-nombre` (opcional)
     """
-    crud = ParadaCRUD(db)
-    paradas = crud.listar_paradas()
-
-    if estado:
-        paradas = [p for p in paradas if p.estado == estado]
+    crud = ParadaCRUDAsync(db)
+    try:
+        paradas = await crud.listar_paradas(
+            skip=skip, limit=limit, estado=estado, orden=orden
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Parada")
-    return paradas[skip : skip + limit]
+    return respuesta_lista(ParadaOut, paradas)
 
 
 @router.get("/{parada_id}", response_model=ParadaOut)
-async def obtener_parada(parada_id: UUID, db: Session = Depends(get_db)):
+async def obtener_parada(parada_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """
     Obtener una parada específica por su ID.
 
     - **parada_id**: ID único de la parada
     """
-    crud = ParadaCRUD(db)
-    paradas = crud.listar_paradas()
-    parada = next((p for p in paradas if str(p.id_parada) == str(parada_id)), None)
+    crud = ParadaCRUDAsync(db)
+    parada = await crud.consultar_por_id(parada_id)
 
     if not parada:
         raise HTTPException(status_code=404, detail="Parada no encontrada")
@@ -62,7 +69,7 @@ async def obtener_parada(parada_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=ParadaOut, status_code=201)
-async def crear_parada(parada: ParadaCreate, db: Session = Depends(get_db)):
+async def crear_parada(parada: ParadaCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Crear una nueva parada.
 
@@ -71,17 +78,40 @@ async def crear_parada(parada: ParadaCreate, db: Session = Depends(get_db)):
     - **coordenadas**: coordenadas GPS (opcional)
     """
     try:
-        crud = ParadaCRUD(db)
-        nueva_parada = crud.registrar_parada(parada)
+        crud = ParadaCRUDAsync(db)
+        nueva_parada = await crud.registrar_parada(parada)
         AuditoriaCRUD.agregar_auditoria_usuario("CREATE", "Parada")
         return nueva_parada
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error al crear parada: {str(e)}")
 
 
+@router.post("/bulk", response_model=ResultadoMasivo)
+async def crear_paradas_masivo(
+    paradas: List[ParadaCreate], db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crear un lote de paradas en una sola transacción.
+
+    Todas las filas se insertan con INSERT multi-fila: las paradas no tienen
+    campos únicos ni referencias que validar, así que **errores** siempre va
+    vacío. Solo se rechaza el lote completo (400) si está vacío o supera
+    `CARGA_MASIVA_MAX_FILAS`.
+    """
+    crud = ParadaCRUDAsync(db)
+    try:
+        resultado = await crud.registrar_paradas_masivo(paradas)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    AuditoriaCRUD.agregar_auditoria_usuario("BULK_CREATE", "Parada")
+    return resultado
+
+
 @router.put("/{parada_id}", response_model=ParadaOut)
 async def actualizar_parada(
-    parada_id: UUID, parada_update: ParadaUpdate, db: Session = Depends(get_db)
+    parada_id: UUID,
+    parada_update: ParadaUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualizar una parada existente.
@@ -90,8 +120,8 @@ async def actualizar_parada(
     - Campos opcionales a actualizar: nombre, dirección, coordenadas, estado
     """
     try:
-        crud = ParadaCRUD(db)
-        parada_actualizada = crud.modificar_parada(parada_id, parada_update)
+        crud = ParadaCRUDAsync(db)
+        parada_actualizada = await crud.modificar_parada(parada_id, parada_update)
         AuditoriaCRUD.agregar_auditoria_usuario("UPDATE", "Parada")
         return parada_actualizada
     except ValueError as e:
@@ -103,14 +133,14 @@ async def actualizar_parada(
 
 
 @router.delete("/{parada_id}")
-async def eliminar_parada(parada_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_parada(parada_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """
     Eliminar una parada.
 
     - **parada_id**: ID único de la parada a eliminar
     """
-    crud = ParadaCRUD(db)
-    eliminada = crud.eliminar_parada(parada_id)
+    crud = ParadaCRUDAsync(db)
+    eliminada = await crud.eliminar_parada(parada_id)
 
     if not eliminada:
         raise HTTPException(status_code=404, detail="Parada no encontrada")
@@ -119,30 +149,30 @@ async def eliminar_parada(parada_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/buscar/nombre/{nombre}", response_model=List[ParadaOut])
-async def buscar_paradas_por_nombre(nombre: str, db: Session = Depends(get_db)):
+async def buscar_paradas_por_nombre(
+    nombre: str, db: AsyncSession = Depends(get_async_db)
+):
     """
     Buscar paradas que contengan un nombre específico.
 
     - **nombre**: texto a buscar en el nombre de las paradas
     """
-    crud = ParadaCRUD(db)
-    paradas = crud.listar_paradas()
-
-    paradas_encontradas = [p for p in paradas if nombre.lower() in p.nombre.lower()]
+    crud = ParadaCRUDAsync(db)
+    paradas_encontradas = await crud.buscar_por_nombre(nombre)
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Parada")
-    return paradas_encontradas
+    return respuesta_lista(ParadaOut, paradas_encontradas)
 
 
 @router.get("/estado/{estado}", response_model=List[ParadaOut])
-async def obtener_paradas_por_estado(estado: str, db: Session = Depends(get_db)):
+async def obtener_paradas_por_estado(
+    estado: str, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener todas las paradas con un estado específico.
 
     - **estado**: estado de las paradas (Activa, Inactiva)
     """
-    crud = ParadaCRUD(db)
-    paradas = crud.listar_paradas()
-
-    paradas_filtradas = [p for p in paradas if p.estado == estado]
+    crud = ParadaCRUDAsync(db)
+    paradas_filtradas = await crud.listar_paradas(estado=estado)
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Parada")
-    return paradas_filtradas
+    return respuesta_lista(ParadaOut, paradas_filtradas)
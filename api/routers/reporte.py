@@ -0,0 +1,53 @@
+"""
+Router de Reportes
+==================
+
+Endpoints FastAPI para los reportes financieros de transacciones.
+Los totales se leen del resumen diario, no de la tabla de transacciones.
+"""
+
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependencies import get_async_db
+from Crud.asincrono import ReporteCRUDAsync
+from Crud.auditoria_crud import AuditoriaCRUD
+from Entities.resumen import ReporteDiario
+
+router = APIRouter()
+
+
+@router.get("/transacciones/diario", response_model=ReporteDiario)
+async def reporte_diario(
+    desde: date = Query(..., description="Primer día (inclusive)"),
+    hasta: date = Query(..., description="Último día (inclusive)"),
+    tipo_transaccion: str = Query(
+        None, description="Filtrar por tipo de transacción: Recarga, Pago"
+    ),
+    tipo_tarjeta: str = Query(None, description="Filtrar por tipo de tarjeta"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Totales diarios de transacciones por tipo de transacción y tipo de tarjeta.
+
+    - **desde** / **hasta**: rango de días (inclusive)
+    - **tipo_transaccion**: tipo de transacción (opcional)
+    - **tipo_tarjeta**: tipo de tarjeta (opcional)
+    """
+    if desde > hasta:
+        raise HTTPException(
+            status_code=400, detail="La fecha 'desde' no puede ser posterior a 'hasta'"
+        )
+
+    crud = ReporteCRUDAsync(db)
+    filas = await crud.resumen_diario(
+        desde, hasta, tipo_transaccion=tipo_transaccion, tipo_tarjeta=tipo_tarjeta
+    )
+    AuditoriaCRUD.agregar_auditoria_usuario("READ", "Reporte")
+    return {
+        "items": filas,
+        "cantidad": sum(fila.cantidad for fila in filas),
+        "total": sum(fila.total for fila in filas),
+    }
@@ -9,7 +9,7 @@ Incluye consultar transacciones.
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import (
     create_engine,
     Column,
@@ -20,8 +20,8 @@ from sqlalchemy import (
     select,
 )
 
-from api.dependencies import get_db, get_pagination_params
-from Crud.ruta_crud import RutaCRUD
+from api.dependencies import get_async_db, get_pagination_params
+from Crud.asincrono import RutaCRUDAsync
 from Entities.ruta import RutaCreate, RutaUpdate
 from Crud.auditoria_crud import AuditoriaCRUD
 
@@ -29,7 +29,7 @@ router = APIRouter()
 
 
 @router.post("/", response_model=RutaCreate, status_code=201)
-async def crear_ruta(ruta: RutaCreate, db: Session = Depends(get_db)):
+async def crear_ruta(ruta: RutaCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Crear una nueva ruta.
 
@@ -39,9 +39,9 @@ async def crear_ruta(ruta: RutaCreate, db: Session = Depends(get_db)):
     - **duracion_estimada**: Duración estimada del viaje en minutos
     - **id_linea**: ID de la línea asociada a la ruta
     """
-    crud = RutaCRUD(db)
+    crud = RutaCRUDAsync(db)
     try:
-        nueva_ruta = crud.registrar_ruta(
+        nueva_ruta = await crud.registrar_ruta(
             nombre_ruta=ruta.nombre,
             origen=ruta.origen,
             destino=ruta.destino,
@@ -61,7 +61,7 @@ async def crear_ruta(ruta: RutaCreate, db: Session = Depends(get_db)):
 
 
 @router.put("/", response_model=RutaUpdate, status_code=200)
-async def actualizar_ruta(ruta: RutaUpdate, db: Session = Depends(get_db)):
+async def actualizar_ruta(ruta: RutaUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Actualizar una ruta existente.
 
@@ -71,9 +71,9 @@ async def actualizar_ruta(ruta: RutaUpdate, db: Session = Depends(get_db)):
     - **destino**: Nuevo punto de destino de la ruta
     - **duracion_estimada**: Nueva duración estimada del viaje en minutos
     """
-    crud = RutaCRUD(db)
+    crud = RutaCRUDAsync(db)
     try:
-        crud.modificar_ruta(
+        await crud.modificar_ruta(
             id_ruta=ruta.id_ruta,
             nombre_ruta=ruta.nombre,
             origen=ruta.origen,
@@ -9,7 +9,7 @@ Incluye crear, consultar, recargar@.
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import (
     create_engine,
     Column,
@@ -21,15 +21,16 @@ from sqlalchemy import (
 )
 from Entities import usuario
 
-from api.dependencies import get_db, get_pagination_params
+from api.dependencies import get_async_db, get_pagination_params
 from Crud.auditoria_crud import AuditoriaCRUD
-from Crud.tarjeta_crud import TarjetaCRUD
+from Crud.asincrono import TarjetaCRUDAsync
 from Entities.tarjeta import (
     TarjetaCreate,
     TarjetaUpdate,
     Tarjeta,
     TarjetaOut,
     TarjetaOutSaldo,
+    TarjetaValidacion,
 )
 from Crud.transacciones_crud import TransaccionCRUD
 
@@ -37,70 +38,83 @@ router = APIRouter()
 
 
 @router.get("/{documento}")
-async def consultar_saldo(documento: str, db: Session = Depends(get_db)):
+async def consultar_saldo(documento: str, db: AsyncSession = Depends(get_async_db)):
     """
     Consultar el saldo de una tarjeta por el documento del usuario.
     - **documento**: Documento del usuario asociado a la tarjeta
     """
 
-    crud = TarjetaCRUD(db)
-    saldo = crud.obtener_saldo(documento)
+    crud = TarjetaCRUDAsync(db)
+    saldo = await crud.obtener_saldo(documento)
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Tarjeta")
 
     return {"saldo": saldo}
 
 
 @router.put("/", response_model=TarjetaOutSaldo, status_code=201)
-async def recargar_tarjeta(tarjeta: TarjetaUpdate, db: Session = Depends(get_db)):
+async def recargar_tarjeta(
+    tarjeta: TarjetaUpdate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Recargar saldo a una tarjeta existente.
 
     - **id_usuario**: ID del usuario al que pertenece la tarjeta
     - **monto**: Monto a recargar
     """
-    crud = TarjetaCRUD(db)
+    crud = TarjetaCRUDAsync(db)
     try:
-        tarjeta_recargada = crud.recargar_tarjeta(tarjeta.documento, tarjeta.saldo)
+        tarjeta_recargada = await crud.recargar_tarjeta(
+            tarjeta.documento, tarjeta.saldo
+        )
 
         AuditoriaCRUD.agregar_auditoria_usuario("UPDATE", "Tarjeta")
 
         return TarjetaOutSaldo(
             documento=tarjeta.documento,
-            saldo=tarjeta_recargada.saldo,
+            saldo=tarjeta_recargada["saldo"],
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post("/{numero_tarjeta}/validar", response_model=TarjetaValidacion)
+async def validar_tarjeta(
+    numero_tarjeta: str, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Cobrar un pasaje con la tarjeta (validación en el torniquete).
+
+    Verifica que la tarjeta esté activa, descuenta la tarifa y registra la
+    transacción en una sola operación atómica.
+
+    - **numero_tarjeta**: Número de la tarjeta
+    """
+    crud = TarjetaCRUDAsync(db)
+    try:
+        movimiento = await crud.validar_tarjeta(numero_tarjeta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if movimiento is None:
+        raise HTTPException(status_code=404, detail="Tarjeta no encontrada")
+    AuditoriaCRUD.agregar_auditoria_usuario("UPDATE", "Tarjeta")
+    return movimiento
+
+
 @router.post("/", response_model=TarjetaOut, status_code=201)
-async def crear_tarjeta(tarjeta: TarjetaCreate, db: Session = Depends(get_db)):
+async def crear_tarjeta(
+    tarjeta: TarjetaCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Crear una nueva tarjeta para un usuario.
     - **documento**: Documento del usuario asociado a la tarjeta
     - **tipo_tarjeta**: Tipo de tarjeta (Estudiante, Normal, Frecuente)
     - **estado**: Estado inicial de la tarjeta (Activa, Inactiva)
     """
-    crud = TarjetaCRUD(db)
+    crud = TarjetaCRUDAsync(db)
     try:
-        id_usuario_obj = db.execute(
-            select(usuario.Usuario).where(
-                usuario.Usuario.documento == tarjeta.documento
-            )
-        ).scalar_one_or_none()
-
-        if not id_usuario_obj:
-            raise ValueError("Usuario no encontrado con el documento proporcionado.")
-
-        id_usuario = id_usuario_obj.id_usuario
-
-        tarjeta_existente = db.query(Tarjeta).filter_by(id_usuario=id_usuario).first()
-        if tarjeta_existente:
-            raise ValueError(
-                "El usuario ya tiene una tarjeta registrada. No se puede crear otra."
-            )
-
-        nueva_tarjeta = crud.registrar_tarjeta(
-            id_usuario, tarjeta.tipo_tarjeta, tarjeta.estado, tarjeta.saldo
+        nueva_tarjeta = await crud.crear_tarjeta_por_documento(
+            tarjeta.documento, tarjeta.tipo_tarjeta, tarjeta.estado, tarjeta.saldo
         )
         AuditoriaCRUD.agregar_auditoria_usuario("CREATE", "Tarjeta")
         return TarjetaOut(
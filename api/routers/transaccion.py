@@ -3,13 +3,14 @@ Router de Transacciones
 ===================
 
 Endpoints FastAPI para operaciones CRUD de la entidad Transacciones.
-Incluye consultar transacciones.
+Incluye consultar y exportar transacciones.
 """
 
+from datetime import datetime
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import (
     create_engine,
     Column,
@@ -20,24 +21,84 @@ from sqlalchemy import (
     select,
 )
 from Entities import usuario
-from api.dependencies import get_db, get_pagination_params
-from Crud.transacciones_crud import TransaccionCRUD
-from Entities.transaccion import Transaccion, TransaccionOut
+from api.dependencies import get_async_db, get_pagination_params
+from Crud.asincrono import TransaccionCRUDAsync
+from Entities.transaccion import Transaccion, TransaccionOut, TransaccionPagina
 from Crud.auditoria_crud import AuditoriaCRUD
+from Crud.exportacion import consulta_transacciones, respuesta_exportacion
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[TransaccionOut])
-async def consultar_transacciones(documento: str, db: Session = Depends(get_db)):
+@router.get("/", response_model=TransaccionPagina)
+async def consultar_transacciones(
+    documento: str,
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Número máximo de registros a retornar"
+    ),
+    cursor: str = Query(
+        None, description="Cursor devuelto en `siguiente_cursor` por la página anterior"
+    ),
+    desde: datetime = Query(None, description="Fecha mínima (inclusive)"),
+    hasta: datetime = Query(None, description="Fecha máxima (inclusive)"),
+    tipo: str = Query(None, description="Filtrar por tipo: Recarga, Pago"),
+):
     """
-    Consultar las transacciones de una tarjeta por el documento del usuario.
+    Consultar el historial de transacciones de la tarjeta de un usuario,
+    de la más reciente a la más antigua, paginado por cursor.
+
     - **documento**: Documento del usuario asociado a la tarjeta
+    - **limit**: número máximo de registros a retornar
+    - **cursor**: cursor de la página siguiente (opcional)
+    - **desde** / **hasta**: rango de fechas (opcional)
+    - **tipo**: tipo de transacción (opcional)
     """
 
-    crud = TransaccionCRUD(db)
-    transacciones = crud.obtener_transacciones(documento)
-    if not transacciones:
-        raise HTTPException(status_code=404, detail="No se encontraron transacciones")
+    crud = TransaccionCRUDAsync(db)
+    try:
+        pagina = await crud.obtener_pagina(
+            documento,
+            limit=limit,
+            cursor=cursor,
+            desde=desde,
+            hasta=hasta,
+            tipo=tipo,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if pagina is None:
+        raise HTTPException(
+            status_code=404, detail="El usuario no tiene una tarjeta registrada"
+        )
+    items, siguiente_cursor = pagina
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Transaccion")
-    return transacciones
+    return {"items": items, "siguiente_cursor": siguiente_cursor}
+
+
+@router.get("/exportar")
+async def exportar_transacciones(
+    formato: str = Query(
+        "ndjson", pattern="^(ndjson|csv)$", description="Formato: ndjson o csv"
+    ),
+    documento: str = Query(None, description="Documento del usuario (opcional)"),
+    desde: datetime = Query(None, description="Fecha mínima (inclusive)"),
+    hasta: datetime = Query(None, description="Fecha máxima (inclusive)"),
+    tipo: str = Query(None, description="Filtrar por tipo: Recarga, Pago"),
+):
+    """
+    Exportar transacciones en orden cronológico como NDJSON o CSV.
+
+    Las filas se transmiten a medida que se leen de la base de datos,
+    así que el tamaño de la exportación no está limitado por la memoria.
+
+    - **formato**: ndjson (una transacción JSON por línea) o csv
+    - **documento**: solo las transacciones de la tarjeta de este usuario (opcional)
+    - **desde** / **hasta**: rango de fechas (opcional)
+    - **tipo**: tipo de transacción (opcional)
+    """
+    AuditoriaCRUD.agregar_auditoria_usuario("EXPORT", "Transaccion")
+    return respuesta_exportacion(
+        consulta_transacciones(documento, desde, hasta, tipo), formato, "transacciones"
+    )
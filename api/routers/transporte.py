@@ -9,49 +9,60 @@ Incluye crear, leer, actualizar y eliminar transportes.
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from Crud.auditoria_crud import AuditoriaCRUD
-from api.dependencies import get_db, get_pagination_params
-from Crud.transporte_crud import TransporteCRUD
+from api.dependencies import get_async_db, get_pagination_params
+from api.respuestas import respuesta_lista
+from Crud.asincrono import TransporteCRUDAsync
 from Entities.transporte import TransporteCreate, TransporteUpdate, TransporteOut
+from Entities.masivo import ResultadoMasivo
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[TransporteOut])
 async def listar_transportes(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(
         100, ge=1, le=1000, description="Número máximo de registros a retornar"
     ),
+    estado: str = Query(None, description="Filtrar por estado (Activo, Inactivo)"),
+    orden: str = Query(
+        None, description="Campo de ordenamiento, prefijo '-' para descendente"
+    ),
 ):
     """
     Obtener lista de todos los transportes.
 
     - **skip**: número de registros a saltar (para paginación)
     - **limit**: número máximo de registros a retornar
+    - **estado**: filtrar transportes por estado (opcional)
+    - **orden**: campo de ordenamiento, ej. `placa` o `-capacidad` (opcional)
     """
-    crud = TransporteCRUD(db)
-    transportes = crud.listar_transportes()
+    crud = TransporteCRUDAsync(db)
+    try:
+        transportes = await crud.listar_transportes(
+            skip=skip, limit=limit, estado=estado, orden=orden
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Transporte")
-    return transportes[skip : skip + limit]
+    return respuesta_lista(TransporteOut, transportes)
 
 
 @router.get("/{transporte_id}", response_model=TransporteOut)
-async def obtener_transporte(transporte_id: UUID, db: Session = Depends(get_db)):
+async def obtener_transporte(
+    transporte_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener un transporte específico por su ID.
 
     - **transporte_id**: ID único del transporte
     """
-    crud = TransporteCRUD(db)
-    transportes = crud.listar_transportes()
-
-    transporte = next(
-        (t for t in transportes if t.id_transporte == transporte_id), None
-    )
+    crud = TransporteCRUDAsync(db)
+    transporte = await crud.consultar_por_id(transporte_id)
 
     if not transporte:
         raise HTTPException(status_code=404, detail="Transporte no encontrado")
@@ -60,7 +71,9 @@ async def obtener_transporte(transporte_id: UUID, db: Session = Depends(get_db))
 
 
 @router.post("/", response_model=TransporteOut, status_code=201)
-async def crear_transporte(transporte: TransporteCreate, db: Session = Depends(get_db)):
+async def crear_transporte(
+    transporte: TransporteCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Crear un nuevo transporte.
 
@@ -70,8 +83,8 @@ async def crear_transporte(transporte: TransporteCreate, db: Session = Depends(g
     - **id_linea**: ID de la línea a la que pertenece
     """
     try:
-        crud = TransporteCRUD(db)
-        nuevo_transporte = crud.registrar_transporte(transporte)
+        crud = TransporteCRUDAsync(db)
+        nuevo_transporte = await crud.registrar_transporte(transporte)
         AuditoriaCRUD.agregar_auditoria_usuario("CREATE", "Transporte")
         return nuevo_transporte
     except Exception as e:
@@ -80,11 +93,32 @@ async def crear_transporte(transporte: TransporteCreate, db: Session = Depends(g
         )
 
 
+@router.post("/bulk", response_model=ResultadoMasivo)
+async def crear_transportes_masivo(
+    transportes: List[TransporteCreate], db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crear un lote de transportes en una sola transacción.
+
+    Las filas válidas se insertan con INSERT multi-fila. Las que no se pueden
+    crear (placa ya registrada o repetida en el lote, línea inexistente) se
+    reportan en **errores** con su posición en el lote (**indice**) sin
+    afectar al resto.
+    """
+    crud = TransporteCRUDAsync(db)
+    try:
+        resultado = await crud.registrar_transportes_masivo(transportes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    AuditoriaCRUD.agregar_auditoria_usuario("BULK_CREATE", "Transporte")
+    return resultado
+
+
 @router.put("/{transporte_id}", response_model=TransporteOut)
 async def actualizar_transporte(
     transporte_id: UUID,
     transporte_update: TransporteUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualizar un transporte existente.
@@ -93,8 +127,8 @@ async def actualizar_transporte(
     - Campos opcionales a actualizar: tipo, placa, capacidad, estado, id_linea
     """
     try:
-        crud = TransporteCRUD(db)
-        transporte_actualizado = crud.modificar_transporte(
+        crud = TransporteCRUDAsync(db)
+        transporte_actualizado = await crud.modificar_transporte(
             transporte_id, transporte_update
         )
         AuditoriaCRUD.agregar_auditoria_usuario("UPDATE", "Transporte")
@@ -108,14 +142,16 @@ async def actualizar_transporte(
 
 
 @router.delete("/{transporte_id}")
-async def eliminar_transporte(transporte_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_transporte(
+    transporte_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Eliminar un transporte.
 
     - **transporte_id**: ID único del transporte a eliminar
     """
-    crud = TransporteCRUD(db)
-    eliminado = crud.eliminar_transporte(transporte_id)
+    crud = TransporteCRUDAsync(db)
+    eliminado = await crud.eliminar_transporte(transporte_id)
 
     if not eliminado:
         raise HTTPException(status_code=404, detail="Transporte no encontrado")
@@ -124,16 +160,16 @@ async def eliminar_transporte(transporte_id: UUID, db: Session = Depends(get_db)
 
 
 @router.get("/placa/{placa}", response_model=TransporteOut)
-async def obtener_transporte_por_placa(placa: str, db: Session = Depends(get_db)):
+async def obtener_transporte_por_placa(
+    placa: str, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener un transporte por su placa.
 
     - **placa**: placa del vehículo
     """
-    crud = TransporteCRUD(db)
-    transportes = crud.listar_transportes()
-
-    transporte = next((t for t in transportes if t.placa == placa), None)
+    crud = TransporteCRUDAsync(db)
+    transporte = await crud.consultar_por_placa(placa)
 
     if not transporte:
         raise HTTPException(
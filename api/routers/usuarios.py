@@ -9,19 +9,22 @@ Incluye crear, leer, actualizar y eliminar usuarios.
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from Crud.auditoria_crud import AuditoriaCRUD
-from api.dependencies import get_db
-from Crud.usuario_crud import UsuarioCRUD
-from Entities.usuario import UsuarioCreate, UsuarioUpdate, UsuarioOut
+from api.dependencies import get_async_db
+from api.respuestas import respuesta_lista
+from Crud.asincrono import UsuarioCRUDAsync
+from Crud.seguridad import pool_hashing
+from Entities.usuario import UsuarioCreate, UsuarioLogin, UsuarioUpdate, UsuarioOut
+from Entities.masivo import ResultadoEliminacionMasiva, ResultadoMasivo
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[UsuarioOut])
 async def listar_usuarios(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(
         100, ge=1, le=1000, description="Número máximo de registros a retornar"
@@ -29,6 +32,9 @@ async def listar_usuarios(
     rol: int = Query(
         None, description="Filtrar por rol del usuario, 1: admin, 2: cliente"
     ),
+    orden: str = Query(
+        None, description="Campo de ordenamiento, prefijo '-' para descendente"
+    ),
 ):
     """
     Obtener lista de todos los usuarios.
@@ -36,45 +42,54 @@ async def listar_usuarios(
     - **skip**: número de registros a saltar (para paginación)
     - **limit**: número máximo de registros a retornar
     - **rol**: filtrar usuarios por rol (opcional)
+    - **orden**: campo de ordenamiento, ej. `apellido` o `-fecha_registro` (opcional)
     """
-    crud = UsuarioCRUD(db)
-    usuarios = crud.listar_usuarios()
-
-    if rol:
-        usuarios = [e for e in usuarios if e.id_rol == rol]
+    crud = UsuarioCRUDAsync(db)
+    try:
+        usuarios = await crud.listar_usuarios(
+            skip=skip, limit=limit, id_rol=rol or None, orden=orden
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Usuario")
-    return usuarios[skip : skip + limit]
+    return respuesta_lista(UsuarioOut, usuarios)
+
+
+@router.get("/hashing/estadisticas")
+async def estadisticas_hashing():
+    """
+    Estado del pool de procesos de bcrypt: operaciones en curso y tiempos de espera.
+    """
+    return pool_hashing.estadisticas()
 
 
 @router.get("/{usuario_id}", response_model=UsuarioOut)
-async def obtener_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
+async def obtener_usuario(usuario_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """
     Obtener un usuario específico por su ID.
 
     - **usuario_id**: ID único del usuario
     """
-    crud = UsuarioCRUD(db)
-    usuarios = crud.listar_usuarios()
+    crud = UsuarioCRUDAsync(db)
+    usuario = await crud.consultar_por_id(usuario_id)
 
-    usuarios = next((e for e in usuarios if str(e.id_usuario) == str(usuario_id)), None)
-
-    if not usuarios:
+    if not usuario:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     AuditoriaCRUD.agregar_auditoria_usuario("READ", "Usuario")
-    return usuarios
+    return usuario
 
 
 @router.get("/documento/{documento}", response_model=UsuarioOut)
-async def obtener_usuario_por_documento(documento: str, db: Session = Depends(get_db)):
+async def obtener_usuario_por_documento(
+    documento: str, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener un usuario por su documento de identidad.
 
     - **documento**: documento de identidad del usuario
     """
-    crud = UsuarioCRUD(db)
-    usuarios = crud.listar_usuarios()
-
-    usuario = next((e for e in usuarios if e.documento == documento), None)
+    crud = UsuarioCRUDAsync(db)
+    usuario = await crud.consultar_por_documento(documento)
 
     if not usuario:
         raise HTTPException(
@@ -85,16 +100,16 @@ async def obtener_usuario_por_documento(documento: str, db: Session = Depends(ge
 
 
 @router.get("/email/{email}", response_model=UsuarioOut)
-async def obtener_usuario_por_email(email: str, db: Session = Depends(get_db)):
+async def obtener_usuario_por_email(
+    email: str, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener un usuario por su email.
 
     - **email**: correo electrónico del usuario
     """
-    crud = UsuarioCRUD(db)
-    usuarios = crud.listar_usuarios()
-
-    usuario = next((e for e in usuarios if e.email == email), None)
+    crud = UsuarioCRUDAsync(db)
+    usuario = await crud.consultar_por_email(email)
 
     if not usuario:
         raise HTTPException(
@@ -105,7 +120,9 @@ async def obtener_usuario_por_email(email: str, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=UsuarioOut, status_code=201)
-async def crear_usuario(usuario: UsuarioCreate, db: Session = Depends(get_db)):
+async def crear_usuario(
+    usuario: UsuarioCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Crear un nuevo usuario.
 
@@ -116,17 +133,90 @@ async def crear_usuario(usuario: UsuarioCreate, db: Session = Depends(get_db)):
     - **rol**: rol del usuario en el sistema
     """
     try:
-        crud = UsuarioCRUD(db)
-        nuevo_usuario = crud.crear_usuario(usuario)
+        crud = UsuarioCRUDAsync(db)
+        await crud.validar_usuario(usuario)
+        contrasena_hash = await pool_hashing.hash(usuario.contrasena)
+        nuevo_usuario = await crud.crear_usuario(usuario, contrasena_hash)
         AuditoriaCRUD.agregar_auditoria_usuario("CREATE", "Usuario")
         return nuevo_usuario
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error al crear usuario: {str(e)}")
 
 
+@router.post("/bulk", response_model=ResultadoMasivo)
+async def crear_usuarios_masivo(
+    usuarios: List[UsuarioCreate], db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crear un lote de usuarios en una sola transacción.
+
+    Los hashes bcrypt de las filas válidas se calculan en paralelo en el pool
+    de procesos; luego se insertan con INSERT multi-fila. Las filas que no se
+    pueden crear (documento o email ya registrados o repetidos en el lote,
+    rol inexistente) se reportan en **errores** con su posición en el lote
+    (**indice**) sin afectar al resto.
+    """
+    crud = UsuarioCRUDAsync(db)
+    try:
+        validas = await crud.validar_usuarios_masivo(usuarios)
+        hashes = await pool_hashing.hash_lote(
+            [usuarios[indice].contrasena for indice in validas]
+        )
+        resultado = await crud.crear_usuarios_masivo(
+            usuarios, dict(zip(validas, hashes))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    AuditoriaCRUD.agregar_auditoria_usuario("BULK_CREATE", "Usuario")
+    return resultado
+
+
+@router.post("/bulk/eliminar", response_model=ResultadoEliminacionMasiva)
+async def eliminar_usuarios_masivo(
+    usuario_ids: List[UUID], db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Eliminar un lote de usuarios en una sola transacción.
+
+    Junto con cada usuario se eliminan sus tarjetas, transacciones,
+    asignaciones y registros de auditoría, con un DELETE por tabla. Los IDs
+    que no existen se reportan en **no_encontrados** sin afectar al resto.
+    """
+    crud = UsuarioCRUDAsync(db)
+    try:
+        resultado = await crud.eliminar_usuarios(usuario_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    AuditoriaCRUD.agregar_auditoria_usuario("BULK_DELETE", "Usuario")
+    return resultado
+
+
+@router.post("/login", response_model=UsuarioOut)
+async def login(credenciales: UsuarioLogin, db: AsyncSession = Depends(get_async_db)):
+    """
+    Validar las credenciales de un usuario.
+
+    Sigue las reglas de `UsuarioCRUD.validar_credenciales`, pero la
+    verificación bcrypt se ejecuta en el pool de procesos.
+
+    - **email**: correo electrónico del usuario
+    - **contrasena**: contraseña del usuario
+    """
+    crud = UsuarioCRUDAsync(db)
+    usuario = await crud.obtener_por_email(credenciales.email)
+    if not usuario or not await pool_hashing.verificar(
+        credenciales.contrasena, usuario.contrasena
+    ):
+        raise HTTPException(status_code=401, detail="Credenciales inválidas")
+    AuditoriaCRUD.agregar_auditoria_usuario("LOGIN", "Usuario")
+    return usuario
+
+
 @router.put("/{usuario_id}", response_model=UsuarioOut)
 async def actualizar_usuario(
-    usuario_id: UUID, usuario_update: UsuarioUpdate, db: Session = Depends(get_db)
+    usuario_id: UUID,
+    usuario_update: UsuarioUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualizar un usuario existente.
@@ -135,8 +225,8 @@ async def actualizar_usuario(
     - Campos opcionales a actualizar: nombre, apellido, email, rol, estado
     """
     try:
-        crud = UsuarioCRUD(db)
-        usuario_actualizado = crud.actualizar_usuario(usuario_id, usuario_update)
+        crud = UsuarioCRUDAsync(db)
+        usuario_actualizado = await crud.actualizar_usuario(usuario_id, usuario_update)
         AuditoriaCRUD.agregar_auditoria_usuario("UPDATE", "Usuario")
         return usuario_actualizado
     except ValueError as e:
@@ -148,16 +238,16 @@ async def actualizar_usuario(
 
 
 @router.delete("/{usuario_id}")
-async def eliminar_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_usuario(usuario_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """
     Eliminar un usuario.
 
     - **usuario_id**: ID único del usuario a eliminar
     """
-    crud = UsuarioCRUD(db)
-    eliminado = crud.eliminar_usuario(usuario_id)
-
-    if not eliminado:
+    crud = UsuarioCRUDAsync(db)
+    try:
+        await crud.eliminar_usuario(usuario_id)
+    except ValueError:
         raise HTTPException(status_code=404, detail="usuario no encontrado")
     AuditoriaCRUD.agregar_auditoria_usuario("DELETE", "Usuario")
     return {"message": "usuario eliminado correctamente"}
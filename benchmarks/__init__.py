@@ -0,0 +1,7 @@
+"""
+Benchmarks del Sistema de Transporte Público
+============================================
+
+Scripts para medir la latencia de las operaciones CRUD y de los endpoints
+de la API a distintos tamaños de tabla.
+"""
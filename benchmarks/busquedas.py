@@ -0,0 +1,77 @@
+"""
+Benchmark de búsquedas por ID
+=============================
+
+Mide la latencia de los endpoints GET por ID a distintos tamaños de tabla.
+Cada petición pide una fila al azar de las sembradas; con la búsqueda por
+llave primaria la latencia debe mantenerse constante aunque la tabla crezca.
+
+Uso:
+    python -m benchmarks.busquedas --tamanos 1000 100000 1000000
+"""
+
+import argparse
+import random
+
+from benchmarks.comun import (
+    id_determinista,
+    imprimir_tabla,
+    medir,
+    preparar_base,
+    sembrar_hasta,
+)
+from Entities.asignacionT import AsignacionT
+from Entities.empleado import Empleado
+from Entities.parada import Parada
+from Entities.transporte import Transporte
+from Entities.usuario import Usuario
+
+CASOS = [
+    ("usuarios", "/api/usuarios/{}", Usuario),
+    ("empleados", "/api/empleados/{}", Empleado),
+    ("paradas", "/api/paradas/{}", Parada),
+    ("transportes", "/api/transportes/{}", Transporte),
+    ("asignaciones", "/api/asignaciones/{}", AsignacionT),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--reiniciar", action="store_true")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    preparar_base(reiniciar=args.reiniciar)
+    azar = random.Random(0)
+    resultados = []
+    with TestClient(app) as cliente:
+        for tamano in sorted(args.tamanos):
+            for _, _, modelo in CASOS:
+                sembrar_hasta(modelo, tamano)
+            for nombre, url, modelo in CASOS:
+
+                def peticion():
+                    id_fila = id_determinista(modelo, azar.randrange(tamano))
+                    respuesta = cliente.get(url.format(id_fila))
+                    assert respuesta.status_code == 200, respuesta.text
+
+                resultados.append(
+                    {
+                        "ruta": nombre,
+                        "filas": tamano,
+                        **medir(peticion, args.repeticiones),
+                    }
+                )
+
+    resultados.sort(key=lambda r: (r["ruta"], r["filas"]))
+    imprimir_tabla(resultados, ["ruta", "filas", "p50_ms", "p95_ms", "min_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Utilidades comunes de los benchmarks
+====================================
+
+Preparación de la base de datos, sembrado masivo de registros y medición
+de tiempos. Si no se define DATABASE_URL se usa un archivo SQLite temporal.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "benchmark_transporte.db"),
+)
+
+from sqlalchemy import func, insert, select
+
+import Entities  # noqa: F401  (registra todos los modelos)
+from database.config import Base, SessionLocal, engine
+from Entities.asignacionT import AsignacionT
+from Entities.empleado import Empleado
+from Entities.linea import Linea
+from Entities.parada import Parada
+from Entities.roles import Rol
+from Entities.ruta import Ruta
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion
+from Entities.transporte import Transporte
+from Entities.usuario import Usuario
+
+ID_USUARIO_AUDITORIA = uuid.UUID("7d1a4c4c-7427-4ea0-b377-2f9d5e20fbf8")
+ID_LINEA = uuid.UUID("a0000000-0000-0000-0000-00000000000a")
+ID_RUTA = uuid.UUID("a0000000-0000-0000-0000-00000000000b")
+
+_PREFIJOS = {
+    Usuario: 1,
+    Empleado: 2,
+    Parada: 3,
+    Transporte: 4,
+    AsignacionT: 5,
+    Tarjeta: 6,
+    Transaccion: 7,
+}
+
+
+def _prefijo(modelo) -> int:
+    # El primer byte (0xA1, 0xA2, ...) separa el rango de UUID de cada modelo.
+    return (0xA0 + _PREFIJOS[modelo]) << 120
+
+
+def id_determinista(modelo, indice: int) -> uuid.UUID:
+    """UUID reproducible para la fila `indice` de un modelo sembrado."""
+    return uuid.UUID(int=_prefijo(modelo) | (indice + 1))
+
+
+def _fila_usuario(i, ahora):
+    return {
+        "id_usuario": id_determinista(Usuario, i),
+        "id_rol": 1 if i % 50 == 0 else 2,
+        "nombre": f"Nombre{i}",
+        "apellido": f"Apellido{i}",
+        "documento": f"B{i:012d}",
+        "email": f"usuario{i}@benchmark.co",
+        "contrasena": "x" * 60,
+        "fecha_registro": ahora,
+        "fecha_actualizar": ahora,
+    }
+
+
+def _fila_empleado(i, ahora):
+    return {
+        "id_empleado": id_determinista(Empleado, i),
+        "nombre": f"Empleado{i}",
+        "apellido": f"Apellido{i}",
+        "documento": f"E{i:012d}",
+        "email": f"empleado{i}@benchmark.co",
+        "rol": ("Conductor", "Supervisor", "Mecanico")[i % 3],
+        "estado": "Activo" if i % 4 else "Inactivo",
+        "fecha_registro": ahora,
+        "fecha_actualizar": ahora,
+    }
+
+
+def _fila_parada(i, ahora):
+    return {
+        "id_parada": id_determinista(Parada, i),
+        "nombre": f"Parada {i}",
+        "direccion": f"Calle {i % 100} # {i}",
+        "coordenadas": None,
+        "estado": "Activa" if i % 5 else "Inactiva",
+        "fecha_registro": ahora,
+        "fecha_actualizar": ahora,
+    }
+
+
+def _fila_transporte(i, ahora):
+    return {
+        "id_transporte": id_determinista(Transporte, i),
+        "tipo": ("Bus", "Metro", "Tranvia")[i % 3],
+        "placa": f"BEN{i:07d}",
+        "capacidad": 40 + i % 80,
+        "estado": "Activo" if i % 6 else "Inactivo",
+        "id_linea": ID_LINEA,
+        "fecha_registro": ahora,
+        "fecha_actualizar": ahora,
+    }
+
+
+def _fila_asignacion(i, ahora):
+    return {
+        "id_asignacion": id_determinista(AsignacionT, i),
+        "id_usuario": id_determinista(Usuario, i),
+        "id_empleado": id_determinista(Empleado, i),
+        "id_transporte": id_determinista(Transporte, i),
+        "id_ruta": ID_RUTA,
+        "fecha_registro": ahora,
+        "fecha_actualizar": ahora,
+    }
+
+
+def numero_tarjeta_determinista(indice: int) -> str:
+    """Número de tarjeta reproducible para la tarjeta sembrada `indice`."""
+    return f"9{indice:015d}"
+
+
+def _fila_tarjeta(i, ahora):
+    return {
+        "id_tarjeta": id_determinista(Tarjeta, i),
+        "id_usuario": id_determinista(Usuario, i),
+        "tipo_tarjeta": ("Frecuente", "Estudiante", "Normal")[i % 3],
+        "numero_tarjeta": numero_tarjeta_determinista(i),
+        "estado": "Activa",
+        "fecha_ultima_recarga": ahora,
+        "saldo": 1_000_000_000.0,
+    }
+
+
+TARJETAS_CON_TRANSACCIONES = 1000
+FECHA_BASE_TRANSACCIONES = datetime(2024, 1, 1)
+
+
+def fecha_transaccion_determinista(indice: int) -> datetime:
+    """Fecha de la transacción sembrada `indice` (una por segundo)."""
+    return FECHA_BASE_TRANSACCIONES + timedelta(seconds=indice)
+
+
+def _fila_transaccion(i, ahora):
+    return {
+        "id_transaccion": id_determinista(Transaccion, i),
+        "numero_tarjeta": numero_tarjeta_determinista(i % TARJETAS_CON_TRANSACCIONES),
+        "tipo_transaccion": "Recarga" if i % 4 == 0 else "Pago",
+        "monto": 20000.0 if i % 4 == 0 else 3200.0,
+        "fecha_transaccion": fecha_transaccion_determinista(i),
+    }
+
+
+FABRICAS = {
+    Usuario: _fila_usuario,
+    Empleado: _fila_empleado,
+    Parada: _fila_parada,
+    Transporte: _fila_transporte,
+    AsignacionT: _fila_asignacion,
+    Tarjeta: _fila_tarjeta,
+    Transaccion: _fila_transaccion,
+}
+
+
+def preparar_base(reiniciar: bool = False):
+    """Crea el esquema y los registros fijos que necesitan los benchmarks."""
+    if reiniciar:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if not db.get(Rol, 1):
+            db.add_all([Rol(id_rol=1, nombre="admin"), Rol(id_rol=2, nombre="cliente")])
+            db.flush()
+        if not db.get(Usuario, ID_USUARIO_AUDITORIA):
+            db.add(
+                Usuario(
+                    id_usuario=ID_USUARIO_AUDITORIA,
+                    id_rol=1,
+                    nombre="Auditoria",
+                    apellido="Sistema",
+                    documento="AUDITORIA01",
+                    email="auditoria@benchmark.co",
+                    contrasena="x" * 60,
+                )
+            )
+        if not db.get(Linea, ID_LINEA):
+            db.add(Linea(id_linea=ID_LINEA, nombre="Linea Benchmark"))
+            db.flush()
+        if not db.get(Ruta, ID_RUTA):
+            db.add(
+                Ruta(
+                    id_ruta=ID_RUTA,
+                    id_linea=ID_LINEA,
+                    nombre="Ruta Benchmark",
+                    origen="A",
+                    destino="B",
+                    duracion_estimada=30,
+                )
+            )
+        db.commit()
+
+
+def contar(modelo) -> int:
+    """Cuenta las filas sembradas de un modelo."""
+    llave = next(iter(modelo.__table__.primary_key.columns))
+    prefijo = _prefijo(modelo)
+    with SessionLocal() as db:
+        return db.scalar(
+            select(func.count()).where(
+                llave >= uuid.UUID(int=prefijo),
+                # Solo los 64 bits bajos: un uuid4 creado por la API cae en
+                # este rango con probabilidad despreciable.
+                llave < uuid.UUID(int=prefijo + (1 << 64)),
+            )
+        )
+
+
+def sembrar_hasta(modelo, objetivo: int, lote: int = 5000) -> int:
+    """Inserta filas sintéticas hasta que el modelo tenga `objetivo` filas sembradas.
+
+    Args:
+        modelo: Modelo a sembrar (ver `FABRICAS`); Tarjeta y AsignacionT
+            requieren los usuarios del mismo índice, y Transaccion las
+            primeras `TARJETAS_CON_TRANSACCIONES` tarjetas.
+        objetivo (int): Número total de filas deseadas.
+        lote (int): Filas por sentencia INSERT multi-fila.
+
+    Returns:
+        int: Número de filas insertadas en esta llamada.
+    """
+    existentes = contar(modelo)
+    fabrica = FABRICAS[modelo]
+    ahora = datetime.now()
+    with SessionLocal() as db:
+        for inicio in range(existentes, objetivo, lote):
+            filas = [
+                fabrica(i, ahora) for i in range(inicio, min(inicio + lote, objetivo))
+            ]
+            db.execute(insert(modelo), filas)
+            db.commit()
+    return max(objetivo - existentes, 0)
+
+
+def medir(funcion, repeticiones: int = 30, calentamiento: int = 3) -> dict:
+    """Mide la latencia de una función en milisegundos.
+
+    Returns:
+        dict: Mediana, p95, mínimo y media de las repeticiones.
+    """
+    for _ in range(calentamiento):
+        funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return {
+        "p50_ms": round(statistics.median(tiempos), 3),
+        "p95_ms": round(tiempos[max(int(len(tiempos) * 0.95) - 1, 0)], 3),
+        "min_ms": round(tiempos[0], 3),
+        "media_ms": round(statistics.fmean(tiempos), 3),
+    }
+
+
+def imprimir_tabla(filas: list, columnas: list):
+    """Imprime resultados en una tabla de texto."""
+    anchos = [
+        max(len(str(c)), *(len(str(f.get(c, ""))) for f in filas)) for c in columnas
+    ]
+    print("  ".join(str(c).ljust(a) for c, a in zip(columnas, anchos)))
+    print("  ".join("-" * a for a in anchos))
+    for fila in filas:
+        print(
+            "  ".join(str(fila.get(c, "")).ljust(a) for c, a in zip(columnas, anchos))
+        )
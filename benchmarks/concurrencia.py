@@ -0,0 +1,118 @@
+"""
+Benchmark de concurrencia: ruta síncrona vs. asíncrona
+======================================================
+
+Compara el rendimiento de una misma consulta (`listar_usuarios`, 10 filas)
+servida desde un handler `async def` con la sesión síncrona, que bloquea el
+event loop, y con la AsyncSession, que lo libera mientras espera a la base
+de datos. Los clientes corren en el mismo event loop que la aplicación
+(transporte ASGI en proceso), así que el resultado refleja un único worker.
+
+La diferencia se aprecia contra PostgreSQL, donde cada consulta espera I/O
+de red; con SQLite en archivo local la espera es mínima.
+
+Uso:
+    DATABASE_URL=postgresql://... python -m benchmarks.concurrencia --clientes 50 200 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.comun import imprimir_tabla, preparar_base, sembrar_hasta
+from Entities.usuario import Usuario
+
+
+def construir_app():
+    """App mínima con la misma consulta por la ruta síncrona y la asíncrona."""
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from api.dependencies import get_async_db
+    from Crud.asincrono import UsuarioCRUDAsync
+    from Crud.usuario_crud import UsuarioCRUD
+    from database.config import SessionLocal
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def ruta_sincrona():
+        db = SessionLocal()
+        try:
+            return len(UsuarioCRUD(db).listar_usuarios(limit=10))
+        finally:
+            db.close()
+
+    @app.get("/async")
+    async def ruta_asincrona(db: AsyncSession = Depends(get_async_db)):
+        return len(await UsuarioCRUDAsync(db).listar_usuarios(limit=10))
+
+    return app
+
+
+async def cargar(app, ruta: str, clientes: int, peticiones: int) -> dict:
+    """Lanza `clientes` tareas concurrentes hasta completar `peticiones`."""
+    import httpx
+
+    latencias = []
+    pendientes = iter(range(peticiones))
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as c:
+
+        async def cliente():
+            for _ in pendientes:
+                inicio = time.perf_counter()
+                respuesta = await c.get(ruta)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                assert respuesta.status_code == 200, respuesta.text
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente() for _ in range(clientes)))
+        duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "ruta": ruta.strip("/"),
+        "clientes": clientes,
+        "peticiones": peticiones,
+        "req_s": round(peticiones / duracion, 1),
+        "p50_ms": round(statistics.median(latencias), 2),
+        "p99_ms": round(latencias[int(len(latencias) * 0.99) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument(
+        "--peticiones", type=int, default=3, help="Peticiones por cliente"
+    )
+    parser.add_argument("--usuarios", type=int, default=10_000)
+    args = parser.parse_args()
+
+    preparar_base()
+    sembrar_hasta(Usuario, args.usuarios)
+    app = construir_app()
+
+    async def ejecutar():
+        # Un solo event loop: el pool asíncrono queda ligado al loop que lo crea.
+        from database.config import async_engine
+
+        try:
+            return [
+                await cargar(app, ruta, clientes, clientes * args.peticiones)
+                for clientes in args.clientes
+                for ruta in ("/sync", "/async")
+            ]
+        finally:
+            await async_engine.dispose()
+
+    resultados = asyncio.run(ejecutar())
+    imprimir_tabla(
+        resultados, ["ruta", "clientes", "peticiones", "req_s", "p50_ms", "p99_ms"]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark de exportación de transacciones
+=========================================
+
+Mide `GET /api/transacciones/exportar` (NDJSON y CSV) con tamaños de
+exportación crecientes y reporta filas por segundo y el pico de memoria
+residente (RSS) del proceso durante cada exportación.
+
+Como referencia se mide también el caso `lista`: cargar las mismas filas
+como objetos ORM y serializarlas con `TransaccionOut`, que es lo que hacían
+los listados. En la exportación el incremento de RSS debe mantenerse plano
+al crecer el número de filas; en `lista` crece con ellas.
+
+El RSS se muestrea cada 5 ms desde /proc (Linux); en otros sistemas se usa
+el máximo histórico de `resource`, que no baja entre casos.
+
+Uso:
+    DATABASE_URL=postgresql://... python -m benchmarks.exportacion --tamanos 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import threading
+import time
+
+from sqlalchemy import select
+
+from benchmarks.comun import (
+    TARJETAS_CON_TRANSACCIONES,
+    fecha_transaccion_determinista,
+    imprimir_tabla,
+    preparar_base,
+    sembrar_hasta,
+)
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion, TransaccionOut
+from Entities.usuario import Usuario
+
+_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_actual_mb() -> float:
+    """RSS actual del proceso en MB (máximo histórico si no hay /proc)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGINA / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class MuestreoRSS:
+    """Registra el pico de RSS mientras está activo (`with MuestreoRSS() as m`)."""
+
+    def __init__(self, intervalo: float = 0.005):
+        self.intervalo = intervalo
+        self.inicial = self.pico = rss_actual_mb()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _muestrear(self):
+        while not self._detener.wait(self.intervalo):
+            self.pico = max(self.pico, rss_actual_mb())
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._detener.set()
+        self._hilo.join()
+        self.pico = max(self.pico, rss_actual_mb())
+
+
+def resultado(caso: str, filas: int, duracion: float, muestreo: MuestreoRSS) -> dict:
+    return {
+        "caso": caso,
+        "filas": filas,
+        "filas_s": round(filas / duracion),
+        "seg": round(duracion, 2),
+        "rss_pico_mb": round(muestreo.pico, 1),
+        "rss_incremento_mb": round(muestreo.pico - muestreo.inicial, 1),
+    }
+
+
+async def exportar(app, formato: str, tamano: int) -> dict:
+    """Descarga la exportación de las primeras `tamano` transacciones sembradas.
+
+    Se llama a la aplicación ASGI directamente y cada fragmento se descarta
+    al recibirlo: un cliente de prueba como `httpx.ASGITransport` acumula el
+    cuerpo completo y ocultaría el efecto del streaming.
+    """
+    from urllib.parse import urlencode
+
+    hasta = fecha_transaccion_determinista(tamano - 1).isoformat()
+    alcance = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/transacciones/exportar",
+        "raw_path": b"/api/transacciones/exportar",
+        "query_string": urlencode({"formato": formato, "hasta": hasta}).encode(),
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    estado = {"codigo": None, "lineas": 0, "solicitud_enviada": False}
+    fin_respuesta = asyncio.Event()
+
+    async def recibir():
+        if not estado["solicitud_enviada"]:
+            estado["solicitud_enviada"] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await fin_respuesta.wait()
+        return {"type": "http.disconnect"}
+
+    async def enviar(mensaje):
+        if mensaje["type"] == "http.response.start":
+            estado["codigo"] = mensaje["status"]
+        elif mensaje["type"] == "http.response.body":
+            estado["lineas"] += mensaje.get("body", b"").count(b"\n")
+            if not mensaje.get("more_body", False):
+                fin_respuesta.set()
+
+    with MuestreoRSS() as muestreo:
+        inicio = time.perf_counter()
+        await app(alcance, recibir, enviar)
+        duracion = time.perf_counter() - inicio
+    assert estado["codigo"] == 200, estado
+    filas = estado["lineas"] - (1 if formato == "csv" else 0)
+    assert filas == tamano, (filas, tamano)
+    return resultado(formato, filas, duracion, muestreo)
+
+
+def listar_en_memoria(tamano: int) -> dict:
+    """Carga las filas como objetos ORM y las serializa una por una."""
+    from database.config import SessionLocal
+
+    hasta = fecha_transaccion_determinista(tamano - 1)
+    with MuestreoRSS() as muestreo:
+        inicio = time.perf_counter()
+        with SessionLocal() as db:
+            transacciones = db.scalars(
+                select(Transaccion)
+                .where(Transaccion.fecha_transaccion <= hasta)
+                .order_by(Transaccion.fecha_transaccion, Transaccion.id_transaccion)
+            ).all()
+            cuerpo = [
+                TransaccionOut.model_validate(t).model_dump_json()
+                for t in transacciones
+            ]
+        duracion = time.perf_counter() - inicio
+    filas = len(cuerpo)
+    del transacciones, cuerpo
+    return resultado("lista", filas, duracion, muestreo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--sin-lista", action="store_true", help="No medir el caso de referencia"
+    )
+    args = parser.parse_args()
+    tamanos = sorted(args.tamanos)
+
+    preparar_base()
+    sembrar_hasta(Usuario, TARJETAS_CON_TRANSACCIONES)
+    sembrar_hasta(Tarjeta, TARJETAS_CON_TRANSACCIONES)
+    sembrar_hasta(Transaccion, tamanos[-1], lote=10_000)
+
+    from Crud.auditoria_cola import cola_auditoria
+    from database.config import async_engine
+    from main import app
+
+    async def ejecutar():
+        try:
+            resultados = []
+            for tamano in tamanos:
+                for formato in ("ndjson", "csv"):
+                    resultados.append(await exportar(app, formato, tamano))
+            return resultados
+        finally:
+            await async_engine.dispose()
+
+    resultados = asyncio.run(ejecutar())
+    cola_auditoria.detener()
+    if not args.sin_lista:
+        # Al final: la memoria que retiene no debe contaminar la exportación.
+        resultados += [listar_en_memoria(tamano) for tamano in tamanos]
+    imprimir_tabla(
+        resultados,
+        ["caso", "filas", "filas_s", "seg", "rss_pico_mb", "rss_incremento_mb"],
+    )
+
+
+if __name__ == "__main__":
+    main()
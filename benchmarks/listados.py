@@ -0,0 +1,75 @@
+"""
+Benchmark de endpoints de listado
+=================================
+
+Mide la latencia de cada endpoint de listado a distintos tamaños de tabla.
+Con la paginación y los filtros resueltos en SQL la latencia de una página
+de `limit` filas debe mantenerse plana aunque la tabla crezca.
+
+Uso:
+    python -m benchmarks.listados --tamanos 1000 10000 100000
+"""
+
+import argparse
+
+from benchmarks.comun import (
+    imprimir_tabla,
+    medir,
+    preparar_base,
+    sembrar_hasta,
+)
+from Entities.asignacionT import AsignacionT
+from Entities.empleado import Empleado
+from Entities.parada import Parada
+from Entities.transporte import Transporte
+from Entities.usuario import Usuario
+
+CASOS = [
+    ("usuarios", "/api/usuarios/?limit=10&rol=2"),
+    ("empleados", "/api/empleados/?limit=10&estado=Activo&rol=Conductor"),
+    ("paradas", "/api/paradas/?limit=10&estado=Activa"),
+    ("transportes", "/api/transportes/?limit=10&orden=placa"),
+    ("asignaciones", "/api/asignaciones/?limit=10"),
+]
+
+MODELOS = [Usuario, Empleado, Parada, Transporte, AsignacionT]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeticiones", type=int, default=30)
+    parser.add_argument("--reiniciar", action="store_true")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    preparar_base(reiniciar=args.reiniciar)
+    resultados = []
+    with TestClient(app) as cliente:
+        for tamano in sorted(args.tamanos):
+            for modelo in MODELOS:
+                sembrar_hasta(modelo, tamano)
+            for nombre, url in CASOS:
+
+                def peticion():
+                    respuesta = cliente.get(url)
+                    assert respuesta.status_code == 200, respuesta.text
+
+                resultados.append(
+                    {
+                        "ruta": nombre,
+                        "filas": tamano,
+                        **medir(peticion, args.repeticiones),
+                    }
+                )
+
+    resultados.sort(key=lambda r: (r["ruta"], r["filas"]))
+    imprimir_tabla(resultados, ["ruta", "filas", "p50_ms", "p95_ms", "min_ms"])
+
+
+if __name__ == "__main__":
+    main()
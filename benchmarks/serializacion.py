@@ -0,0 +1,117 @@
+"""
+Benchmark de serialización de listados
+======================================
+
+Compara, para los listados de usuarios, empleados, paradas, transportes y
+asignaciones, el camino de Pydantic (`response_model`: un objeto por fila
+con `from_attributes` y luego `dump_json`) con la serialización rápida de
+`api/respuestas.py` (extracción de columnas y orjson):
+
+- `serializar_ms`: solo la conversión a JSON de `--filas` entidades ya
+  cargadas.
+- `ruta_ms`: la petición completa `GET ...?limit=--filas`, incluida la
+  consulta.
+
+Antes de medir verifica que ambos caminos produzcan los mismos bytes.
+
+Uso:
+    python -m benchmarks.serializacion --filas 1000
+"""
+
+import argparse
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks.comun import (
+    imprimir_tabla,
+    medir,
+    preparar_base,
+    sembrar_hasta,
+)
+from database.config import SessionLocal
+from Entities.asignacionT import AsignacionT, AsignacionTOut
+from Entities.empleado import Empleado, EmpleadoOut
+from Entities.parada import Parada, ParadaOut
+from Entities.transporte import Transporte, TransporteOut
+from Entities.usuario import Usuario, UsuarioOut
+
+CASOS = [
+    ("usuarios", Usuario, UsuarioOut, "/api/usuarios/"),
+    ("empleados", Empleado, EmpleadoOut, "/api/empleados/"),
+    ("paradas", Parada, ParadaOut, "/api/paradas/"),
+    ("transportes", Transporte, TransporteOut, "/api/transportes/"),
+    ("asignaciones", AsignacionT, AsignacionTOut, "/api/asignaciones/"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=1000, help="Filas por página")
+    parser.add_argument("--repeticiones", type=int, default=30)
+    parser.add_argument("--reiniciar", action="store_true")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    import api.respuestas as respuestas
+    from main import app
+
+    preparar_base(reiniciar=args.reiniciar)
+    resultados = []
+    with TestClient(app) as cliente:
+        for nombre, modelo, esquema, ruta in CASOS:
+            sembrar_hasta(modelo, args.filas)
+            url = f"{ruta}?limit={args.filas}"
+            with SessionLocal() as db:
+                filas = db.query(modelo).limit(args.filas).all()
+            adaptador = TypeAdapter(List[esquema])
+            rapido = respuestas.serializador(esquema)
+
+            cuerpos = {}
+            for activo in (False, True):
+                respuestas.RESPUESTAS_RAPIDAS = activo
+                respuesta = cliente.get(url)
+                assert respuesta.status_code == 200, respuesta.text
+                cuerpos[activo] = respuesta.content
+            assert cuerpos[False] == cuerpos[True], f"{nombre}: salidas distintas"
+            assert adaptador.dump_json(
+                adaptador.validate_python(filas, from_attributes=True)
+            ) == rapido.json(filas), f"{nombre}: serialización distinta"
+
+            for camino, activo, serializar in (
+                (
+                    "pydantic",
+                    False,
+                    lambda: adaptador.dump_json(
+                        adaptador.validate_python(filas, from_attributes=True)
+                    ),
+                ),
+                ("rapida", True, lambda: rapido.json(filas)),
+            ):
+                respuestas.RESPUESTAS_RAPIDAS = activo
+                resultados.append(
+                    {
+                        "ruta": nombre,
+                        "camino": camino,
+                        "serializar_ms": medir(serializar, args.repeticiones)["p50_ms"],
+                        "ruta_ms": medir(lambda: cliente.get(url), args.repeticiones)[
+                            "p50_ms"
+                        ],
+                    }
+                )
+        respuestas.RESPUESTAS_RAPIDAS = True
+
+    for pydantic, rapida in zip(resultados[::2], resultados[1::2]):
+        for clave in ("serializar_ms", "ruta_ms"):
+            rapida[clave.replace("_ms", "_x")] = round(
+                pydantic[clave] / rapida[clave], 2
+            )
+    imprimir_tabla(
+        resultados,
+        ["ruta", "camino", "serializar_ms", "serializar_x", "ruta_ms", "ruta_x"],
+    )
+
+
+if __name__ == "__main__":
+    main()
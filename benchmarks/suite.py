@@ -0,0 +1,475 @@
+"""
+Suite de micro-benchmarks de Crud y rutas
+=========================================
+
+Siembra la base de datos al tamaño indicado y mide, con los mismos datos y
+la misma secuencia de IDs en cada ejecución:
+
+- Cada método de las clases `Crud` (`listar_*`, `obtener_*`, `consultar_*`,
+  `registrar_*`, `crear_*`, `recargar_tarjeta`, `obtener_transacciones`),
+  llamado con una sesión nueva por repetición, como en una petición.
+- Cada ruta de la API, en el mismo proceso a través del cliente de prueba
+  ASGI (incluye validación, serialización y middlewares).
+
+Los resultados se guardan en JSON. Con `--base` se comparan contra una
+ejecución anterior por mediana (p50): los casos que empeoran más que
+`--umbral` se marcan como regresión y el proceso termina con código 1.
+
+Los casos de escritura insertan filas nuevas en cada repetición (con un
+sufijo distinto por ejecución), así que la base crece un poco entre
+ejecuciones; con `--reiniciar` se parte siempre de las mismas tablas.
+
+Uso:
+    python -m benchmarks.suite --tamano 10000 --salida base.json
+    python -m benchmarks.suite --tamano 10000 --base base.json --salida nuevo.json
+    python -m benchmarks.suite --comparar base.json nuevo.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from itertools import count
+
+from benchmarks.comun import (
+    ID_LINEA,
+    ID_RUTA,
+    TARJETAS_CON_TRANSACCIONES,
+    id_determinista,
+    imprimir_tabla,
+    medir,
+    numero_tarjeta_determinista,
+    preparar_base,
+    sembrar_hasta,
+)
+from Entities.asignacionT import AsignacionT, AsignacionTCreate
+from Entities.empleado import Empleado, EmpleadoCreate
+from Entities.parada import Parada, ParadaCreate
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion
+from Entities.transporte import Transporte, TransporteCreate
+from Entities.usuario import Usuario, UsuarioCreate
+
+HASH_FICTICIO = "$2b$12$" + "x" * 53
+
+
+def documento_usuario(indice: int) -> str:
+    """Documento del usuario sembrado `indice` (ver `benchmarks.comun`)."""
+    return f"B{indice:012d}"
+
+
+class Generador:
+    """IDs aleatorios reproducibles y valores únicos para los casos."""
+
+    def __init__(self, tamano: int, semilla: int = 0):
+        self.tamano = tamano
+        self.azar = random.Random(semilla)
+        self.sufijo = uuid.uuid4().hex[:8]
+        self._secuencia = count()
+
+    def indice(self, maximo: int = None) -> int:
+        return self.azar.randrange(maximo or self.tamano)
+
+    def id(self, modelo):
+        return id_determinista(modelo, self.indice())
+
+    def unico(self) -> str:
+        return f"{self.sufijo}{next(self._secuencia)}"
+
+
+def casos_crud(g: Generador) -> dict:
+    """Casos de las clases Crud: nombre -> función que recibe la sesión."""
+    from Crud.asignacionT_crud import AsignacionTCRUD
+    from Crud.empleado_crud import EmpleadoCRUD
+    from Crud.linea_crud import LineaCRUD
+    from Crud.parada_crud import ParadaCRUD
+    from Crud.reporte_crud import ReporteCRUD
+    from Crud.ruta_crud import RutaCRUD
+    from Crud.tarjeta_crud import TarjetaCRUD
+    from Crud.transacciones_crud import TransaccionCRUD
+    from Crud.transporte_crud import TransporteCRUD
+    from Crud.usuario_crud import UsuarioCRUD
+
+    con_transacciones = min(g.tamano, TARJETAS_CON_TRANSACCIONES)
+    hoy = date.today()
+
+    def usuario_nuevo():
+        u = g.unico()
+        return UsuarioCreate(
+            nombre="Bench",
+            apellido="Suite",
+            documento=f"S{u}",
+            email=f"s{u}@suite.co",
+            contrasena="secreto1",
+        )
+
+    return {
+        # Usuarios
+        "UsuarioCRUD.listar_usuarios": lambda db: UsuarioCRUD(db).listar_usuarios(
+            limit=100, id_rol=2
+        ),
+        "UsuarioCRUD.obtener_por_id": lambda db: UsuarioCRUD(db).obtener_por_id(
+            g.id(Usuario)
+        ),
+        "UsuarioCRUD.consultar_por_documento": lambda db: UsuarioCRUD(
+            db
+        ).consultar_por_documento(documento_usuario(g.indice())),
+        "UsuarioCRUD.obtener_por_email": lambda db: UsuarioCRUD(db).obtener_por_email(
+            f"usuario{g.indice()}@benchmark.co"
+        ),
+        "UsuarioCRUD.crear_usuario": lambda db: UsuarioCRUD(db).crear_usuario(
+            usuario_nuevo(), HASH_FICTICIO
+        ),
+        # Empleados
+        "EmpleadoCRUD.listar_empleados": lambda db: EmpleadoCRUD(db).listar_empleados(
+            limit=100, estado="Activo", rol="Conductor"
+        ),
+        "EmpleadoCRUD.obtener_por_id": lambda db: EmpleadoCRUD(db).obtener_por_id(
+            g.id(Empleado)
+        ),
+        "EmpleadoCRUD.consultar_por_documento": lambda db: EmpleadoCRUD(
+            db
+        ).consultar_por_documento(f"E{g.indice():012d}"),
+        "EmpleadoCRUD.crear_empleado": lambda db: EmpleadoCRUD(db).crear_empleado(
+            EmpleadoCreate(
+                nombre="Bench",
+                apellido="Suite",
+                documento=f"SE{g.unico()}",
+                email=f"se{g.unico()}@suite.co",
+                rol="Conductor",
+            )
+        ),
+        # Paradas
+        "ParadaCRUD.listar_paradas": lambda db: ParadaCRUD(db).listar_paradas(
+            limit=100, estado="Activa"
+        ),
+        "ParadaCRUD.obtener_por_id": lambda db: ParadaCRUD(db).obtener_por_id(
+            g.id(Parada)
+        ),
+        "ParadaCRUD.buscar_por_nombre": lambda db: ParadaCRUD(db).buscar_por_nombre(
+            f"Parada {g.indice()}", limit=10
+        ),
+        "ParadaCRUD.registrar_parada": lambda db: ParadaCRUD(db).registrar_parada(
+            ParadaCreate(nombre=f"Suite {g.unico()}", direccion="Calle 1")
+        ),
+        # Transportes
+        "TransporteCRUD.listar_transportes": lambda db: TransporteCRUD(
+            db
+        ).listar_transportes(limit=100, orden="placa"),
+        "TransporteCRUD.obtener_por_id": lambda db: TransporteCRUD(db).obtener_por_id(
+            g.id(Transporte)
+        ),
+        "TransporteCRUD.consultar_por_placa": lambda db: TransporteCRUD(
+            db
+        ).consultar_por_placa(f"BEN{g.indice():07d}"),
+        "TransporteCRUD.registrar_transporte": lambda db: TransporteCRUD(
+            db
+        ).registrar_transporte(
+            TransporteCreate(
+                tipo="Bus", placa=f"S{g.unico()}", capacidad=40, id_linea=ID_LINEA
+            )
+        ),
+        # Asignaciones
+        "AsignacionTCRUD.listar_asignaciones": lambda db: AsignacionTCRUD(
+            db
+        ).listar_asignaciones(limit=100),
+        "AsignacionTCRUD.obtener_por_id": lambda db: AsignacionTCRUD(db).obtener_por_id(
+            g.id(AsignacionT)
+        ),
+        "AsignacionTCRUD.obtener_por_usuario": lambda db: AsignacionTCRUD(
+            db
+        ).obtener_por_usuario(g.id(Usuario)),
+        "AsignacionTCRUD.registrar_asignacion": lambda db: AsignacionTCRUD(
+            db
+        ).registrar_asignacion(
+            AsignacionTCreate(
+                id_usuario=g.id(Usuario),
+                id_empleado=g.id(Empleado),
+                id_transporte=g.id(Transporte),
+                id_ruta=ID_RUTA,
+            )
+        ),
+        # Líneas y rutas
+        "LineaCRUD.listar_lineas": lambda db: LineaCRUD(db).listar_lineas(),
+        "LineaCRUD.registrar_linea": lambda db: LineaCRUD(db).registrar_linea(
+            f"Suite {g.unico()}", "Benchmark"
+        ),
+        "RutaCRUD.listar_rutas": lambda db: RutaCRUD(db).listar_rutas(),
+        "RutaCRUD.obtener_por_id": lambda db: RutaCRUD(db).obtener_por_id(ID_RUTA),
+        "RutaCRUD.registrar_ruta": lambda db: RutaCRUD(db).registrar_ruta(
+            f"Suite {g.unico()}", "A", "B", 30, ID_LINEA
+        ),
+        # Tarjetas y transacciones
+        "TarjetaCRUD.obtener_por_id": lambda db: TarjetaCRUD(db).obtener_por_id(
+            g.id(Tarjeta)
+        ),
+        "TarjetaCRUD.obtener_saldo": lambda db: TarjetaCRUD(db).obtener_saldo(
+            documento_usuario(g.indice())
+        ),
+        "TarjetaCRUD.recargar_tarjeta": lambda db: TarjetaCRUD(db).recargar_tarjeta(
+            documento_usuario(g.indice()), 1000
+        ),
+        "TarjetaCRUD.validar_tarjeta": lambda db: TarjetaCRUD(db).validar_tarjeta(
+            numero_tarjeta_determinista(g.indice())
+        ),
+        "TransaccionCRUD.obtener_por_id": lambda db: TransaccionCRUD(db).obtener_por_id(
+            g.id(Transaccion)
+        ),
+        "TransaccionCRUD.obtener_transacciones": lambda db: TransaccionCRUD(
+            db
+        ).obtener_transacciones(documento_usuario(g.indice(con_transacciones))),
+        "TransaccionCRUD.obtener_pagina": lambda db: TransaccionCRUD(db).obtener_pagina(
+            documento_usuario(g.indice(con_transacciones)), limit=100
+        ),
+        "TransaccionCRUD.registrar_transaccion": lambda db: TransaccionCRUD(
+            db
+        ).registrar_transaccion(
+            numero_tarjeta_determinista(g.indice()), "Recarga", 1000
+        ),
+        # Reportes
+        "ReporteCRUD.resumen_diario": lambda db: ReporteCRUD(db).resumen_diario(
+            hoy - timedelta(days=30), hoy
+        ),
+    }
+
+
+def casos_rutas(g: Generador) -> dict:
+    """Casos de rutas: nombre -> (método, función que retorna la URL, cuerpo)."""
+    con_transacciones = min(g.tamano, TARJETAS_CON_TRANSACCIONES)
+    hoy = date.today()
+
+    def get(url):
+        return ("GET", url, None)
+
+    return {
+        "GET /api/usuarios/": get(lambda: "/api/usuarios/?limit=100&rol=2"),
+        "GET /api/usuarios/{usuario_id}": get(lambda: f"/api/usuarios/{g.id(Usuario)}"),
+        "GET /api/usuarios/documento/{documento}": get(
+            lambda: f"/api/usuarios/documento/{documento_usuario(g.indice())}"
+        ),
+        "GET /api/empleados/": get(
+            lambda: "/api/empleados/?limit=100&estado=Activo&rol=Conductor"
+        ),
+        "GET /api/empleados/{empleado_id}": get(
+            lambda: f"/api/empleados/{g.id(Empleado)}"
+        ),
+        "GET /api/paradas/": get(lambda: "/api/paradas/?limit=100&estado=Activa"),
+        "GET /api/paradas/{parada_id}": get(lambda: f"/api/paradas/{g.id(Parada)}"),
+        "GET /api/transportes/": get(lambda: "/api/transportes/?limit=100&orden=placa"),
+        "GET /api/transportes/{transporte_id}": get(
+            lambda: f"/api/transportes/{g.id(Transporte)}"
+        ),
+        "GET /api/transportes/placa/{placa}": get(
+            lambda: f"/api/transportes/placa/BEN{g.indice():07d}"
+        ),
+        "GET /api/asignaciones/": get(lambda: "/api/asignaciones/?limit=100"),
+        "GET /api/asignaciones/{asignacion_id}": get(
+            lambda: f"/api/asignaciones/{g.id(AsignacionT)}"
+        ),
+        "GET /api/tarjetas/{documento}": get(
+            lambda: f"/api/tarjetas/{documento_usuario(g.indice())}"
+        ),
+        "GET /api/transacciones/": get(
+            lambda: "/api/transacciones/?limit=100&documento="
+            + documento_usuario(g.indice(con_transacciones))
+        ),
+        "GET /api/reportes/transacciones/diario": get(
+            lambda: f"/api/reportes/transacciones/diario?desde={hoy - timedelta(days=30)}"
+            f"&hasta={hoy}"
+        ),
+        "POST /api/paradas/": (
+            "POST",
+            lambda: "/api/paradas/",
+            lambda: {"nombre": f"Suite {g.unico()}", "direccion": "Calle 1"},
+        ),
+        "PUT /api/tarjetas/": (
+            "PUT",
+            lambda: "/api/tarjetas/",
+            lambda: {"documento": documento_usuario(g.indice()), "saldo": 1000},
+        ),
+        "POST /api/tarjetas/{numero_tarjeta}/validar": (
+            "POST",
+            lambda: f"/api/tarjetas/{numero_tarjeta_determinista(g.indice())}/validar",
+            None,
+        ),
+    }
+
+
+def ejecutar_crud(g: Generador, repeticiones: int, filtro: str) -> list:
+    from database.config import SessionLocal
+
+    resultados = []
+    for nombre, caso in casos_crud(g).items():
+        if filtro and filtro not in nombre:
+            continue
+
+        def llamada():
+            with SessionLocal() as db:
+                caso(db)
+
+        resultados.append(
+            {"grupo": "crud", "caso": nombre, **medir(llamada, repeticiones)}
+        )
+    return resultados
+
+
+def ejecutar_rutas(g: Generador, repeticiones: int, filtro: str) -> list:
+    from fastapi.testclient import TestClient
+    from main import app
+
+    resultados = []
+    with TestClient(app) as cliente:
+        for nombre, (metodo, url, cuerpo) in casos_rutas(g).items():
+            if filtro and filtro not in nombre:
+                continue
+
+            def peticion():
+                respuesta = cliente.request(
+                    metodo, url(), json=cuerpo() if cuerpo else None
+                )
+                assert respuesta.status_code < 300, (nombre, respuesta.text)
+
+            resultados.append(
+                {"grupo": "rutas", "caso": nombre, **medir(peticion, repeticiones)}
+            )
+    return resultados
+
+
+def comparar(base: dict, nuevo: dict, umbral: float) -> list:
+    """Compara dos ejecuciones caso por caso por mediana.
+
+    Args:
+        base (dict): Resultado JSON de la ejecución de referencia.
+        nuevo (dict): Resultado JSON de la ejecución a evaluar.
+        umbral (float): Cambio relativo de p50 a partir del cual un caso se
+            marca como regresión o mejora (0.15 = 15 %).
+
+    Returns:
+        list: Una fila por caso presente en ambas ejecuciones.
+    """
+    anteriores = {(r["grupo"], r["caso"]): r for r in base["resultados"]}
+    filas = []
+    for r in nuevo["resultados"]:
+        anterior = anteriores.get((r["grupo"], r["caso"]))
+        if anterior is None:
+            continue
+        cambio = r["p50_ms"] / anterior["p50_ms"] - 1 if anterior["p50_ms"] else 0.0
+        if cambio > umbral:
+            estado = "REGRESION"
+        elif cambio < -umbral:
+            estado = "mejora"
+        else:
+            estado = "="
+        filas.append(
+            {
+                "grupo": r["grupo"],
+                "caso": r["caso"],
+                "base_p50_ms": anterior["p50_ms"],
+                "p50_ms": r["p50_ms"],
+                "cambio": f"{cambio:+.1%}",
+                "estado": estado,
+            }
+        )
+    return filas
+
+
+def imprimir_comparacion(base: dict, nuevo: dict, umbral: float) -> bool:
+    """Imprime la comparación y retorna True si hay alguna regresión."""
+    for clave in ("base_de_datos", "tamano"):
+        if base["metadatos"].get(clave) != nuevo["metadatos"].get(clave):
+            print(
+                f"Aviso: {clave} distinto ({base['metadatos'].get(clave)} vs "
+                f"{nuevo['metadatos'].get(clave)}); la comparación no es equivalente."
+            )
+    filas = comparar(base, nuevo, umbral)
+    imprimir_tabla(
+        filas, ["grupo", "caso", "base_p50_ms", "p50_ms", "cambio", "estado"]
+    )
+    regresiones = [f for f in filas if f["estado"] == "REGRESION"]
+    print(
+        f"\n{len(regresiones)} regresiones de {len(filas)} casos (umbral {umbral:.0%})"
+    )
+    return bool(regresiones)
+
+
+def leer_json(ruta: str) -> dict:
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamano", type=int, default=10_000)
+    parser.add_argument(
+        "--transacciones",
+        type=int,
+        default=None,
+        help="Transacciones sembradas (por defecto 10 × tamaño)",
+    )
+    parser.add_argument("--repeticiones", type=int, default=50)
+    parser.add_argument("--grupo", choices=["crud", "rutas", "todos"], default="todos")
+    parser.add_argument(
+        "--filtro", default="", help="Solo los casos que contengan este texto"
+    )
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    parser.add_argument("--base", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument(
+        "--comparar",
+        nargs=2,
+        metavar=("BASE", "NUEVO"),
+        help="Solo comparar dos archivos JSON, sin ejecutar",
+    )
+    parser.add_argument("--umbral", type=float, default=0.15)
+    parser.add_argument("--reiniciar", action="store_true")
+    args = parser.parse_args()
+
+    if args.comparar:
+        base, nuevo = (leer_json(ruta) for ruta in args.comparar)
+        sys.exit(1 if imprimir_comparacion(base, nuevo, args.umbral) else 0)
+
+    tamano = max(args.tamano, TARJETAS_CON_TRANSACCIONES)
+    transacciones = args.transacciones or 10 * tamano
+
+    from database.config import engine
+
+    preparar_base(reiniciar=args.reiniciar)
+    for modelo in (Usuario, Empleado, Parada, Transporte, AsignacionT, Tarjeta):
+        sembrar_hasta(modelo, tamano)
+    sembrar_hasta(Transaccion, transacciones, lote=10_000)
+
+    resultados = []
+    if args.grupo in ("crud", "todos"):
+        resultados += ejecutar_crud(Generador(tamano), args.repeticiones, args.filtro)
+    if args.grupo in ("rutas", "todos"):
+        resultados += ejecutar_rutas(Generador(tamano), args.repeticiones, args.filtro)
+
+    salida = {
+        "metadatos": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "base_de_datos": engine.dialect.name,
+            "tamano": tamano,
+            "transacciones": transacciones,
+            "repeticiones": args.repeticiones,
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+        },
+        "resultados": resultados,
+    }
+    imprimir_tabla(resultados, ["grupo", "caso", "p50_ms", "p95_ms", "min_ms"])
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(salida, archivo, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {args.salida}")
+
+    if args.base:
+        print()
+        sys.exit(
+            1 if imprimir_comparacion(leer_json(args.base), salida, args.umbral) else 0
+        )
+
+
+if __name__ == "__main__":
+    main()
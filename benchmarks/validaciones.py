@@ -0,0 +1,142 @@
+"""
+Benchmark de validaciones de tarjeta (taps)
+===========================================
+
+Lanza taps concurrentes contra `POST /api/tarjetas/{numero}/validar` y
+reporta taps por segundo y latencias p50/p99. Se miden dos casos:
+
+- `distribuidas`: cada tap usa una tarjeta al azar entre las sembradas.
+- `misma_tarjeta`: todos los clientes golpean la misma tarjeta, el peor
+  caso de contención sobre una fila.
+
+Al final de cada caso se comprueba que el saldo descontado y el número de
+transacciones registradas coincidan exactamente con los taps exitosos.
+
+Con SQLite las escrituras se serializan en un único bloqueo de archivo, así
+que con muchos clientes aparecen errores "database is locked"; el número
+representativo se obtiene contra PostgreSQL.
+
+Uso:
+    DATABASE_URL=postgresql://... python -m benchmarks.validaciones --clientes 10 100
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from benchmarks.comun import (
+    imprimir_tabla,
+    numero_tarjeta_determinista,
+    preparar_base,
+    sembrar_hasta,
+)
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion
+from Entities.usuario import Usuario
+
+
+def estado_tarjetas(numeros: list) -> tuple:
+    """Saldo total y número de pagos registrados de un conjunto de tarjetas."""
+    from database.config import SessionLocal
+
+    with SessionLocal() as db:
+        saldo = db.scalar(
+            select(func.sum(Tarjeta.saldo)).where(Tarjeta.numero_tarjeta.in_(numeros))
+        )
+        pagos = db.scalar(
+            select(func.count()).where(
+                Transaccion.numero_tarjeta.in_(numeros),
+                Transaccion.tipo_transaccion == "Pago",
+            )
+        )
+    return saldo, pagos
+
+
+async def cargar(app, caso: str, numeros: list, clientes: int, taps: int) -> dict:
+    """Lanza `clientes` tareas concurrentes hasta completar `taps` validaciones."""
+    import httpx
+
+    from Crud.tarjeta_crud import TARIFA_PASAJE
+
+    azar = random.Random(clientes)
+    latencias = []
+    pendientes = iter(range(taps))
+    saldo_inicial, pagos_iniciales = estado_tarjetas(numeros)
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as c:
+
+        async def cliente():
+            for _ in pendientes:
+                numero = azar.choice(numeros)
+                inicio = time.perf_counter()
+                respuesta = await c.post(f"/api/tarjetas/{numero}/validar")
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                assert respuesta.status_code == 200, respuesta.text
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente() for _ in range(clientes)))
+        duracion = time.perf_counter() - inicio
+
+    saldo_final, pagos_finales = estado_tarjetas(numeros)
+    consistente = (
+        pagos_finales - pagos_iniciales == taps
+        and abs(saldo_inicial - saldo_final - taps * TARIFA_PASAJE) < 1e-6
+    )
+    latencias.sort()
+    return {
+        "caso": caso,
+        "clientes": clientes,
+        "taps": taps,
+        "taps_s": round(taps / duracion, 1),
+        "p50_ms": round(statistics.median(latencias), 2),
+        "p99_ms": round(latencias[max(int(len(latencias) * 0.99) - 1, 0)], 2),
+        "consistente": consistente,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--taps", type=int, default=20, help="Taps por cliente")
+    parser.add_argument("--tarjetas", type=int, default=10_000)
+    args = parser.parse_args()
+
+    preparar_base()
+    sembrar_hasta(Usuario, args.tarjetas)
+    sembrar_hasta(Tarjeta, args.tarjetas)
+    numeros = [numero_tarjeta_determinista(i) for i in range(args.tarjetas)]
+
+    from Crud.auditoria_cola import cola_auditoria
+    from database.config import async_engine
+    from main import app
+
+    async def ejecutar():
+        # Un solo event loop: el pool asíncrono queda ligado al loop que lo crea.
+        try:
+            resultados = []
+            for clientes in args.clientes:
+                taps = clientes * args.taps
+                resultados.append(
+                    await cargar(app, "distribuidas", numeros, clientes, taps)
+                )
+                resultados.append(
+                    await cargar(app, "misma_tarjeta", numeros[:1], clientes, taps)
+                )
+            return resultados
+        finally:
+            await async_engine.dispose()
+
+    resultados = asyncio.run(ejecutar())
+    cola_auditoria.detener()
+    imprimir_tabla(
+        resultados,
+        ["caso", "clientes", "taps", "taps_s", "p50_ms", "p99_ms", "consistente"],
+    )
+
+
+if __name__ == "__main__":
+    main()
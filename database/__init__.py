@@ -6,6 +6,26 @@ Este módulo contiene la configuración y conexión a la base de datos
 usando SQLAlchemy.
 """
 
-from .config import DATABASE_URL, create_tables, Base, get_db, engine, SessionLocal
+from .config import (
+    DATABASE_URL,
+    create_tables,
+    Base,
+    get_db,
+    engine,
+    SessionLocal,
+    async_engine,
+    AsyncSessionLocal,
+    get_async_db,
+)
 
-__all__ = ["get_db", "create_tables", "DATABASE_URL", "Base", "engine", "SessionLocal"]
+__all__ = [
+    "get_db",
+    "create_tables",
+    "DATABASE_URL",
+    "Base",
+    "engine",
+    "SessionLocal",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+]
@@ -1,11 +1,26 @@
 """
 Configuración de la base de datos PostgreSQL con Neon
+
+También admite SQLite para desarrollo, pruebas y benchmarks locales:
+`DATABASE_URL=sqlite:///archivo.db` usa un archivo y `DATABASE_URL=sqlite://`
+una base temporal en memoria que se descarta al terminar el proceso. En SQLite se activan las llaves foráneas y el esquema
+se crea al iniciar la aplicación (ver `preparar_sqlite`).
 """
 
+import atexit
+import itertools
 import os
+import tempfile
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -26,13 +41,269 @@ if not DATABASE_URL:
         )
     else:
         raise ValueError(
-            "Se requiere DATABASE_URL o las credenciales individuales de la base de datos"
+            "Se requiere DATABASE_URL o las credenciales individuales de la base de datos "
+            "(para desarrollo local: DATABASE_URL=sqlite:// o sqlite:///archivo.db)"
         )
 
-engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True, pool_recycle=300)
+
+def es_sqlite_en_memoria(url: str) -> bool:
+    """Indica si la URL pide una base SQLite en memoria (`sqlite://`, `:memory:`)."""
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def url_sqlite_temporal() -> str:
+    """URL de una base SQLite temporal en RAM, propia de este proceso.
+
+    Una base `:memory:` vive en una sola conexión, y con `cache=shared` las
+    escrituras concurrentes fallan con "database table is locked" sin
+    esperar. En su lugar se usa un archivo en `/dev/shm` (tmpfs, en memoria;
+    si no existe, el directorio temporal del sistema) que admite WAL y espera
+    por los bloqueos como cualquier archivo, y se borra al terminar.
+    """
+    creador = os.getpid()
+    directorio = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    ruta = os.path.join(directorio, f"transporte-{creador}-{uuid.uuid4().hex[:8]}.db")
+
+    def _borrar():
+        # Los workers forkeados heredan este atexit; solo borra el creador.
+        if os.getpid() != creador:
+            return
+        for sufijo in ("", "-wal", "-shm"):
+            try:
+                os.remove(ruta + sufijo)
+            except FileNotFoundError:
+                pass
+
+    atexit.register(_borrar)
+    return f"sqlite:///{ruta}"
+
+
+if es_sqlite_en_memoria(DATABASE_URL):
+    DATABASE_URL = url_sqlite_temporal()
+    # Los procesos hijos (workers, subprocesos de reportes) usan la misma base.
+    os.environ["DATABASE_URL"] = DATABASE_URL
+
+ES_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+
+
+def url_asincrona(url: str) -> str:
+    """
+    Convierte una URL de conexión síncrona a su equivalente con driver asyncio.
+
+    postgresql:// usa asyncpg y sqlite:// usa aiosqlite. Los parámetros de
+    libpq que asyncpg no entiende (sslmode, channel_binding) se adaptan.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode and "ssl" not in query:
+            query["ssl"] = sslmode
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or url_asincrona(DATABASE_URL)
+
+# Pool de conexiones de cada engine (el síncrono y el asíncrono tienen uno
+# propio, y cada worker los suyos): hasta POOL_TAMANO + POOL_DESBORDE
+# conexiones por engine. Ver GET /db/pool/estadisticas para dimensionarlo.
+POOL_TAMANO = int(os.getenv("DB_POOL_TAMANO", "5"))
+POOL_DESBORDE = int(os.getenv("DB_POOL_DESBORDE", "10"))
+POOL_TIMEOUT_SEG = float(os.getenv("DB_POOL_TIMEOUT_SEG", "30"))
+POOL_RECICLAR_SEG = int(os.getenv("DB_POOL_RECICLAR_SEG", "300"))
+# siempre: SELECT 1 en cada checkout; inactivas: solo si la conexión lleva
+# más de POOL_PRE_PING_INACTIVIDAD_SEG sin usarse; nunca: las conexiones
+# caídas se descartan cuando fallan (y por POOL_RECICLAR_SEG).
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "inactivas").lower()
+POOL_PRE_PING_INACTIVIDAD_SEG = float(
+    os.getenv("DB_POOL_PRE_PING_INACTIVIDAD_SEG", "30")
+)
+# Réplicas de solo lectura (URLs separadas por comas) para las peticiones GET.
+REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+# Límite por sentencia en PostgreSQL, en milisegundos (0 = sin límite).
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+if POOL_PRE_PING not in ("siempre", "inactivas", "nunca"):
+    raise ValueError(
+        f"DB_POOL_PRE_PING inválido: {POOL_PRE_PING!r} "
+        "(valores admitidos: siempre, inactivas, nunca)"
+    )
+
+
+def opciones_engine(url: str) -> dict:
+    """Argumentos de `create_engine` / `create_async_engine` según el motor.
+
+    El tamaño, desborde y espera del pool se aplican a todos los motores. En
+    PostgreSQL se agregan el reciclaje y el pre-ping en cada checkout cuando
+    `DB_POOL_PRE_PING=siempre` (el modo `inactivas` lo instala
+    `_configurar_postgresql`). En SQLite las conexiones se comparten entre
+    hilos (threadpool de FastAPI, cola de auditoría).
+    """
+    opciones = {
+        "pool_size": POOL_TAMANO,
+        "max_overflow": POOL_DESBORDE,
+        "pool_timeout": POOL_TIMEOUT_SEG,
+    }
+    if make_url(url).get_backend_name() == "sqlite":
+        opciones["connect_args"] = {"check_same_thread": False}
+    else:
+        opciones["pool_recycle"] = POOL_RECICLAR_SEG
+        opciones["pool_pre_ping"] = POOL_PRE_PING == "siempre"
+    return opciones
+
+
+def _configurar_sqlite(engine_sync):
+    """Llaves foráneas, WAL (lectores sin bloquear al escritor) y espera por bloqueos.
+
+    SQLite admite un solo escritor a la vez y su espera no es equitativa: con
+    decenas de escrituras concurrentes una puede esperar varios segundos, de
+    ahí el `busy_timeout` amplio antes de fallar con "database is locked".
+    """
+
+    @event.listens_for(engine_sync, "connect")
+    def _pragmas(conexion, _registro):
+        cursor = conexion.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute("PRAGMA busy_timeout = 30000")
+        cursor.close()
+
+
+def _configurar_postgresql(engine_sync):
+    """Límite por sentencia y pre-ping de conexiones inactivas.
+
+    El `statement_timeout` se fija con `SET` al abrir cada conexión (y se
+    confirma, para que el rollback al devolverla al pool no lo deshaga) en
+    lugar de con parámetros de arranque, que los poolers como PgBouncer
+    rechazan.
+
+    Con `DB_POOL_PRE_PING=inactivas` solo se verifica la conexión si pasó
+    más de `POOL_PRE_PING_INACTIVIDAD_SEG` en el pool: las que se reutilizan
+    seguido, el caso con carga, no pagan el viaje extra. Si está caída, el
+    pool la descarta y entrega otra.
+    """
+    if STATEMENT_TIMEOUT_MS > 0:
+
+        @event.listens_for(engine_sync, "connect")
+        def _statement_timeout(conexion, _registro):
+            cursor = conexion.cursor()
+            cursor.execute(f"SET statement_timeout = {STATEMENT_TIMEOUT_MS}")
+            cursor.close()
+            conexion.commit()
+
+    if POOL_PRE_PING != "inactivas":
+        return
+
+    @event.listens_for(engine_sync, "checkin")
+    def _devuelta(_conexion, registro):
+        registro.info["devuelta_en"] = time.monotonic()
+
+    @event.listens_for(engine_sync, "checkout")
+    def _verificar(conexion, registro, _proxy):
+        devuelta_en = registro.info.get("devuelta_en")
+        if (
+            devuelta_en is None
+            or time.monotonic() - devuelta_en < POOL_PRE_PING_INACTIVIDAD_SEG
+        ):
+            return
+        try:
+            engine_sync.dialect.do_ping(conexion)
+        except Exception as error:
+            if engine_sync.dialect.is_disconnect(error, conexion, None):
+                raise DisconnectionError() from error
+            raise
+
+
+engine = create_engine(DATABASE_URL, echo=False, **opciones_engine(DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, echo=False, **opciones_engine(ASYNC_DATABASE_URL)
+)
+
+if ES_SQLITE:
+    _configurar_sqlite(engine)
+    _configurar_sqlite(async_engine.sync_engine)
+else:
+    _configurar_postgresql(engine)
+    _configurar_postgresql(async_engine.sync_engine)
+
+# expire_on_commit=False: los objetos devueltos siguen siendo legibles después
+# del commit sin volver a consultar la base de datos fuera del contexto async.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def _engine_replica(url: str):
+    """Engine asíncrono de una réplica, con la misma configuración que la primaria."""
+    if es_sqlite_en_memoria(url):
+        raise ValueError(
+            "Una réplica no puede ser una base en memoria (sqlite://): no "
+            "compartiría datos con la primaria"
+        )
+    url = url_asincrona(url)
+    replica = create_async_engine(url, echo=False, **opciones_engine(url))
+    if make_url(url).get_backend_name() == "sqlite":
+        _configurar_sqlite(replica.sync_engine)
+    else:
+        _configurar_postgresql(replica.sync_engine)
+    return replica
+
+
+async_engines_replica = [_engine_replica(url) for url in REPLICA_URLS]
+_sesiones_replica = [
+    async_sessionmaker(replica, autoflush=False, expire_on_commit=False)
+    for replica in async_engines_replica
+]
+_turno_replica = itertools.count()
+
+# Destino de lectura de la petición en curso. El middleware de réplicas
+# (api/replicas.py) guarda un dict {"replica": bool, "origen": str | None};
+# fuera de una petición (scripts, tareas de fondo) todo va a la primaria.
+destino_lectura: ContextVar[Optional[dict]] = ContextVar(
+    "destino_lectura", default=None
+)
+
+
+def nueva_sesion_asincrona() -> AsyncSession:
+    """Sesión asíncrona para la petición en curso.
+
+    Si la petición es de solo lectura (ver `destino_lectura`) y hay réplicas
+    configuradas, la sesión usa la siguiente réplica (en turno rotativo);
+    si no, la primaria.
+
+    Returns:
+        AsyncSession: Sesión sin abrir; usarla con `async with`.
+    """
+    destino = destino_lectura.get()
+    if destino is not None and destino["replica"] and _sesiones_replica:
+        indice = next(_turno_replica) % len(_sesiones_replica)
+        destino["origen"] = f"replica{indice}"
+        return _sesiones_replica[indice]()
+    if destino is not None:
+        destino["origen"] = "primaria"
+    return AsyncSessionLocal()
+
+
+def lectura_en_replica() -> bool:
+    """Indica si la petición en curso está leyendo de una réplica."""
+    destino = destino_lectura.get()
+    return bool(destino and (destino["origen"] or "").startswith("replica"))
+
+
 Base = declarative_base()
 
 
@@ -47,8 +318,76 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Generador de sesiones asíncronas de base de datos (primaria o réplica,
+    ver `nueva_sesion_asincrona`)
+    """
+    async with nueva_sesion_asincrona() as db:
+        yield db
+
+
 def create_tables():
     """
     Crear todas las tablas definidas en los modelos
     """
+    import Entities  # noqa: F401  (registra todos los modelos en Base.metadata)
+
     Base.metadata.create_all(bind=engine)
+
+
+def preparar_sqlite():
+    """Crea el esquema y los datos de referencia en una base SQLite.
+
+    En PostgreSQL el esquema y los registros fijos se administran aparte; en
+    SQLite (memoria o un archivo nuevo) se crean al iniciar: las tablas, los
+    roles y el usuario al que se atribuyen los eventos de auditoría. Las
+    réplicas SQLite solo reciben el esquema; los datos les llegan con
+    `scripts/replicar_sqlite.py`.
+
+    Con varios workers cada uno lo ejecuta al iniciar sobre la misma base:
+    todo ocurre en una transacción `BEGIN IMMEDIATE` (en SQLite el DDL es
+    transaccional), así que los demás esperan el bloqueo y encuentran el
+    esquema y las filas ya creados.
+    """
+    import Entities  # noqa: F401  (registra todos los modelos en Base.metadata)
+    from sqlalchemy.dialects.sqlite import insert as insert_sqlite
+
+    from Crud.auditoria_crud import ID_USUARIO_AUDITORIA
+    from Entities.roles import Rol
+    from Entities.usuario import Usuario
+
+    for url in REPLICA_URLS:
+        # Una réplica SQLite es otro archivo: necesita el esquema para
+        # responder antes de recibir la primera copia de la primaria.
+        if make_url(url).get_backend_name() == "sqlite":
+            replica = create_engine(url, **opciones_engine(url))
+            with replica.connect() as conexion:
+                conexion.exec_driver_sql("BEGIN IMMEDIATE")
+                Base.metadata.create_all(bind=conexion)
+                conexion.commit()
+            replica.dispose()
+    with engine.connect() as conexion:
+        conexion.exec_driver_sql("BEGIN IMMEDIATE")
+        Base.metadata.create_all(bind=conexion)
+        conexion.execute(
+            insert_sqlite(Rol)
+            .values(
+                [{"id_rol": 1, "nombre": "admin"}, {"id_rol": 2, "nombre": "cliente"}]
+            )
+            .on_conflict_do_nothing()
+        )
+        conexion.execute(
+            insert_sqlite(Usuario)
+            .values(
+                id_usuario=ID_USUARIO_AUDITORIA,
+                id_rol=1,
+                nombre="Auditoria",
+                apellido="Sistema",
+                documento="AUDITORIA",
+                email="auditoria@sistema.local",
+                contrasena="!",
+            )
+            .on_conflict_do_nothing()
+        )
+        conexion.commit()
@@ -0,0 +1,182 @@
+"""
+Particiones mensuales en PostgreSQL
+===================================
+
+Utilidades para tablas particionadas por rango de fecha
+(`PARTITION BY RANGE (columna)`) con una partición por mes
+(`<tabla>_pAAAAMM`) y una partición por defecto (`<tabla>_default`) que
+recibe las filas de los meses que aún no tienen partición: una inserción
+nunca falla aunque el trabajo que crea las particiones no se haya ejecutado
+a tiempo.
+
+Crear la partición de un mes mueve a ella las filas de ese mes que hubieran
+caído en la partición por defecto. Quitar un mes completo es un `DROP TABLE`
+de su partición, sin filas muertas que limpiar con VACUUM.
+
+Las funciones reciben una conexión síncrona y no hacen commit; en motores
+distintos de PostgreSQL no hacen nada.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Meses posteriores al actual cuya partición se crea por adelantado.
+MESES_ADELANTADOS = 2
+
+
+def inicio_mes(fecha: Union[date, datetime]) -> date:
+    """Primer día del mes de `fecha`."""
+    return date(fecha.year, fecha.month, 1)
+
+
+def sumar_meses(mes: date, meses: int) -> date:
+    """Primer día del mes que está `meses` después (o antes, si es negativo)."""
+    indice = mes.year * 12 + mes.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nombre_particion(tabla: str, mes: date) -> str:
+    """Nombre de la partición de un mes, p. ej. `auditoria_p202610`."""
+    return f"{tabla}_p{mes:%Y%m}"
+
+
+def es_particionada(conexion: Connection, tabla: str) -> bool:
+    """Indica si `tabla` es una tabla particionada de PostgreSQL."""
+    if conexion.dialect.name != "postgresql":
+        return False
+    return bool(
+        conexion.scalar(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:tabla))"
+            ),
+            {"tabla": tabla},
+        )
+    )
+
+
+def particiones_mensuales(conexion: Connection, tabla: str) -> Dict[date, str]:
+    """Particiones mensuales de `tabla`, indexadas por el primer día del mes.
+
+    Returns:
+        dict: {mes: nombre de la partición}; vacío si la tabla no está
+        particionada.
+    """
+    if not es_particionada(conexion, tabla):
+        return {}
+    nombres = conexion.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:tabla)"
+        ),
+        {"tabla": tabla},
+    )
+    prefijo = f"{tabla}_p"
+    particiones = {}
+    for nombre in nombres:
+        sufijo = nombre[len(prefijo) :]
+        if nombre.startswith(prefijo) and len(sufijo) == 6 and sufijo.isdigit():
+            particiones[date(int(sufijo[:4]), int(sufijo[4:]), 1)] = nombre
+    return particiones
+
+
+def crear_particion_mensual(
+    conexion: Connection, tabla: str, columna: str, mes: date
+) -> bool:
+    """Crea la partición de un mes, con las filas que ya estuvieran en la
+    partición por defecto.
+
+    La partición se crea como tabla independiente, recibe las filas del mes
+    desde la partición por defecto y se adjunta con `ATTACH PARTITION`, que
+    le agrega los índices, la llave primaria y las llaves foráneas de la
+    tabla padre.
+
+    Args:
+        conexion (Connection): Conexión a PostgreSQL.
+        tabla (str): Tabla particionada.
+        columna (str): Columna de fecha por la que se particiona.
+        mes (date): Primer día del mes.
+
+    Returns:
+        bool: True si se creó la partición, False si ya existía.
+    """
+    if mes in particiones_mensuales(conexion, tabla):
+        return False
+    citar = conexion.dialect.identifier_preparer.quote
+    padre, columna = citar(tabla), citar(columna)
+    particion = citar(nombre_particion(tabla, mes))
+    desde, hasta = mes.isoformat(), sumar_meses(mes, 1).isoformat()
+
+    conexion.exec_driver_sql(
+        f"CREATE TABLE {particion} (LIKE {padre} INCLUDING DEFAULTS)"
+    )
+    defecto = f"{tabla}_default"
+    if conexion.scalar(text("SELECT to_regclass(:nombre)"), {"nombre": defecto}):
+        conexion.exec_driver_sql(
+            f"WITH movidas AS (DELETE FROM {citar(defecto)} "
+            f"WHERE {columna} >= '{desde}' AND {columna} < '{hasta}' RETURNING *) "
+            f"INSERT INTO {particion} SELECT * FROM movidas"
+        )
+    conexion.exec_driver_sql(
+        f"ALTER TABLE {padre} ATTACH PARTITION {particion} "
+        f"FOR VALUES FROM ('{desde}') TO ('{hasta}')"
+    )
+    return True
+
+
+def asegurar_particiones(
+    conexion: Connection,
+    tabla: str,
+    columna: str,
+    hoy: Optional[date] = None,
+    meses_adelantados: int = MESES_ADELANTADOS,
+) -> List[date]:
+    """Crea la partición por defecto y las del mes actual y los siguientes.
+
+    Un bloqueo consultivo por tabla evita que dos procesos creen la misma
+    partición a la vez.
+
+    Args:
+        conexion (Connection): Conexión a la base de datos.
+        tabla (str): Tabla particionada.
+        columna (str): Columna de fecha por la que se particiona.
+        hoy (date, optional): Fecha de referencia; por defecto, hoy.
+        meses_adelantados (int): Meses posteriores al actual a preparar.
+
+    Returns:
+        List[date]: Meses cuya partición se creó.
+    """
+    if not es_particionada(conexion, tabla):
+        return []
+    conexion.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:tabla))"), {"tabla": tabla}
+    )
+    citar = conexion.dialect.identifier_preparer.quote
+    conexion.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {citar(tabla + '_default')} "
+        f"PARTITION OF {citar(tabla)} DEFAULT"
+    )
+    actual = inicio_mes(hoy or date.today())
+    return [
+        mes
+        for mes in (sumar_meses(actual, i) for i in range(meses_adelantados + 1))
+        if crear_particion_mensual(conexion, tabla, columna, mes)
+    ]
+
+
+def eliminar_particion(conexion: Connection, tabla: str, mes: date) -> bool:
+    """Elimina la partición de un mes con todas sus filas.
+
+    Returns:
+        bool: True si la partición existía.
+    """
+    particion = particiones_mensuales(conexion, tabla).get(mes)
+    if particion is None:
+        return False
+    citar = conexion.dialect.identifier_preparer.quote
+    conexion.exec_driver_sql(f"DROP TABLE {citar(particion)}")
+    return True
@@ -6,12 +6,36 @@ Aplicación FastAPI para el manejo del sistema de transporte público.
 Incluye endpoints para Transporte, Parada, Empleado y AsignacionT.
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import TimeoutError as TimeoutPool
 from pydantic import ValidationError
 
 import Entities
+from Crud.auditoria_cola import cola_auditoria
+from Crud.cache import estadisticas_cache
+from Crud.seguridad import pool_hashing
+from database.config import (
+    ES_SQLITE,
+    async_engine,
+    async_engines_replica,
+    engine,
+    preparar_sqlite,
+)
+from api.depuracion import DEBUG_CONSULTAS, activar_depuracion_consultas
+from api.calentamiento import CALENTAR_AL_INICIAR, calentar
+from api.replicas import MiddlewareReplicas
+from api.metricas import (
+    CONTENT_TYPE_METRICAS,
+    MiddlewareMetricas,
+    estadisticas_componentes,
+    instrumentar_engine,
+    metricas,
+)
 
 from api.routers import (
     transporte,
@@ -24,24 +48,61 @@ from api.routers import (
     ruta,
     usuarios,
     auditoria,
+    reporte,
 )
 
 from api.exception_handlers import (
     validation_exception_handler,
     integrity_error_handler,
+    pool_timeout_handler,
     http_exception_handler,
     general_exception_handler,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ciclo de vida de la aplicación: esquema en SQLite, cola de auditoría,
+    bcrypt, calentamiento y pools asíncronos (primaria y réplicas)."""
+    if ES_SQLITE:
+        preparar_sqlite()
+    cola_auditoria.iniciar()
+    pool_hashing.iniciar()
+    if CALENTAR_AL_INICIAR:
+        await calentar(app)
+    yield
+    await asyncio.to_thread(cola_auditoria.detener)
+    await asyncio.to_thread(pool_hashing.cerrar)
+    await async_engine.dispose()
+    for replica in async_engines_replica:
+        await replica.dispose()
+
+
 app = FastAPI(
     title="Sistema de Transporte Público API",
     description="API REST para el manejo del sistema de transporte público",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 
+instrumentar_engine(engine, "sync")
+instrumentar_engine(async_engine.sync_engine, "async")
+for indice, replica in enumerate(async_engines_replica):
+    instrumentar_engine(replica.sync_engine, f"replica{indice}")
+
+app.add_middleware(MiddlewareMetricas)
+if DEBUG_CONSULTAS:
+    activar_depuracion_consultas(
+        app,
+        engine,
+        async_engine.sync_engine,
+        *(replica.sync_engine for replica in async_engines_replica),
+    )
+if async_engines_replica:
+    app.add_middleware(MiddlewareReplicas)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -53,6 +114,7 @@ app.add_middleware(
 
 app.add_exception_handler(ValidationError, validation_exception_handler)
 app.add_exception_handler(IntegrityError, integrity_error_handler)
+app.add_exception_handler(TimeoutPool, pool_timeout_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
@@ -69,6 +131,7 @@ app.include_router(
 )
 app.include_router(linea.router, prefix="/api/lineas", tags=["Lineas"])
 app.include_router(ruta.router, prefix="/api/rutas", tags=["Rutas"])
+app.include_router(reporte.router, prefix="/api/reportes", tags=["Reportes"])
 
 
 @app.get("/")
@@ -88,6 +151,26 @@ async def health_check():
     return {"status": "healthy", "message": "API is running"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas de peticiones, base de datos y componentes en formato Prometheus."""
+    return Response(
+        metricas.texto(estadisticas_componentes()), media_type=CONTENT_TYPE_METRICAS
+    )
+
+
+@app.get("/cache/estadisticas")
+async def cache_estadisticas():
+    """Aciertos, fallos y tamaño de las cachés de entidades."""
+    return estadisticas_cache()
+
+
+@app.get("/db/pool/estadisticas")
+async def pool_estadisticas():
+    """Ocupación, esperas y timeouts del pool de conexiones de cada engine."""
+    return metricas.estadisticas_pool()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,76 @@
+"""
+Archivar la auditoría
+=====================
+
+Aplica la política de retención de la tabla de auditoría (ver
+`Crud/auditoria_archivo.py`): crea las particiones de los próximos meses y
+mueve los meses anteriores a la retención a archivos `.jsonl.gz` (o
+`.csv.gz`) en `AUDITORIA_ARCHIVO_DIR`; los registros tardíos de un mes ya
+archivado van a una parte nueva. Pensado para ejecutarse a diario
+desde cron o un temporizador; si no hay nada que archivar no hace cambios.
+
+Uso:
+    python -m scripts.archivar_auditoria
+    python -m scripts.archivar_auditoria --retencion 6 --formato csv
+    python -m scripts.archivar_auditoria --simular
+"""
+
+import argparse
+
+import Entities  # noqa: F401  (registra todos los modelos)
+from Crud.auditoria_archivo import (
+    DIRECTORIO_ARCHIVO,
+    EXTENSIONES_ARCHIVO,
+    RETENCION_MESES,
+    archivar,
+    limite_retencion,
+    meses_por_archivar,
+)
+from database.config import engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--retencion",
+        type=int,
+        default=RETENCION_MESES,
+        help="Meses completos que se conservan en la base además del mes en curso",
+    )
+    parser.add_argument(
+        "--formato", choices=sorted(EXTENSIONES_ARCHIVO), default="ndjson"
+    )
+    parser.add_argument("--directorio", default=DIRECTORIO_ARCHIVO)
+    parser.add_argument(
+        "--simular",
+        action="store_true",
+        help="Solo muestra los meses que se archivarían",
+    )
+    args = parser.parse_args()
+    if args.retencion < 0:
+        parser.error("'--retencion' no puede ser negativa")
+
+    with engine.connect() as conexion:
+        if args.simular:
+            limite = limite_retencion(retencion_meses=args.retencion)
+            meses = meses_por_archivar(conexion, limite)
+            print(f"Se conservan los registros desde {limite:%Y-%m}")
+            for mes in meses:
+                print(f"  {mes:%Y-%m}")
+            if not meses:
+                print("  Nada que archivar")
+            return
+
+        resultados = archivar(conexion, args.retencion, args.formato, args.directorio)
+    for resultado in resultados:
+        print(
+            f"{resultado['mes']}: {resultado['filas']} registros "
+            f"-> {resultado['archivo'] or '(sin registros)'} "
+            f"({resultado['bytes']} bytes, {resultado['metodo']})"
+        )
+    if not resultados:
+        print("Nada que archivar")
+
+
+if __name__ == "__main__":
+    main()
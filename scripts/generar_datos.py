@@ -0,0 +1,655 @@
+"""
+Generador de datos sintéticos a gran escala
+===========================================
+
+Carga volúmenes de prueba referencialmente consistentes: líneas con sus
+rutas, paradas, transportes, empleados, usuarios con una tarjeta cada uno,
+asignaciones y transacciones. Al final reconstruye el resumen diario de
+transacciones del rango generado.
+
+Cada tabla se divide en bloques que cargan varios procesos en paralelo. En
+PostgreSQL (psycopg2) cada bloque se carga con `COPY ... FROM STDIN`; en los
+demás motores, con INSERT multi-fila por lotes. Las filas se generan a
+partir de una semilla por bloque, así que una misma configuración (incluido
+`--bloque`) produce siempre los mismos datos sin importar el número de
+procesos. Los IDs usan
+un rango propio de UUID, distinto del de los benchmarks y de los uuid4 de
+la API; los bloques ya cargados se omiten, de modo que una carga
+interrumpida se puede retomar con el mismo comando.
+
+Distribuciones configurables:
+
+- Uso de tarjetas: uniforme o Zipf (`--zipf-s`), con pocos usuarios muy
+  frecuentes y una cola larga de usuarios ocasionales.
+- Tipos de tarjeta por peso (`--tipos-tarjeta Normal=60,Estudiante=30,...`).
+- Proporción de recargas frente a pagos (`--proporcion-recargas`).
+- Fechas repartidas en `--dias` días desde `--desde`, con picos en las horas
+  de mayor afluencia.
+
+La carga escala con `--trabajadores` mientras el servidor tenga núcleos
+libres: cada proceso genera y envía del orden de 30 mil filas por segundo.
+Con `--sin-verificar-fk` el COPY omite los triggers de llaves foráneas
+(`session_replication_role = replica`, requiere superusuario), que son
+cerca del 40 % del costo de cargar transacciones.
+
+El saldo de las tarjetas es sintético: no se calcula a partir de sus
+transacciones.
+
+Uso:
+    DATABASE_URL=postgresql://... python -m scripts.generar_datos \\
+        --usuarios 1000000 --transacciones 100000000 --trabajadores 8
+"""
+
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import random
+import time
+import uuid
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from math import floor, gcd
+
+from sqlalchemy import func, insert, select
+
+import Entities  # noqa: F401  (registra todos los modelos)
+from Crud.numeracion import digito_luhn
+from Crud.reporte_crud import ReporteCRUD
+from Crud.seguridad import hash_contrasena
+from Crud.tarjeta_crud import TARIFA_PASAJE
+from database.config import SessionLocal, create_tables, engine
+from Entities.asignacionT import AsignacionT
+from Entities.empleado import Empleado
+from Entities.linea import Linea
+from Entities.parada import Parada
+from Entities.roles import Rol
+from Entities.ruta import Ruta
+from Entities.tarjeta import Tarjeta
+from Entities.transaccion import Transaccion
+from Entities.transporte import Transporte
+from Entities.usuario import Usuario
+
+CONTRASENA_GENERADA = "generado123"
+PREFIJO_TARJETA_GENERADA = "6"
+
+_PREFIJOS = {
+    Linea: 1,
+    Ruta: 2,
+    Parada: 3,
+    Transporte: 4,
+    Empleado: 5,
+    Usuario: 6,
+    Tarjeta: 7,
+    AsignacionT: 8,
+    Transaccion: 9,
+}
+
+# Peso relativo de cada hora del día: picos de 6 a 8 y de 17 a 19.
+PESOS_HORA = [
+    int(peso)
+    for peso in "1 1 1 1 2 6 14 16 12 7 6 6 7 7 6 7 10 15 16 11 7 5 3 2".split()
+]
+MONTOS_RECARGA = [10_000.0, 20_000.0, 50_000.0, 100_000.0]
+PESOS_RECARGA = [40, 35, 20, 5]
+
+# Pesos acumulados para elegir con `bisect`: `random.choices` los recalcula
+# en cada llamada, y en las transacciones eso domina el tiempo de generación.
+_ACUMULADO_HORA = list(accumulate(PESOS_HORA))
+_ACUMULADO_RECARGA = list(accumulate(PESOS_RECARGA))
+
+
+def id_generado(modelo, indice: int) -> uuid.UUID:
+    """UUID reproducible de la fila `indice` de un modelo generado."""
+    return uuid.UUID(int=((0xC0 + _PREFIJOS[modelo]) << 120) | (indice + 1))
+
+
+@lru_cache(maxsize=1 << 18)
+def numero_tarjeta_generada(indice: int) -> str:
+    """Número de 16 dígitos con dígito de control Luhn de la tarjeta `indice`."""
+    parcial = f"{PREFIJO_TARJETA_GENERADA}{indice:014d}"
+    return parcial + digito_luhn(parcial)
+
+
+def leer_pesos(texto: str) -> dict:
+    """Convierte "Normal=60,Estudiante=30" en {"Normal": 60.0, "Estudiante": 30.0}."""
+    pesos = {}
+    for parte in texto.split(","):
+        nombre, _, peso = parte.partition("=")
+        pesos[nombre.strip()] = float(peso or 1)
+    return pesos
+
+
+class SelectorZipf:
+    """Índices en [0, n) con distribución de Zipf de exponente `s`.
+
+    Usa la inversa de la distribución continua acotada, que no necesita
+    tablas de n pesos. El rango k se reparte con un salto coprimo con n para
+    que los usuarios más frecuentes no sean los primeros IDs.
+    """
+
+    def __init__(self, n: int, s: float):
+        self.n = n
+        self.s = s
+        self._salto = next(
+            p for p in (7919, 104729, 1299709, 15485863) if gcd(p, n) == 1
+        )
+        if s != 1:
+            self._base = n ** (1 - s) - 1
+
+    def elegir(self, azar: random.Random) -> int:
+        u = azar.random()
+        if self.s == 1:
+            rango = floor(self.n**u)
+        else:
+            rango = floor((self._base * u + 1) ** (1 / (1 - self.s)))
+        return ((min(max(rango, 1), self.n) - 1) * self._salto) % self.n
+
+
+# --- Fábricas de filas -------------------------------------------------------
+#
+# Cada fábrica recibe el índice de la fila, un generador aleatorio del bloque
+# y la configuración, y devuelve una tupla en el orden de COLUMNAS[modelo].
+
+COLUMNAS = {
+    Linea: [
+        "id_linea",
+        "nombre",
+        "descripcion",
+        "fecha_creacion",
+        "fecha_actualizacion",
+    ],
+    Ruta: [
+        "id_ruta",
+        "id_linea",
+        "nombre",
+        "origen",
+        "destino",
+        "duracion_estimada",
+        "fecha_creacion",
+        "fecha_actualizacion",
+    ],
+    Parada: [
+        "id_parada",
+        "nombre",
+        "direccion",
+        "coordenadas",
+        "estado",
+        "fecha_registro",
+        "fecha_actualizar",
+    ],
+    Transporte: [
+        "id_transporte",
+        "tipo",
+        "placa",
+        "capacidad",
+        "estado",
+        "id_linea",
+        "fecha_registro",
+        "fecha_actualizar",
+    ],
+    Empleado: [
+        "id_empleado",
+        "nombre",
+        "apellido",
+        "documento",
+        "email",
+        "rol",
+        "estado",
+        "fecha_registro",
+        "fecha_actualizar",
+    ],
+    Usuario: [
+        "id_usuario",
+        "id_rol",
+        "nombre",
+        "apellido",
+        "documento",
+        "email",
+        "contrasena",
+        "fecha_registro",
+        "fecha_actualizar",
+    ],
+    Tarjeta: [
+        "id_tarjeta",
+        "id_usuario",
+        "tipo_tarjeta",
+        "numero_tarjeta",
+        "estado",
+        "fecha_ultima_recarga",
+        "saldo",
+    ],
+    AsignacionT: [
+        "id_asignacion",
+        "id_usuario",
+        "id_empleado",
+        "id_transporte",
+        "id_ruta",
+        "fecha_registro",
+        "fecha_actualizar",
+    ],
+    Transaccion: [
+        "id_transaccion",
+        "numero_tarjeta",
+        "tipo_transaccion",
+        "monto",
+        "fecha_transaccion",
+    ],
+}
+
+NOMBRES = [
+    "Ana",
+    "Luis",
+    "Carlos",
+    "Maria",
+    "Juan",
+    "Laura",
+    "Pedro",
+    "Sofia",
+    "Diego",
+    "Valentina",
+]
+APELLIDOS = [
+    "Gomez",
+    "Rodriguez",
+    "Lopez",
+    "Martinez",
+    "Garcia",
+    "Perez",
+    "Sanchez",
+    "Ramirez",
+]
+
+
+def _linea(i, azar, cfg):
+    return (
+        id_generado(Linea, i),
+        f"Linea G{i}",
+        "Generada",
+        cfg["ahora"],
+        cfg["ahora"],
+    )
+
+
+def _ruta(i, azar, cfg):
+    linea = i // cfg["rutas_por_linea"]
+    return (
+        id_generado(Ruta, i),
+        id_generado(Linea, linea),
+        f"Ruta G{linea}-{i % cfg['rutas_por_linea']}",
+        f"Parada G{azar.randrange(cfg['paradas'])}",
+        f"Parada G{azar.randrange(cfg['paradas'])}",
+        float(azar.randint(15, 120)),
+        cfg["ahora"],
+        cfg["ahora"],
+    )
+
+
+def _parada(i, azar, cfg):
+    return (
+        id_generado(Parada, i),
+        f"Parada G{i}",
+        f"Calle {azar.randint(1, 200)} # {azar.randint(1, 99)}-{azar.randint(1, 99)}",
+        f"{azar.uniform(4.5, 4.8):.6f};{azar.uniform(-74.2, -74.0):.6f}",
+        "Activa" if azar.random() < 0.95 else "Inactiva",
+        cfg["ahora"],
+        cfg["ahora"],
+    )
+
+
+def _transporte(i, azar, cfg):
+    tipo = azar.choices(("Bus", "Metro", "Tranvia"), (70, 20, 10))[0]
+    return (
+        id_generado(Transporte, i),
+        tipo,
+        f"GEN{i:07d}",
+        {"Bus": 80, "Metro": 900, "Tranvia": 250}[tipo],
+        "Activo" if azar.random() < 0.9 else "Inactivo",
+        id_generado(Linea, azar.randrange(cfg["lineas"])),
+        cfg["ahora"],
+        cfg["ahora"],
+    )
+
+
+def _empleado(i, azar, cfg):
+    return (
+        id_generado(Empleado, i),
+        azar.choice(NOMBRES),
+        azar.choice(APELLIDOS),
+        f"GE{i:010d}",
+        f"empleado{i}@generado.co",
+        azar.choices(("Conductor", "Supervisor", "Mecanico"), (80, 12, 8))[0],
+        "Activo" if azar.random() < 0.9 else "Inactivo",
+        cfg["ahora"],
+        cfg["ahora"],
+    )
+
+
+def _usuario(i, azar, cfg):
+    registro = cfg["desde"] - timedelta(days=azar.randrange(730))
+    return (
+        id_generado(Usuario, i),
+        2,
+        azar.choice(NOMBRES),
+        azar.choice(APELLIDOS),
+        f"G{i:011d}",
+        f"usuario{i}@generado.co",
+        cfg["contrasena"],
+        registro,
+        registro,
+    )
+
+
+def _tarjeta(i, azar, cfg):
+    tipos, pesos = cfg["tipos_tarjeta"]
+    return (
+        id_generado(Tarjeta, i),
+        id_generado(Usuario, i),
+        azar.choices(tipos, pesos)[0],
+        numero_tarjeta_generada(i),
+        "Activa" if azar.random() < 0.97 else "Inactiva",
+        cfg["desde"],
+        float(azar.randrange(0, 200_000, 100)),
+    )
+
+
+def _asignacion(i, azar, cfg):
+    return (
+        id_generado(AsignacionT, i),
+        id_generado(Usuario, azar.randrange(cfg["usuarios"])),
+        id_generado(Empleado, azar.randrange(cfg["empleados"])),
+        id_generado(Transporte, azar.randrange(cfg["transportes"])),
+        id_generado(Ruta, azar.randrange(cfg["lineas"] * cfg["rutas_por_linea"])),
+        cfg["ahora"],
+        cfg["ahora"],
+    )
+
+
+def _transaccion(i, azar, cfg):
+    selector = cfg["selector_tarjetas"]
+    tarjeta = selector.elegir(azar) if selector else azar.randrange(cfg["usuarios"])
+    if azar.random() < cfg["proporcion_recargas"]:
+        recarga = bisect(_ACUMULADO_RECARGA, azar.random() * _ACUMULADO_RECARGA[-1])
+        tipo, monto = "Recarga", MONTOS_RECARGA[recarga]
+    else:
+        tipo, monto = "Pago", cfg["tarifa"]
+    hora = bisect(_ACUMULADO_HORA, azar.random() * _ACUMULADO_HORA[-1])
+    fecha = cfg["desde"] + timedelta(
+        days=azar.randrange(cfg["dias"]), hours=hora + azar.random()
+    )
+    return (
+        id_generado(Transaccion, i),
+        numero_tarjeta_generada(tarjeta),
+        tipo,
+        monto,
+        fecha,
+    )
+
+
+FABRICAS = {
+    Linea: _linea,
+    Ruta: _ruta,
+    Parada: _parada,
+    Transporte: _transporte,
+    Empleado: _empleado,
+    Usuario: _usuario,
+    Tarjeta: _tarjeta,
+    AsignacionT: _asignacion,
+    Transaccion: _transaccion,
+}
+
+# Orden de carga: cada tabla solo referencia a las anteriores.
+ORDEN_CARGA = [
+    Linea,
+    Ruta,
+    Parada,
+    Transporte,
+    Empleado,
+    Usuario,
+    Tarjeta,
+    AsignacionT,
+    Transaccion,
+]
+
+
+# --- Carga por bloques -------------------------------------------------------
+
+_cfg = None
+
+
+def _iniciar_trabajador(cfg):
+    """Inicializa un proceso: configuración y pool de conexiones propio."""
+    global _cfg
+    _cfg = cfg
+    # Las conexiones heredadas del proceso padre no se deben reutilizar.
+    engine.dispose(close=False)
+
+
+def _copiar(tabla, columnas, filas, sin_verificar_fk):
+    conexion = engine.raw_connection()
+    try:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(filas)
+        buffer.seek(0)
+        with conexion.cursor() as cursor:
+            if sin_verificar_fk:
+                # Desactiva los triggers de llaves foráneas de esta sesión: las
+                # filas generadas son consistentes por construcción.
+                cursor.execute("SET session_replication_role = replica")
+            cursor.copy_expert(
+                f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        conexion.commit()
+    finally:
+        conexion.close()
+
+
+def _insertar(modelo, columnas, filas, filas_por_insert):
+    with engine.begin() as conexion:
+        for inicio in range(0, len(filas), filas_por_insert):
+            conexion.execute(
+                insert(modelo),
+                [
+                    dict(zip(columnas, f))
+                    for f in filas[inicio : inicio + filas_por_insert]
+                ],
+            )
+
+
+def cargar_bloque(tarea) -> int:
+    """Genera y carga las filas [inicio, fin) de un modelo.
+
+    Args:
+        tarea (tuple): (nombre del modelo, inicio, fin).
+
+    Las filas del bloque que ya existen (de una carga anterior, quizá con
+    otro tamaño de bloque) se omiten; sus IDs forman un rango contiguo.
+
+    Returns:
+        int: Filas cargadas (0 si el bloque ya estaba cargado).
+    """
+    nombre, inicio, fin = tarea
+    modelo = next(m for m in ORDEN_CARGA if m.__name__ == nombre)
+    llave = next(iter(modelo.__table__.primary_key.columns))
+    rango = llave.between(id_generado(modelo, inicio), id_generado(modelo, fin - 1))
+    with engine.connect() as conexion:
+        existentes = conexion.scalar(select(func.count()).where(rango))
+        if existentes == fin - inicio:
+            return 0
+        if existentes:
+            existentes = set(conexion.scalars(select(llave).where(rango)))
+
+    azar = random.Random(f"{_cfg['semilla']}:{nombre}:{inicio}")
+    fabrica = FABRICAS[modelo]
+    filas = [fabrica(i, azar, _cfg) for i in range(inicio, fin)]
+    if existentes:
+        filas = [fila for fila in filas if fila[0] not in existentes]
+    columnas = COLUMNAS[modelo]
+    if _cfg["copy"]:
+        _copiar(modelo.__tablename__, columnas, filas, _cfg["sin_verificar_fk"])
+    else:
+        _insertar(modelo, columnas, filas, _cfg["filas_por_insert"])
+    return len(filas)
+
+
+def preparar_roles():
+    """Crea las tablas y los roles que referencian los usuarios generados."""
+    create_tables()
+    with SessionLocal() as db:
+        if not db.get(Rol, 1):
+            db.add(Rol(id_rol=1, nombre="admin"))
+        if not db.get(Rol, 2):
+            db.add(Rol(id_rol=2, nombre="cliente"))
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--usuarios", type=int, default=100_000, help="Usuarios (y tarjetas)"
+    )
+    parser.add_argument("--transacciones", type=int, default=1_000_000)
+    parser.add_argument("--lineas", type=int, default=20)
+    parser.add_argument("--rutas-por-linea", type=int, default=4)
+    parser.add_argument("--paradas", type=int, default=2_000)
+    parser.add_argument("--transportes", type=int, default=1_000)
+    parser.add_argument("--empleados", type=int, default=2_000)
+    parser.add_argument("--asignaciones", type=int, default=5_000)
+    parser.add_argument(
+        "--tipos-tarjeta",
+        default="Normal=60,Estudiante=30,Frecuente=10",
+        help="Pesos de los tipos de tarjeta",
+    )
+    parser.add_argument(
+        "--zipf-s",
+        type=float,
+        default=1.1,
+        help="Exponente de Zipf del uso de las tarjetas; 0 = uniforme",
+    )
+    parser.add_argument("--proporcion-recargas", type=float, default=0.2)
+    parser.add_argument(
+        "--desde",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=365),
+        help="Primer día de las transacciones (AAAA-MM-DD)",
+    )
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument(
+        "--trabajadores",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos de carga",
+    )
+    parser.add_argument("--bloque", type=int, default=50_000, help="Filas por bloque")
+    parser.add_argument(
+        "--sin-copy",
+        action="store_true",
+        help="Usar INSERT multi-fila también en PostgreSQL",
+    )
+    parser.add_argument(
+        "--sin-verificar-fk",
+        action="store_true",
+        help="Con COPY, no verificar llaves foráneas fila por fila (requiere superusuario)",
+    )
+    parser.add_argument(
+        "--sin-resumen", action="store_true", help="No reconstruir el resumen diario"
+    )
+    args = parser.parse_args()
+
+    usar_copy = (
+        engine.dialect.name == "postgresql"
+        and engine.dialect.driver == "psycopg2"
+        and not args.sin_copy
+    )
+    trabajadores = args.trabajadores
+    if engine.dialect.name == "sqlite" and trabajadores > 1:
+        print("SQLite admite un solo escritor: se usa un proceso")
+        trabajadores = 1
+
+    tipos = leer_pesos(args.tipos_tarjeta)
+    desde = datetime.combine(args.desde, datetime.min.time())
+    cfg = {
+        "semilla": args.semilla,
+        "ahora": datetime.now().replace(microsecond=0),
+        "desde": desde,
+        "dias": args.dias,
+        "usuarios": args.usuarios,
+        "lineas": args.lineas,
+        "rutas_por_linea": args.rutas_por_linea,
+        "paradas": args.paradas,
+        "transportes": args.transportes,
+        "empleados": args.empleados,
+        "tipos_tarjeta": (list(tipos), list(tipos.values())),
+        "selector_tarjetas": (
+            SelectorZipf(args.usuarios, args.zipf_s) if args.zipf_s > 0 else None
+        ),
+        "proporcion_recargas": args.proporcion_recargas,
+        "tarifa": TARIFA_PASAJE,
+        "copy": usar_copy,
+        "sin_verificar_fk": args.sin_verificar_fk,
+        # Límite de parámetros por sentencia (SQLite admite 32766).
+        "filas_por_insert": 1000,
+        "contrasena": hash_contrasena(CONTRASENA_GENERADA),
+    }
+    cantidades = {
+        Linea: args.lineas,
+        Ruta: args.lineas * args.rutas_por_linea,
+        Parada: args.paradas,
+        Transporte: args.transportes,
+        Empleado: args.empleados,
+        Usuario: args.usuarios,
+        Tarjeta: args.usuarios,
+        AsignacionT: args.asignaciones,
+        Transaccion: args.transacciones,
+    }
+
+    preparar_roles()
+    print(
+        f"Carga con {'COPY' if usar_copy else 'INSERT multi-fila'} en "
+        f"{engine.dialect.name}, {trabajadores} procesos, bloques de {args.bloque} filas"
+    )
+    resultados = []
+    inicio_total = time.perf_counter()
+    contexto = multiprocessing.get_context()
+    with contexto.Pool(
+        trabajadores, initializer=_iniciar_trabajador, initargs=(cfg,)
+    ) as pool:
+        for modelo in ORDEN_CARGA:
+            cantidad = cantidades[modelo]
+            tareas = [
+                (modelo.__name__, inicio, min(inicio + args.bloque, cantidad))
+                for inicio in range(0, cantidad, args.bloque)
+            ]
+            inicio = time.perf_counter()
+            cargadas = sum(pool.imap_unordered(cargar_bloque, tareas))
+            segundos = time.perf_counter() - inicio
+            resultados.append((modelo.__tablename__, cargadas, segundos))
+            print(
+                f"  {modelo.__tablename__:<14} {cargadas:>12,} filas  {segundos:8.1f} s  "
+                f"{cargadas / segundos if segundos else 0:>10,.0f} filas/s"
+            )
+    total = sum(r[1] for r in resultados)
+    segundos_total = time.perf_counter() - inicio_total
+    print(
+        f"Total: {total:,} filas en {segundos_total:.1f} s "
+        f"({total / segundos_total if segundos_total else 0:,.0f} filas/s)"
+    )
+
+    if not args.sin_resumen and args.transacciones:
+        inicio = time.perf_counter()
+        with SessionLocal() as db:
+            escritas = ReporteCRUD(db).recalcular_resumen(
+                args.desde, args.desde + timedelta(days=args.dias - 1)
+            )
+        print(
+            f"Resumen diario: {escritas} filas en {time.perf_counter() - inicio:.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Recalcular el resumen diario de transacciones
+=============================================
+
+Reconstruye `resumen_transacciones_diario` a partir de la tabla de
+transacciones. Se usa para la carga inicial (transacciones anteriores al
+resumen) y para corregir días ya cerrados.
+
+Por defecto recalcula hasta ayer: el día en curso lo mantienen las propias
+escrituras, y recalcularlo mientras llegan pagos podría perder los que se
+confirmen entre el borrado y la inserción.
+
+Uso:
+    python -m scripts.recalcular_resumen --desde 2025-01-01
+    python -m scripts.recalcular_resumen --desde 2025-01-01 --hasta 2025-01-31
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+import Entities  # noqa: F401  (registra todos los modelos)
+from Crud.reporte_crud import ReporteCRUD
+from database.config import SessionLocal
+from Entities.transaccion import Transaccion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--desde",
+        type=date.fromisoformat,
+        help="Primer día (AAAA-MM-DD); por defecto, el de la transacción más antigua",
+    )
+    parser.add_argument(
+        "--hasta",
+        type=date.fromisoformat,
+        help="Último día (AAAA-MM-DD); por defecto, ayer",
+    )
+    parser.add_argument(
+        "--incluir-hoy",
+        action="store_true",
+        help="Permite recalcular el día en curso",
+    )
+    args = parser.parse_args()
+
+    hoy = date.today()
+    hasta = args.hasta or hoy - timedelta(days=1)
+    if hasta >= hoy and not args.incluir_hoy:
+        parser.error(
+            "el día en curso se mantiene solo; use --incluir-hoy para forzarlo"
+        )
+
+    with SessionLocal() as db:
+        desde = args.desde
+        if desde is None:
+            primera = db.scalar(select(func.min(Transaccion.fecha_transaccion)))
+            if primera is None:
+                print("No hay transacciones")
+                return
+            desde = primera.date()
+        if desde > hasta:
+            parser.error("'--desde' no puede ser posterior a '--hasta'")
+
+        escritas = ReporteCRUD(db).recalcular_resumen(desde, hasta)
+    print(f"Resumen recalculado del {desde} al {hasta}: {escritas} filas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Replicación simulada para SQLite
+================================
+
+Copia periódicamente la base primaria (`DATABASE_URL`) sobre cada réplica
+(`DATABASE_REPLICA_URLS`) con la API de respaldo en línea de SQLite, sin
+detener la API. Permite probar localmente el enrutamiento de lecturas con
+dos archivos: entre una copia y la siguiente la réplica va atrasada, como
+una réplica real de PostgreSQL con retraso, y se observa la lectura de lo
+propio (`X-Leer-Primaria`, cookie `leer_primaria_hasta`).
+
+Uso:
+    DATABASE_URL=sqlite:///primaria.db \\
+    DATABASE_REPLICA_URLS=sqlite:///replica.db \\
+        python -m scripts.replicar_sqlite --intervalo 2
+"""
+
+import argparse
+import sqlite3
+import time
+
+from sqlalchemy.engine import make_url
+
+from database.config import DATABASE_URL, REPLICA_URLS
+
+
+def _ruta_sqlite(url: str) -> str:
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite" or not url.database:
+        raise ValueError(f"No es una base SQLite en archivo: {url}")
+    return url.database
+
+
+def replicar(origen: str, destinos: list) -> float:
+    """Copia la base `origen` sobre cada archivo de `destinos`.
+
+    Args:
+        origen (str): Ruta del archivo de la primaria.
+        destinos (list): Rutas de los archivos de las réplicas.
+
+    Returns:
+        float: Segundos que tomó la copia.
+    """
+    inicio = time.perf_counter()
+    with sqlite3.connect(origen, timeout=30) as fuente:
+        for destino in destinos:
+            with sqlite3.connect(destino, timeout=30) as replica:
+                fuente.backup(replica)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--intervalo",
+        type=float,
+        default=2.0,
+        help="Segundos entre copias (el retraso máximo de las réplicas)",
+    )
+    parser.add_argument(
+        "--una-vez", action="store_true", help="Hace una sola copia y termina"
+    )
+    args = parser.parse_args()
+
+    if not REPLICA_URLS:
+        parser.error("defina DATABASE_REPLICA_URLS con al menos una réplica")
+    try:
+        origen = _ruta_sqlite(DATABASE_URL)
+        destinos = [_ruta_sqlite(url) for url in REPLICA_URLS]
+    except ValueError as error:
+        parser.error(str(error))
+
+    while True:
+        duracion = replicar(origen, destinos)
+        print(f"Réplicas actualizadas en {duracion * 1000:.0f} ms", flush=True)
+        if args.una_vez:
+            return
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
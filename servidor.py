@@ -0,0 +1,149 @@
+"""
+Servidor de producción
+======================
+
+Punto de entrada para desplegar la API con varios procesos, en lugar de
+`python main.py` (un solo proceso con recarga automática, para desarrollo).
+
+En Linux y macOS usa Gunicorn como supervisor con workers de Uvicorn
+(`uvicorn-worker`): reinicia los workers que mueren o se bloquean más de
+`SERVIDOR_TIMEOUT_SEG` y, con `--precargar`, importa la aplicación una sola
+vez antes de hacer fork, de modo que los workers comparten la memoria del
+código y arrancan en milisegundos. Donde Gunicorn no está disponible
+(Windows) recurre al modo multiproceso de Uvicorn, que no admite precarga.
+
+Cada worker ejecuta el lifespan de la aplicación, que incluye el
+calentamiento (`api/calentamiento.py`) antes de aceptar conexiones, y crea
+su propio pool de bcrypt; si `BCRYPT_PROCESOS` no está definida, los
+núcleos se reparten entre los workers.
+
+Las cachés de entidades (`Crud/cache.py`) también son de cada worker y una
+escritura solo invalida la del worker que la atendió. Con varios workers,
+si `CACHE_ENTIDADES_TTL_SEG` no está definida, se reduce a 1 segundo: es el
+tiempo máximo durante el cual otro worker puede responder una búsqueda por
+ID o llave natural con el dato anterior a la escritura.
+
+Uso:
+    python servidor.py --workers 4 --puerto 8000 --precargar
+"""
+
+import argparse
+import os
+
+# TTL de las cachés de entidades con más de un worker (ver `main`).
+TTL_CACHE_WORKERS = 1
+
+
+def _por_defecto(nombre: str, defecto):
+    return type(defecto)(os.getenv(nombre, defecto))
+
+
+def _reiniciar_pools(_servidor, _worker):
+    """Hook `post_fork` de Gunicorn: los pools heredados del proceso padre no
+    se pueden usar en el hijo; `close=False` los descarta sin cerrar los
+    sockets, que siguen siendo del padre."""
+    from database.config import async_engine, async_engines_replica, engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica in async_engines_replica:
+        replica.sync_engine.dispose(close=False)
+
+
+def _gunicorn(args) -> bool:
+    """Sirve la aplicación con Gunicorn; retorna False si no está instalado."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        return False
+
+    opciones = {
+        "bind": f"{args.host}:{args.puerto}",
+        "workers": args.workers,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": args.precargar,
+        "timeout": args.timeout,
+        "graceful_timeout": args.timeout,
+        "keepalive": 5,
+        "post_fork": _reiniciar_pools,
+        "accesslog": None,
+        "errorlog": "-",
+    }
+
+    class Aplicacion(BaseApplication):
+        def load_config(self):
+            for clave, valor in opciones.items():
+                self.cfg.set(clave, valor)
+
+        def load(self):
+            from main import app
+
+            return app
+
+    Aplicacion().run()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=_por_defecto("SERVIDOR_WORKERS", os.cpu_count() or 1),
+        help="Procesos que atienden peticiones (por defecto, núcleos de la CPU)",
+    )
+    parser.add_argument("--host", default=_por_defecto("SERVIDOR_HOST", "0.0.0.0"))
+    parser.add_argument(
+        "--puerto", type=int, default=_por_defecto("SERVIDOR_PUERTO", 8000)
+    )
+    parser.add_argument(
+        "--precargar",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("SERVIDOR_PRECARGAR", "false").lower()
+        in ("1", "true", "si", "sí"),
+        help="Importa la aplicación antes de crear los workers (solo Gunicorn)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=_por_defecto("SERVIDOR_TIMEOUT_SEG", 30),
+        help="Segundos sin respuesta de un worker antes de reiniciarlo",
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("'--workers' debe ser al menos 1")
+
+    # Cada worker crea su propio pool de bcrypt: se reparten los núcleos
+    # entre los workers en lugar de crear núcleos × workers procesos.
+    os.environ.setdefault(
+        "BCRYPT_PROCESOS", str(max(1, (os.cpu_count() or 1) // args.workers))
+    )
+    # Las cachés de entidades son de cada proceso: una invalidación en un
+    # worker no llega a los demás, que pueden servir el dato anterior hasta
+    # que venza el TTL. Con varios workers se acorta esa ventana.
+    if args.workers > 1:
+        os.environ.setdefault("CACHE_ENTIDADES_TTL_SEG", str(TTL_CACHE_WORKERS))
+
+    if _gunicorn(args):
+        return
+
+    import uvicorn
+
+    # Resuelve DATABASE_URL en este proceso: con `sqlite://` los workers
+    # heredan la misma base temporal en lugar de crear una cada uno.
+    import database.config  # noqa: F401
+
+    if args.precargar:
+        print(" Gunicorn no está disponible: se inicia sin precarga")
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.puerto,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.timeout,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()